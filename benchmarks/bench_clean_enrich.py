@@ -0,0 +1,110 @@
+# Equality + time/peak-memory check: basic_clean -> add_enriched_fields against the previous
+# implementation (filter after stripping every row, full drop_duplicates copy, in-place
+# enrichment with a row-wise apply for Profit Margin). Inputs: the raw sample, synthetic
+# rows, and a dirty variant (padded text, malformed numbers, zero/NaN Sales, duplicate
+# rows) both as plain object columns and as the raw reader's categoricals.
+# Peak memory is tracemalloc's (Python/NumPy allocations; Arrow string buffers not traced).
+# Usage: python -m benchmarks.bench_clean_enrich [--rows 100000 1000000] [--skip-reference]
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from benchmarks.synth import generate, load_profile
+from src.config import RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.ingest.schema import apply_schema, read_kwargs
+from src.transform.cleaning import _strip, basic_clean
+from src.transform.enrich import add_enriched_fields
+from src.utils.dates import to_datetime, add_order_month
+
+
+def clean_reference(df: pd.DataFrame) -> pd.DataFrame:
+    # Previous implementation, kept for comparison
+    df = apply_schema(df)
+    for c in df.columns:
+        if isinstance(df[c].dtype, (pd.StringDtype, pd.CategoricalDtype)) or df[c].dtype == object:
+            df[c] = _strip(df[c].astype(str) if df[c].dtype == object else df[c])
+    if 'Discount' in df.columns:
+        df = df[(df['Discount'] > 0) & (df['Discount'] <= 0.9)]
+    return df.drop_duplicates()
+
+
+def enrich_reference(df: pd.DataFrame) -> pd.DataFrame:
+    df = to_datetime(df, ['Order Date', 'Ship Date'])
+    df['Profit Margin'] = df.apply(lambda r: (r['Profit']/r['Sales']) if r['Sales'] else 0, axis=1)
+    return add_order_month(df, col='Order Date', new_col='Order Month')
+
+
+def pipeline(df):
+    clean = basic_clean(df)
+    return clean, add_enriched_fields(clean)
+
+
+def pipeline_reference(df):
+    return enrich_reference(clean_reference(df))  # enrichment mutated the clean frame in place
+
+
+def dirty(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    # object-typed frame with the problems cleaning exists for
+    rng = np.random.default_rng(seed)
+    df = df.astype(object)
+    n = len(df)
+    for c in ("Customer Name", "City", "Product Name", "Segment"):
+        i = rng.choice(n, n // 20, replace=False)
+        df.loc[df.index[i], c] = "  " + df[c].iloc[i].astype(str) + " "
+    for c, bad in (("Sales", "n/a"), ("Quantity", "?"), ("Discount", "")):
+        i = rng.choice(n, n // 200, replace=False)
+        df.loc[df.index[i], c] = bad
+    df.loc[df.index[rng.choice(n, n // 100, replace=False)], "Sales"] = 0.0
+    df.loc[df.index[rng.choice(n, n // 500, replace=False)], "Profit"] = np.nan
+    return pd.concat([df, df.iloc[rng.choice(n, n // 50)]], ignore_index=True)
+
+
+def measure(fn, df, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(df.copy()); times.append(time.perf_counter() - t)
+    tracemalloc.start()
+    try:
+        fn(df.copy())
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), peak / 2**20
+
+
+def check(name, df):
+    before = df.copy()
+    clean, enriched = pipeline(df)
+    pd.testing.assert_frame_equal(df, before)  # input untouched
+    ref_clean, ref_enriched = clean_reference(df.copy()), pipeline_reference(df.copy())
+    pd.testing.assert_frame_equal(clean, ref_clean, check_exact=True)
+    pd.testing.assert_frame_equal(enriched, ref_enriched, check_exact=True)
+    print(f"[OK] {name}: {len(df):,} rows -> {len(enriched):,}, identical to the reference")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the current version")
+    args = parser.parse_args()
+
+    sample = read_local_csv(RAW_CSV)
+    if not args.skip_reference:
+        check("sample", sample)
+        check("dirty (object)", dirty(sample))
+        check("dirty (raw dtypes)", dirty(sample).astype(read_kwargs()["dtype"]))
+
+    profile = load_profile()
+    print(f"{'rows':>10} {'current s':>10} {'peak MB':>8} {'reference s':>12} {'peak MB':>8} {'speedup':>8}")
+    for rows in args.rows:
+        df = generate(rows, profile=profile)
+        new, new_mb = measure(pipeline, df, args.repeat)
+        if args.skip_reference:
+            print(f"{rows:>10,} {new:>10.3f} {new_mb:>8.1f}")
+            continue
+        check(f"synthetic {rows:,}", df)
+        ref, ref_mb = measure(pipeline_reference, df, 1)
+        print(f"{rows:>10,} {new:>10.3f} {new_mb:>8.1f} {ref:>12.3f} {ref_mb:>8.1f} {ref / new:>7.1f}x")
@@ -0,0 +1,59 @@
+# Scaling benchmark: vectorized kpi_monthly vs the old per-group lambda version (results
+# must be bit-identical).
+# Usage: python -m benchmarks.bench_kpi_monthly [--rows 100000 1000000 3000000] [--months 120]
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.config import ENRICHED_CSV
+from src.transform.features import kpi_monthly
+from src.utils.io import find_table, read_table
+
+
+def kpi_monthly_reference(df: pd.DataFrame) -> pd.DataFrame:
+    # Previous implementation, kept for comparison
+    return df.groupby("Order Month").agg(
+        Total_Sales = ('Sales', 'sum'),
+        Total_Profit = ('Profit', 'sum'),
+        Orders = ('Order ID', 'nunique'),
+        Customers = ('Customer ID', 'nunique'),
+        Avg_Discount = ('Discount', 'mean'),
+        Profit_Margin = ("Profit", lambda x: x.sum()/df.loc[x.index, "Sales"].sum() if df.loc[x.index, "Sales"].sum() else 0)
+    ).reset_index()
+
+
+def scaled_sample(base: pd.DataFrame, rows: int, months: int = 120, seed: int = 0) -> pd.DataFrame:
+    # Resample curated rows and spread them over `months` months
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    df["Order Month"] = pd.Timestamp("2014-01-01") + pd.to_timedelta(rng.integers(0, months, rows) * 31, unit="D")
+    df["Order Month"] = df["Order Month"].dt.to_period("M").dt.to_timestamp()
+    df["Order ID"] = df["Order ID"] + "-" + (np.arange(rows) // 4).astype(str)
+    return df
+
+
+def best_of(fn, df, repeat=3):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter(); fn(df); times.append(time.perf_counter() - t)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 3_000_000])
+    parser.add_argument("--months", type=int, default=120, help="Distinct months to spread rows over")
+    parser.add_argument("--skip-reference", action="store_true", help="Only time the vectorized version")
+    args = parser.parse_args()
+
+    base = read_table(find_table(ENRICHED_CSV), columns=["Order Month", "Sales", "Profit", "Order ID", "Customer ID", "Discount"])
+    print(f"{'rows':>10} {'vectorized s':>13} {'reference s':>12} {'speedup':>8}")
+    for rows in args.rows:
+        df = scaled_sample(base, rows, months=args.months)
+        new = best_of(kpi_monthly, df)
+        if args.skip_reference:
+            print(f"{rows:>10,} {new:>13.3f}")
+            continue
+        ref = best_of(kpi_monthly_reference, df, repeat=1)
+        pd.testing.assert_frame_equal(kpi_monthly(df), kpi_monthly_reference(df), check_exact=True)
+        print(f"{rows:>10,} {new:>13.3f} {ref:>12.3f} {ref / new:>7.1f}x")
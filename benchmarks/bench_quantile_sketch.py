@@ -0,0 +1,79 @@
+# Accuracy of KLL-sketch quartiles (streaming outlier mode) against exact group quartiles.
+# The sample is streamed in chunks, split round-robin over worker processes, sketched per
+# (pair, group), merged, then compared with the exact Q1/Q3 and exact IQR flags.
+# Usage: python -m benchmarks.bench_quantile_sketch [--accuracy 50 100 200 400] [--rows 1000000]
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from src.config import ENRICHED_CSV
+from src.transform.outliers import build_sketches, group_quartiles, iqr_outliers, merge_sketches, sketch_quartiles
+from src.utils.io import find_table, read_table
+
+PAIRS = [(g, v) for g in ("Sub-Category", "Region", "Segment") for v in ("Profit", "Sales", "Discount")]
+
+
+def resample(base: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    # Bigger groups than the sample, with multiplicative noise so values don't just repeat
+    rng = np.random.default_rng(seed)
+    df = base.iloc[rng.integers(0, len(base), rows)].reset_index(drop=True)
+    for v in ("Profit", "Sales"):
+        df[v] = df[v] * rng.lognormal(0, 0.1, rows)
+    return df
+
+
+def sketch_parallel(df, accuracy, chunksize, workers):
+    chunks = [df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize)]
+    shards = [chunks[w::workers] for w in range(workers)]
+    with ProcessPoolExecutor(workers) as pool:
+        parts = list(pool.map(build_sketches, shards, [PAIRS] * workers, [accuracy] * workers))
+    return merge_sketches(*parts)
+
+
+def errors(df, exact, approx):
+    # rank error: distance from q to the rank interval the approx quartile occupies in the
+    # exact group (ties make it an interval); value error in units of the exact IQR
+    rank_err, value_err = [], []
+    for pair in PAIRS:
+        g, v = pair
+        codes, labels, q1, q3 = exact[pair]
+        a_labels, a_q1, a_q3 = approx[pair]
+        pos = pd.Index(a_labels).get_indexer(labels)
+        x = df[v].to_numpy(dtype="float64")
+        for i in range(len(labels)):
+            vals = np.sort(x[(codes == i) & ~np.isnan(x)])
+            iqr = (q3[i] - q1[i]) or 1.0
+            for q, ex, ap in ((0.25, q1[i], a_q1[pos[i]]), (0.75, q3[i], a_q3[pos[i]])):
+                lo, hi = np.searchsorted(vals, ap, "left") / len(vals), np.searchsorted(vals, ap, "right") / len(vals)
+                rank_err.append(max(0.0, lo - q, q - hi))
+                value_err.append(abs(ap - ex) / abs(iqr))
+    return np.array(rank_err), np.array(value_err)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accuracy", type=int, nargs="+", default=[50, 100, 200, 400], help="KLL k values")
+    parser.add_argument("--rows", type=int, help="Resample to this many rows (default: the sample as is)")
+    parser.add_argument("--chunksize", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    df = read_table(find_table(ENRICHED_CSV), columns=sorted({c for p in PAIRS for c in p}))
+    if args.rows:
+        df = resample(df, args.rows)
+    exact = group_quartiles(df, PAIRS)
+    exact_flags = iqr_outliers(df, PAIRS)
+    print(f"{len(df):,} rows, {len(PAIRS)} (group, value) pairs, chunks of {args.chunksize:,}, {args.workers} workers")
+    print(f"{'k':>5} {'max rank err':>13} {'mean rank err':>14} {'max |dQ|/IQR':>13} {'flag diffs':>11} {'items kept':>11} {'sketch s':>9}")
+    for k in args.accuracy:
+        t = time.perf_counter()
+        sketches = sketch_parallel(df, k, args.chunksize, args.workers)
+        quartiles = sketch_quartiles(sketches)
+        elapsed = time.perf_counter() - t
+        flags = iqr_outliers(df, PAIRS, quartiles=quartiles)
+        rank_err, value_err = errors(df, exact, quartiles)
+        diffs = int((flags != exact_flags).to_numpy().sum())
+        kept = sum(sk.size for groups in sketches.values() for sk in groups.values())
+        print(f"{k:>5} {rank_err.max():>13.4f} {rank_err.mean():>14.4f} {value_err.max():>13.4f} "
+              f"{diffs:>5} / {int(exact_flags.to_numpy().sum()):<5}{kept:>11,} {elapsed:>9.2f}")
@@ -0,0 +1,156 @@
+# Multi-worker dashboard serving: memory and throughput of N gunicorn workers, each either
+# loading a private copy of the curated tables or mapping the shared Arrow snapshot.
+# Memory is summed over the workers from /proc/<pid>/smaps_rollup, once loaded and again
+# after the load test: RSS counts shared pages in every worker, PSS splits them between the
+# processes mapping them, USS is the worker-private part. As with --run dash --workers, the
+# snapshot is built before the workers start. Throughput is filter changes/s from --clients
+# threads with random filters (mostly memo misses); like the browser, each change posts every
+# chart callback at once. Workers run DASH_THREADS threads. Linux only.
+# Usage: python -m benchmarks.bench_serving [--rows 1000000] [--workers 1 2 4] [--seconds 10]
+import argparse
+import json
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from src.config import BASE_DIR, DATA_CURATED, DASH_THREADS
+from src.utils.io import write_table
+from src.viz.snapshot import build_snapshot
+
+SMAPS = ("Rss", "Pss", "Private_Clean", "Private_Dirty")
+
+
+def curated_dir(rows: int) -> Path:
+    # 0 = the current curated tables; else synthetic marts (shared with benchmarks.suite)
+    if not rows:
+        return DATA_CURATED
+    from benchmarks.suite import MARTS, WORK_DIR
+    from benchmarks.synth import generate
+    from src.transform.cleaning import basic_clean
+    from src.transform.enrich import add_enriched_fields
+    out = WORK_DIR / f"curated_{rows}"
+    if not all((out / f"{name}.parquet").exists() for name in MARTS):
+        out.mkdir(parents=True, exist_ok=True)
+        enriched = add_enriched_fields(basic_clean(generate(rows)))
+        for name, build in MARTS.items():
+            write_table(build(enriched), out / name, "parquet")
+    return out
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_mb(pid: int) -> dict:
+    vals = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        k, v = line.split(":")[0], line.split()[1]
+        if k in SMAPS:
+            vals[k] = int(v) / 1024
+    return {"rss": vals["Rss"], "pss": vals["Pss"], "uss": vals["Private_Clean"] + vals["Private_Dirty"]}
+
+
+def serve(curated: Path, workers: int, snapshot_dir):
+    port = free_port()
+    app = f"src.viz.wsgi:create_server({str(curated)!r}, {None if snapshot_dir is None else str(snapshot_dir)!r})"
+    proc = subprocess.Popen([sys.executable, "-m", "gunicorn", "--workers", str(workers), "--threads", str(DASH_THREADS),
+                             "--bind", f"127.0.0.1:{port}",
+                             "--chdir", str(BASE_DIR), "--log-level", "warning", app])
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(600):
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {proc.returncode}")
+        pids = [int(p) for p in Path(f"/proc/{proc.pid}/task/{proc.pid}/children").read_text().split()]
+        try:
+            if len(pids) == workers:
+                # every worker has finished loading once the master answers this many times
+                for _ in range(workers * 4):
+                    urllib.request.urlopen(url + "/_dash-layout", timeout=60).read()
+                return proc, url, pids
+        except OSError:
+            pass
+        time.sleep(0.5)
+    proc.kill()
+    raise RuntimeError("gunicorn workers did not come up")
+
+
+def update_bodies(url: str):
+    # -> body(rng): the request bodies of every chart callback for one random filter change
+    deps = json.loads(urllib.request.urlopen(url + "/_dash-dependencies").read())
+    cbs = [d for d in deps if any(i["id"] == "region-dd" for i in d["inputs"])]
+    days = pd.date_range("2014-01-01", "2017-12-31").strftime("%Y-%m-%d").tolist()
+    dims = (["Central", "East", "South", "West"], ["Furniture", "Office Supplies", "Technology"],
+            ["Consumer", "Corporate", "Home Office"])
+
+    def one(cb, values) -> bytes:
+        outputs = [dict(zip(("id", "property"), o.rsplit(".", 1))) for o in cb["output"].strip(".").split("...")]
+        ids = [(i["id"], i["property"]) for i in cb["inputs"]]
+        return json.dumps({"output": cb["output"], "outputs": outputs if len(outputs) > 1 else outputs[0], "state": [],
+                           "changedPropIds": [f"{ids[0][0]}.{ids[0][1]}"],
+                           "inputs": [{"id": i, "property": p, "value": v} for (i, p), v in zip(ids, values)]}).encode()
+
+    def body(rng: random.Random) -> list:
+        i, j = sorted(rng.sample(range(len(days)), 2))
+        values = [days[i], days[j], *(rng.sample(d, rng.randint(0, 2)) for d in dims)]
+        return [one(cb, values) for cb in cbs]
+    return body
+
+
+def post(url: str, body: bytes):
+    req = urllib.request.Request(url + "/_dash-update-component", body, {"Content-Type": "application/json"})
+    urllib.request.urlopen(req, timeout=60).read()
+
+
+def load_test(url: str, clients: int, seconds: float) -> float:
+    bodies = update_bodies(url)
+    done, stop = [0] * clients, time.perf_counter() + seconds
+
+    def client(n):
+        rng = random.Random(n)
+        with ThreadPoolExecutor() as pool:
+            while time.perf_counter() < stop:
+                list(pool.map(lambda b: post(url, b), bodies(rng)))
+                done[n] += 1
+
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(clients)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return sum(done) / seconds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Synthetic raw rows behind the marts (0 = data/curated)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    curated = curated_dir(args.rows)
+    print(f"{'mode':<8} {'workers':>7} {'when':<7} {'RSS MB':>8} {'PSS MB':>8} {'USS MB':>8} {'upd/s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        build_snapshot(curated, Path(tmp))
+        for mode, snapshot_dir in (("private", None), ("shared", Path(tmp))):
+            for workers in args.workers:
+                proc, url, pids = serve(curated, workers, snapshot_dir)
+                try:
+                    loaded = [memory_mb(pid) for pid in pids]
+                    rps = load_test(url, args.clients, args.seconds)
+                    served = [memory_mb(pid) for pid in pids]
+                finally:
+                    proc.terminate()
+                    proc.wait()
+                for when, mem, r in (("loaded", loaded, ""), ("served", served, f"{rps:.1f}")):
+                    total = {k: sum(m[k] for m in mem) for k in ("rss", "pss", "uss")}
+                    print(f"{mode:<8} {workers:>7} {when:<7} {total['rss']:>8.0f} {total['pss']:>8.0f} {total['uss']:>8.0f} {r:>8}")
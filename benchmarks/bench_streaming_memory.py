@@ -0,0 +1,59 @@
+# Peak memory of chunked ETL runs (--chunksize) against input size. Each size is generated
+# with benchmarks/synth.py and run in a fresh interpreter with every output under a temp
+# root, so the peak RSS is that run's alone. State is bounded by the chunk and month
+# batch, so the peak stays roughly flat as rows grow (tests/test_streaming.py checks this).
+# Usage: python -m benchmarks.bench_streaming_memory [--rows 100000 400000 1600000] [--chunksize 25000]
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from benchmarks.synth import write_csv
+from src.config import BASE_DIR
+
+# Outputs relocated under `root` as tests/conftest.py does
+RUN = """
+import json, resource, sys, time
+from pathlib import Path
+from src import pipeline
+from src.config import BASE_DIR
+raw, root, chunksize = sys.argv[1], Path(sys.argv[2]), int(sys.argv[3])
+for name, value in list(vars(pipeline).items()):
+    if isinstance(value, Path) and value.is_relative_to(BASE_DIR):
+        setattr(pipeline, name, root / value.relative_to(BASE_DIR))
+    elif isinstance(value, tuple) and value and all(isinstance(v, Path) for v in value):
+        setattr(pipeline, name, tuple(root / v.relative_to(BASE_DIR) for v in value))
+t = time.perf_counter()
+pipeline.run_etl(raw, chunksize=chunksize)
+status = Path("/proc/self/status")
+if status.exists():  # Linux keeps ru_maxrss across exec (the parent's peak at fork); VmHWM is this image's
+    rss = int(next(l for l in status.read_text().splitlines() if l.startswith("VmHWM:")).split()[1]) / 2**10
+else:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+(root / "peak.json").write_text(json.dumps(dict(seconds=time.perf_counter() - t, peak_rss_mb=rss)))
+"""
+
+
+def streaming_peak(raw, chunksize: int) -> dict:
+    # -> {seconds, peak_rss_mb} of one chunked run of `raw` in a fresh interpreter
+    with tempfile.TemporaryDirectory() as root:
+        subprocess.run([sys.executable, "-c", RUN, str(raw), root, str(chunksize)], cwd=BASE_DIR,
+                       check=True, stdout=subprocess.DEVNULL)
+        return json.loads((Path(root) / "peak.json").read_text())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 400_000, 1_600_000])
+    parser.add_argument("--chunksize", type=int, default=25_000)
+    args = parser.parse_args()
+
+    print(f"chunks of {args.chunksize:,} rows")
+    print(f"{'rows':>12} {'peak RSS MB':>12} {'seconds':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            raw = write_csv(rows, Path(tmp) / f"synth_{rows}.csv")
+            res = streaming_peak(raw, args.chunksize)
+            print(f"{rows:>12,} {res['peak_rss_mb']:>12.0f} {res['seconds']:>8.1f}")
+            raw.unlink()
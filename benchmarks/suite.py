@@ -0,0 +1,165 @@
+# Repeatable timing + memory benchmarks on synthetic data (benchmarks/synth.py) at several
+# scales. Each step's output feeds the next (raw -> clean -> enriched -> marts -> curated
+# Parquet for the SQL and dashboard benchmarks); inputs are rebuilt outside the timed region
+# for every repeat. Time is the best of --repeat runs; memory is the peak of Python/NumPy
+# allocations during one extra run (tracemalloc; Arrow string buffers are not traced).
+# Each run appends rows to benchmarks/results.csv tagged with the commit, so commits can
+# be compared:
+# Usage: python -m benchmarks.suite [--rows 100000 1000000 10000000] [--repeat 3] [--only basic_clean add_enriched_fields]
+#        python -m benchmarks.suite --compare <commit> [<commit>]
+import argparse
+import platform
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from benchmarks.synth import generate, load_profile
+from src.model.marts import (build_fact_orders, build_dim_products, build_orders_monthly,
+                             build_cube, build_cube_products, build_cube_orders)
+from src.transform.cleaning import basic_clean
+from src.transform.enrich import add_enriched_fields
+from src.transform.features import kpi_monthly
+from src.transform.outliers import iqr_outliers
+from src.utils.io import write_table
+
+HERE = Path(__file__).resolve().parent
+RESULTS = HERE / "results.csv"
+WORK_DIR = HERE / ".data"  # curated Parquet per scale (gitignored)
+MARTS = {"fact_orders": build_fact_orders, "dim_products": build_dim_products, "mart_orders_monthly": build_orders_monthly,
+         "mart_cube": build_cube, "mart_cube_products": build_cube_products, "mart_cube_orders": build_cube_orders}
+FEEDS = ("basic_clean", "add_enriched_fields")
+QUERY = """
+    SELECT Region, Category, date_trunc('month', "Order Date") AS month, sum(Sales) AS sales, sum(Profit) AS profit
+    FROM fact_orders WHERE "Order Date" >= ? GROUP BY ALL ORDER BY ALL
+"""
+
+
+def measure(setup, fn, repeat):
+    # -> (best_s, median_s, peak_mb); setup() builds fn's arguments outside the timed region
+    times = []
+    for _ in range(repeat):
+        args = setup()
+        t = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - t)
+    args = setup()
+    tracemalloc.start()
+    try:
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), float(np.median(times)), peak / 2**20
+
+
+def dashboard_client(curated_dir: Path):
+    # Flask test client posting every chart callback of one filter change, one after
+    # another, with the memo and the shared filter cache cleared first
+    from src.viz.dashboard import make_app
+    app = make_app(curated_dir)
+    client = app.server.test_client()
+    client.get("/_dash-layout")
+    keys = [k for k, cb in app.callback_map.items() if any(i["id"] == "region-dd" for i in cb["inputs"])]
+
+    def call(start, end, regions, cats, segs):
+        app.callback_cache.invalidate()
+        app.filter_cache.invalidate()
+        values = (start, end, regions, cats, segs)
+        for key in keys:
+            outputs = [dict(zip(("id", "property"), o.rsplit(".", 1))) for o in key.strip(".").split("...")]
+            ids = [(i["id"], i["property"]) for i in app.callback_map[key]["inputs"]]
+            body = {"output": key, "outputs": outputs if len(outputs) > 1 else outputs[0],
+                    "changedPropIds": [f"{ids[0][0]}.{ids[0][1]}"], "state": [],
+                    "inputs": [{"id": i, "property": p, "value": v} for (i, p), v in zip(ids, values)]}
+            r = client.post("/_dash-update-component", json=body)
+            assert r.status_code == 200, r.status_code
+    return call
+
+
+def benchmarks(raw: pd.DataFrame, curated_dir: Path):
+    # (name, setup, fn) in pipeline order; later setups reuse earlier outputs
+    state = {}
+
+    def clean(df):
+        state["clean"] = basic_clean(df)
+
+    def enrich(df):
+        state["enriched"] = add_enriched_fields(df)
+
+    yield "basic_clean", lambda: (raw.copy(),), clean
+    yield "add_enriched_fields", lambda: (state["clean"].copy(),), enrich
+    yield "kpi_monthly", lambda: (state["enriched"],), kpi_monthly
+    yield "iqr_outliers", lambda: (state["enriched"], [("Sub-Category", "Profit")]), iqr_outliers
+    for name, build in MARTS.items():
+        yield build.__name__, lambda: (state["enriched"],), build
+
+    curated_dir.mkdir(parents=True, exist_ok=True)
+    for name, build in MARTS.items():
+        write_table(build(state["enriched"]), curated_dir / name, "parquet")
+
+    from src.sql.duckdb_utils import query_csvs
+    query_csvs(curated_dir, QUERY, ["2014-01-01"])  # first call loads the tables
+    yield "query_csvs", lambda: (curated_dir, QUERY, ["2016-01-01"]), query_csvs
+
+    filter_change = dashboard_client(curated_dir)
+    yield "dashboard_filter_change", lambda: ("2014-01-01", "2017-12-31", ["West", "East"], ["Technology"], []), filter_change
+
+
+def git_commit():
+    def git(*args):
+        return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True).stdout.strip()
+    return git("rev-parse", "--short", "HEAD") or "unknown", bool(git("status", "--porcelain", "--untracked-files=no"))
+
+
+def run(rows_list, repeat, only=None, seed=0):
+    commit, dirty = git_commit()
+    meta = dict(run_at=datetime.now(timezone.utc).isoformat(timespec="seconds"), commit=commit, dirty=dirty,
+                python=platform.python_version(), pandas=pd.__version__, numpy=np.__version__)
+    profile = load_profile()
+    print(f"commit {commit}{' (dirty)' if dirty else ''}, best of {repeat}")
+    print(f"{'rows':>11} {'benchmark':<24} {'best s':>9} {'median s':>9} {'rows/s':>12} {'peak MB':>9}")
+    for rows in rows_list:
+        raw = generate(rows, seed, profile)
+        out = []
+        for name, setup, fn in benchmarks(raw, WORK_DIR / f"curated_{rows}"):
+            if only and name not in only:
+                if name in FEEDS:
+                    fn(*setup())  # untimed, later benchmarks read its output
+                continue
+            best, median, peak = measure(setup, fn, repeat)
+            out.append(dict(meta, rows=rows, benchmark=name, repeat=repeat, best_s=round(best, 5),
+                            median_s=round(median, 5), rows_per_s=round(rows / best), peak_mb=round(peak, 1)))
+            print(f"{rows:>11,} {name:<24} {best:>9.4f} {median:>9.4f} {rows / best:>12,.0f} {peak:>9.1f}")
+        if out:
+            pd.DataFrame(out).to_csv(RESULTS, mode="a", index=False, header=not RESULTS.exists())
+    print(f"-> {RESULTS}")
+
+
+def compare(a, b=None):
+    # Best time per (rows, benchmark) of the latest run of each commit; b defaults to the newest commit
+    res = pd.read_csv(RESULTS)
+    b = b or res["commit"].iloc[-1]
+    latest = res[res["commit"].isin([a, b])].drop_duplicates(["commit", "rows", "benchmark"], keep="last")
+    table = latest.pivot_table(index=["rows", "benchmark"], columns="commit", values="best_s", sort=False)
+    missing = {a, b} - set(table.columns)
+    if missing:
+        raise SystemExit(f"no results for {', '.join(sorted(missing))} in {RESULTS}")
+    table["speedup"] = table[a] / table[b]
+    print(table.to_string(float_format=lambda x: f"{x:.4f}"))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Benchmark names to run (others still run once to feed them)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--compare", nargs="+", metavar="COMMIT", help="Compare results of one or two commits")
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare[:2])
+    else:
+        run(args.rows, args.repeat, set(args.only or ()), args.seed)
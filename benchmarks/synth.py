@@ -0,0 +1,112 @@
+# Synthetic Superstore raw data at any scale, resampled from the committed sample.
+# Orders take their customer, segment, location, ship mode and ship delay from a sampled
+# sample order (order date jittered by up to ±15 days inside the sample's date range);
+# lines per order follow the sample's order sizes. Each line takes the product, quantity
+# and discount of a sampled sample line, with Sales scaled by lognormal noise and Profit
+# keeping that line's margin, so the Category/Sub-Category/Region/Segment mix, date spread
+# and the Discount -> Profit shape match the sample. Output has the raw CSV's schema.
+# Usage: python -m benchmarks.synth --rows 1000000 [--seed 0] [--out data/raw/synth_1m.csv]
+import argparse
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config import DATA_RAW, RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.ingest.schema import read_kwargs
+from src.utils.dates import parse_dates
+
+ORDER_COLS = ["Ship Mode", "Customer ID", "Customer Name", "Segment", "Country", "City", "State", "Postal Code", "Region"]
+LINE_COLS = ["Product ID", "Category", "Sub-Category", "Product Name", "Quantity", "Discount"]
+SALES_NOISE = 0.1  # lognormal sigma
+DATE_JITTER = 15  # days
+
+
+def load_profile(path=RAW_CSV) -> dict:
+    base = read_local_csv(path)
+    order_date = parse_dates(base["Order Date"])[0]
+    ship_days = (parse_dates(base["Ship Date"])[0] - order_date).dt.days
+    first = ~base["Order ID"].duplicated()
+    orders = base.loc[first, ORDER_COLS].assign(
+        _prefix=base.loc[first, "Order ID"].str.split("-").str[0],
+        _day=order_date[first].to_numpy().astype("datetime64[D]").astype(np.int64),
+        _ship=ship_days[first],
+    ).reset_index(drop=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(base["Sales"] != 0, base["Profit"] / base["Sales"], 0.0)
+    lines = base[LINE_COLS + ["Sales"]].assign(_margin=margin).reset_index(drop=True)
+    return {"columns": list(base.columns), "orders": orders, "lines": lines,
+            "sizes": base.groupby("Order ID", sort=False).size().to_numpy(),
+            "days": (int(orders["_day"].min()), int(orders["_day"].max()))}
+
+
+def _dates(days: np.ndarray) -> np.ndarray:
+    # m/d/YYYY like the raw file; formatted once per distinct day
+    uniq, inv = np.unique(days, return_inverse=True)
+    labels = np.array([f"{d.month}/{d.day}/{d.year}" for d in uniq.astype("datetime64[D]").tolist()], dtype=object)
+    return labels[inv]
+
+
+def generate(rows: int, seed: int = 0, profile=None, first_row: int = 1, first_order: int = 0) -> pd.DataFrame:
+    profile = profile or load_profile()
+    rng = np.random.default_rng(seed)
+    orders, lines = profile["orders"], profile["lines"]
+
+    # whole orders until `rows` lines; the last order is cut short
+    sizes = rng.choice(profile["sizes"], int(rows / profile["sizes"].mean() * 1.2) + 8)
+    while sizes.sum() < rows:
+        sizes = np.concatenate([sizes, rng.choice(profile["sizes"], len(sizes))])
+    n_orders = int(np.searchsorted(np.cumsum(sizes), rows)) + 1
+    line_order = np.repeat(np.arange(n_orders), sizes[:n_orders])[:rows]
+
+    o = orders.iloc[rng.integers(0, len(orders), n_orders)].reset_index(drop=True)
+    lo, hi = profile["days"]
+    day = np.clip(o["_day"].to_numpy() + rng.integers(-DATE_JITTER, DATE_JITTER + 1, n_orders), lo, hi)
+    year = day.astype("datetime64[D]").astype("datetime64[Y]").astype(np.int64) + 1970
+    order_id = o["_prefix"].to_numpy(dtype=object) + "-" + year.astype(str).astype(object) + "-" \
+        + (100000 + first_order + np.arange(n_orders)).astype(str).astype(object)
+
+    ln = lines.iloc[rng.integers(0, len(lines), rows)].reset_index(drop=True)
+    sales = (ln["Sales"].to_numpy() * rng.lognormal(0, SALES_NOISE, rows)).round(2)
+
+    df = pd.DataFrame({
+        "Row ID": np.arange(first_row, first_row + rows),
+        "Order ID": order_id[line_order],
+        "Order Date": _dates(day)[line_order],
+        "Ship Date": _dates(day + o["_ship"].to_numpy())[line_order],
+        **{c: o[c].to_numpy()[line_order] for c in ORDER_COLS},
+        **{c: ln[c].to_numpy() for c in LINE_COLS},
+        "Sales": sales,
+        "Profit": (sales * ln["_margin"].to_numpy()).round(4),
+    })
+    return df[profile["columns"]].astype(read_kwargs()["dtype"])  # text dtypes as the raw reader types them
+
+
+def iter_chunks(rows: int, seed: int = 0, chunksize: int = 1_000_000, profile=None):
+    # Bounded-memory generation for large files; chunks continue Row IDs and order numbers
+    profile = profile or load_profile()
+    done = orders = 0
+    for i, start in enumerate(range(0, rows, chunksize)):
+        df = generate(min(chunksize, rows - start), seed + i, profile, first_row=done + 1, first_order=orders)
+        done += len(df)
+        orders += df["Order ID"].nunique()
+        yield df
+
+
+def write_csv(rows: int, path, seed: int = 0, chunksize: int = 1_000_000):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for i, df in enumerate(iter_chunks(rows, seed, chunksize)):
+        df.to_csv(path, index=False, mode="a" if i else "w", header=not i, encoding="latin")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="CSV path (default data/raw/synth_<rows>.csv)")
+    args = parser.parse_args()
+    out = Path(args.out) if args.out else DATA_RAW / f"synth_{args.rows}.csv"
+    t = time.perf_counter()
+    write_csv(args.rows, out, args.seed)
+    print(f"{args.rows:,} rows -> {out} ({out.stat().st_size / 1e6:,.0f} MB, {time.perf_counter() - t:.1f}s)")
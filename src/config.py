@@ -19,6 +19,78 @@ MART_ORDERS_MONTHLY = DATA_CURATED / "mart_orders_monthly.csv"
 MART_DIM_PROD = DATA_CURATED / "dim_products.csv"
 MART_FACT_ORDERS = DATA_CURATED / "fact_orders.csv"
 
-# Create directories on import
-for d in (DATA_RAW, DATA_CURATED, PLOTS_DIR):
-    d.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
+# Dashboard cubes (day × Region × Category × Segment, + Product, + order category sets)
+MART_CUBE = DATA_CURATED / "mart_cube.csv"
+MART_CUBE_PRODUCTS = DATA_CURATED / "mart_cube_products.csv"
+MART_CUBE_ORDERS = DATA_CURATED / "mart_cube_orders.csv"
+
+# Multi-file raw drops (--raw DIR or GLOB): parser processes (None = all cores) and per-file log
+INGEST_WORKERS = None
+INGEST_REPORT = ARTIFACTS / "ingest_files.csv"
+
+# Per-run JSON reports (stage timings, memory, rows, bytes) and --profile pstats dumps
+RUN_REPORTS = ARTIFACTS / "runs"
+
+# Outlier quartiles in --chunksize runs come from per-group KLL sketches built while
+# streaming (exact quartiles would need every value in memory); k sets their accuracy
+OUTLIER_SKETCH_K = 200
+
+# --chunksize runs spill cleaned rows here, one file per Order Month, removed at the end of the run
+STREAM_SPILL_DIR = BASE_DIR / "data" / "spill"
+
+# Batch plot rendering: worker processes (None = all cores)
+PLOT_WORKERS = None
+
+# Outlier scatter: above this many normal points they are drawn as a density of a
+# SCATTER_BINS × SCATTER_BINS grid instead of one marker each (outliers always stay markers)
+SCATTER_MAX_POINTS = 50_000
+SCATTER_BINS = 200
+
+# Content-addressed stage cache (LRU-evicted down to CACHE_MAX_BYTES after each run)
+CACHE_DIR = BASE_DIR / "data" / "cache"
+CACHE_MAX_BYTES = 2 * 1024**3
+
+# DuckDB engine (--engine duckdb): spill directory and resource limits (None = DuckDB defaults)
+DUCKDB_TEMP_DIR = BASE_DIR / "data" / "duckdb_tmp"
+DUCKDB_MEMORY_LIMIT = None  # e.g. "4GB"
+DUCKDB_THREADS = None
+
+# Watermark state for --incremental runs
+ETL_STATE = DATA_CURATED / "_etl_state.json"
+
+# Written after every completed ETL run (all tables in place); the dashboard reloads on change
+CURATED_MANIFEST = DATA_CURATED / "_manifest.json"
+
+# Curated output format: "csv" or "parquet" (overridable with --format)
+OUTPUT_FORMAT = "csv"
+
+# Dashboard callback memo: max cached results (one per chart callback and filter state) and
+# their lifetime in seconds (None = no expiry)
+DASH_CACHE_SIZE = 128
+DASH_CACHE_TTL = None
+# Filter states whose filtered cube slice is kept for the per-chart callbacks to share
+DASH_FILTER_CACHE_SIZE = 16
+
+# Dashboard time series: max points per figure; longer series are downsampled with LTTB
+DASH_TS_MAX_POINTS = 500
+
+# Seconds between the dashboard's checks for a newer ETL run (None = load once at startup)
+DASH_RELOAD_INTERVAL = 5
+
+# Multi-worker dashboard serving (--run dash --workers N): gunicorn bind address and the
+# memory-mapped Arrow snapshot of the curated tables that all workers share
+DASH_BIND = "127.0.0.1:8050"
+DASH_THREADS = 4  # per worker, so one page's parallel chart callbacks don't queue behind each other
+SERVING_DIR = BASE_DIR / "data" / "serving"
+
+# Tables exposed to SQL / dashboard readers (name -> path; suffix resolved at read time)
+CURATED_TABLES = {
+    "fact_orders": MART_FACT_ORDERS,
+    "dim_products": MART_DIM_PROD,
+    "mart_orders_monthly": MART_ORDERS_MONTHLY,
+    "mart_cube": MART_CUBE,
+    "mart_cube_products": MART_CUBE_PRODUCTS,
+    "mart_cube_orders": MART_CUBE_ORDERS,
+}
+
+# Directories are created by the writers on first write, so importing config has no side effects
\ No newline at end of file
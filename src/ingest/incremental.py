@@ -0,0 +1,133 @@
+import hashlib
+import io
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from .readers import read_local_csv
+from .schema import read_kwargs
+from ..utils.dates import parse_dates
+
+# Watermark state for incremental ETL runs.
+# The state file records the source fingerprint (byte size + sha256 of those bytes),
+# the processed Row IDs (as [start, end] ranges) and the max Order Date seen so far.
+
+HASH_BLOCK = 1 << 20
+
+
+def load_state(path: Path):
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def save_state(path: Path, state: dict):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    state = {**state, "updated_at": datetime.now(timezone.utc).isoformat(timespec="seconds")}
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(state, indent=2))
+    tmp.replace(path)
+
+
+def ids_to_ranges(ids) -> list:
+    ids = np.unique(np.asarray(ids, dtype=np.int64))
+    if not len(ids):
+        return []
+    breaks = np.flatnonzero(np.diff(ids) != 1)
+    starts = np.r_[ids[0], ids[breaks + 1]]
+    ends = np.r_[ids[breaks], ids[-1]]
+    return [[int(s), int(e)] for s, e in zip(starts, ends)]
+
+
+def in_ranges(ids, ranges) -> np.ndarray:
+    ids = np.asarray(ids, dtype=np.int64)
+    if not ranges:
+        return np.zeros(len(ids), dtype=bool)
+    r = np.asarray(ranges, dtype=np.int64)
+    pos = np.searchsorted(r[:, 0], ids, side="right") - 1
+    ok = pos >= 0
+    hit = np.zeros(len(ids), dtype=bool)
+    hit[ok] = ids[ok] <= r[pos[ok], 1]
+    return hit
+
+
+def merge_ranges(ranges, new_ids) -> list:
+    if not len(new_ids):
+        return ranges
+    # expand only the new ids; existing ranges stay compact
+    merged = sorted([list(r) for r in ranges] + ids_to_ranges(new_ids))
+    out = [merged[0]]
+    for s, e in merged[1:]:
+        if s <= out[-1][1] + 1:
+            out[-1][1] = max(out[-1][1], e)
+        else:
+            out.append([s, e])
+    return out
+
+
+def _sha256(path: Path, upto=None, h=None, start=0):
+    # Hash bytes [start, upto) of the file (to EOF by default), continuing `h` if given.
+    # Returns (hashlib obj, end offset).
+    h = h or hashlib.sha256()
+    n = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        while upto is None or n < upto:
+            block = f.read(HASH_BLOCK if upto is None else min(HASH_BLOCK, upto - n))
+            if not block:
+                break
+            h.update(block)
+            n += len(block)
+    return h, n
+
+
+def fingerprint(path: Path, h=None, start=0) -> dict:
+    h, size = _sha256(path, h=h, start=start)
+    with open(path, "rb") as f:
+        header = f.readline().decode("latin").rstrip("\r\n")
+    return {"source": str(Path(path).resolve()), "size": size, "sha256": h.hexdigest(), "header": header}
+
+
+def read_new_rows(raw_path: Path, state: dict):
+    # Returns (new raw rows, how they were found, new source fingerprint). When the file
+    # only grew since the last run, just the appended bytes are parsed and hashed;
+    # otherwise the whole file is read and rows are filtered by processed Row ID.
+    raw_path = Path(raw_path)
+    size = raw_path.stat().st_size
+    mode = "rewritten"
+    if size >= state["size"]:
+        h, n = _sha256(raw_path, upto=state["size"])
+        with open(raw_path, "rb") as f:
+            f.seek(max(state["size"] - 1, 0))
+            ends_with_newline = f.read(1) == b"\n"
+        if n == state["size"] and h.hexdigest() == state["sha256"] and ends_with_newline:
+            mode = "appended"
+
+    if mode == "appended":
+        fp = fingerprint(raw_path, h=h, start=n)
+        names = list(pd.read_csv(io.StringIO(state["header"] + "\n"), nrows=0).columns)
+        if size == state["size"]:
+            return pd.DataFrame(columns=names), mode, fp
+        with open(raw_path, "rb") as f:
+            f.seek(state["size"])
+            df = pd.read_csv(f, header=None, names=names, encoding="latin", **read_kwargs())
+    else:
+        fp = fingerprint(raw_path)
+        df = read_local_csv(raw_path)
+
+    if "Row ID" in df.columns:
+        df = df[~in_ranges(df["Row ID"], state.get("row_ids", []))]
+    return df, mode, fp
+
+
+def build_state(fp: dict, raw: pd.DataFrame, fmt: str, prev=None) -> dict:
+    # `raw` holds the rows processed in this run (before cleaning, so dropped rows count as seen)
+    state = {**(prev or {}), **fp, "format": fmt}
+    if "Row ID" in raw.columns:
+        state["row_ids"] = merge_ranges(state.get("row_ids", []), raw["Row ID"].dropna().to_numpy())
+    max_date = parse_dates(raw["Order Date"])[0].max() if "Order Date" in raw.columns else pd.NaT
+    if pd.notna(max_date):
+        prev_max = pd.to_datetime(state.get("max_order_date"))
+        state["max_order_date"] = str(max(max_date, prev_max).date() if pd.notna(prev_max) else max_date.date())
+    return state
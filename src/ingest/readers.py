@@ -1,46 +1,208 @@
 import os
 import io
+import glob
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
 import pandas as pd
 from ..utils.io import read_csv
+from .schema import read_kwargs
 
 
 # 1) Local CSV (default)
-def read_local_csv(path):
-    return read_csv(path, encoding='latin')
+# With chunksize set, returns an iterator of DataFrames instead of one frame
+def read_local_csv(path, chunksize=None, **read_csv_kwargs):
+    # typed per the raw schema; explicit kwargs win
+    return read_csv(path, encoding='latin', chunksize=chunksize, **{**read_kwargs(), **read_csv_kwargs})
+
+
+# 1b) Partitioned local drops (one CSV per store per day)
+# `spec` is a file, a directory (all *.csv inside) or a glob; files are read in sorted
+# order so the combined frame (and dedup "keep first") is deterministic.
+def expand_paths(spec) -> list:
+    if isinstance(spec, (list, tuple)):
+        return [Path(p) for p in spec]
+    spec = str(spec)
+    if os.path.isdir(spec):
+        paths = sorted(Path(spec).glob('*.csv'))
+    elif glob.has_magic(spec):
+        paths = sorted(Path(p) for p in glob.glob(spec, recursive=True))
+    else:
+        return [Path(spec)]
+    if not paths:
+        raise FileNotFoundError(f"No CSV files match {spec}")
+    return paths
+
+
+def _read_one(path, read_csv_kwargs):
+    # Pool worker: same parsing as read_local_csv, plus row count and wall time
+    t0 = time.perf_counter()
+    df = read_local_csv(path, **read_csv_kwargs)
+    return df, {'file': str(path), 'rows': len(df), 'seconds': round(time.perf_counter() - t0, 4)}
+
+
+def iter_local_csvs(spec, workers=None, **read_csv_kwargs):
+    # Yields (frame, stats) per file, in file order. Files are parsed in a process pool
+    # with at most 2 * workers results in flight, so memory stays bounded when streaming.
+    paths = expand_paths(spec)
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        for p in paths:
+            yield _read_one(p, read_csv_kwargs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        todo = iter(paths)
+        for p in todo:
+            pending.append(pool.submit(_read_one, p, read_csv_kwargs))
+            if len(pending) >= 2 * workers:
+                break
+        while pending:
+            yield pending.popleft().result()
+            for p in todo:
+                pending.append(pool.submit(_read_one, p, read_csv_kwargs))
+                break
+
+
+def read_local_csvs(spec, workers=None, **read_csv_kwargs):
+    # -> (combined frame, per-file stats frame)
+    frames, stats = [], []
+    for df, st in iter_local_csvs(spec, workers, **read_csv_kwargs):
+        frames.append(df)
+        stats.append(st)
+    df = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+    return df, pd.DataFrame(stats)
+
+# ---- Streaming object-store reads ----
+# Objects are fetched as byte ranges, several in flight at once, and fed to pandas' chunked
+# parser through a file-like stream, so peak memory is about concurrency * block_size plus
+# one parsed chunk instead of the whole object (twice). Each reader takes an optional client
+# so the tests can run it against filesystem-backed fakes (tests/fakes.py).
+BLOCK_SIZE = 8 << 20
+CONCURRENCY = 4
+
+
+class RangedStream(io.RawIOBase):
+    # Sequential reader over fetch(start, end) -> bytes; keeps up to `concurrency` ranges
+    # downloading ahead of the parser
+    def __init__(self, size: int, fetch, block_size=BLOCK_SIZE, concurrency=CONCURRENCY):
+        super().__init__()
+        self.size, self.fetch, self.block_size, self.concurrency = size, fetch, block_size, concurrency
+        self._pool = ThreadPoolExecutor(max_workers=concurrency)
+        self._pending = deque()
+        self._next = 0
+        self._buf, self._off = b'', 0
+
+    def _prefetch(self):
+        while len(self._pending) < self.concurrency and self._next < self.size:
+            end = min(self._next + self.block_size, self.size)
+            self._pending.append(self._pool.submit(self.fetch, self._next, end))
+            self._next = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._off >= len(self._buf):
+            self._prefetch()
+            if not self._pending:
+                return 0
+            self._buf, self._off = self._pending.popleft().result(), 0
+            self._prefetch()
+        n = min(len(b), len(self._buf) - self._off)
+        b[:n] = self._buf[self._off:self._off + n]
+        self._off += n
+        return n
+
+    def close(self):
+        for f in self._pending:
+            f.cancel()
+        self._pending.clear()
+        self._pool.shutdown(wait=True)
+        super().close()
+
+
+def _read_stream(raw: RangedStream, chunksize, read_csv_kwargs):
+    # Whole frame (one parse, no intermediate bytes copy) or an iterator of chunks. An empty
+    # object (no header either) is an empty frame / no chunks, not pandas' EmptyDataError.
+    if raw.size == 0:
+        raw.close()
+        return pd.DataFrame() if chunksize is None else iter(())
+    f = io.BufferedReader(raw, buffer_size=1 << 20)
+    if chunksize is None:
+        with f:
+            return pd.read_csv(f, **read_csv_kwargs)
+    return _iter_chunks(f, chunksize, read_csv_kwargs)
+
+
+def _iter_chunks(f, chunksize, read_csv_kwargs):
+    with f, pd.read_csv(f, chunksize=chunksize, **read_csv_kwargs) as reader:
+        yield from reader
+
 
 # 2) AWS S3 (commented credentials usage)
 # Requires boto3, AWS creds in env (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY, AWS_DEFAULT_REGION)
-def read_s3_csv(bucket: str, key: str, **read_csv_kwargs) -> pd.DataFrame:
-    import boto3
-    s3 = boto3.client("s3")
-    obj = s3.get_object(Bucket = bucket, Key = key)
-    return pd.read_csv(io.BytesIO(obj['Body'].read()), **read_csv_kwargs)
+def read_s3_csv(bucket: str, key: str, chunksize=None, client=None, block_size=BLOCK_SIZE,
+                concurrency=CONCURRENCY, **read_csv_kwargs):
+    if client is None:
+        import boto3
+        client = boto3.client("s3")
+    size = client.head_object(Bucket=bucket, Key=key)['ContentLength']
+
+    def fetch(start, end):
+        return client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end - 1}")['Body'].read()
+    return _read_stream(RangedStream(size, fetch, block_size, concurrency), chunksize, read_csv_kwargs)
 
 
 # 3) Azure Blob Storage
 # Requires: azure-storage-blob, env AZURE_STORAGE_CONNECTION_STRING
 # or use a SAS URL directly
-def read_azure_blob_csv(container: str, blob_path: str, **read_csv_kwargs) -> pd.DataFrame:
-    from azure.storage.blob import BlobServiceClient
-    conn = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
-    if not conn:
-        raise RuntimeError("Set AZURE_STORAGE_CONNECTION_STRING in env")
-    
-    svc = BlobServiceClient.from_connection_string(conn)
-    blob = svc.get_blob_client(container=container, blob=blob_path)
-    data = blob.download_blob().readall()
-    return pd.read_csv(io.BytesIO(data), **read_csv_kwargs)
+def read_azure_blob_csv(container: str, blob_path: str, chunksize=None, blob=None, block_size=BLOCK_SIZE,
+                        concurrency=CONCURRENCY, **read_csv_kwargs):
+    if blob is None:
+        from azure.storage.blob import BlobServiceClient
+        conn = os.environ.get("AZURE_STORAGE_CONNECTION_STRING")
+        if not conn:
+            raise RuntimeError("Set AZURE_STORAGE_CONNECTION_STRING in env")
+
+        svc = BlobServiceClient.from_connection_string(conn)
+        blob = svc.get_blob_client(container=container, blob=blob_path)
+    size = blob.get_blob_properties().size
+
+    def fetch(start, end):
+        return blob.download_blob(offset=start, length=end - start).readall()
+    return _read_stream(RangedStream(size, fetch, block_size, concurrency), chunksize, read_csv_kwargs)
 
 
 # 4) Google Cloud Storage
 # Requires: google-cloud-storage and GOOGLE_APPLICATION_CREDENTIALS env pointing to service account JSON
-def read_gcs_csv(bucket: str, blob_path: str, **read_csv_kwargs) -> pd.DataFrame:
-    from google.cloud import storage
-    client = storage.Client()
-    b = client.bucket(bucket)
-    blob = b.blob(blob_path)
-    data = blob.download_as_bytes()
-    return pd.read_csv(io.BytesIO(data), **read_csv_kwargs)
+def read_gcs_csv(bucket: str, blob_path: str, chunksize=None, blob=None, block_size=BLOCK_SIZE,
+                 concurrency=CONCURRENCY, **read_csv_kwargs):
+    if blob is None:
+        from google.cloud import storage
+        client = storage.Client()
+        b = client.bucket(bucket)
+        blob = b.blob(blob_path)
+    blob.reload()  # populates blob.size
+
+    def fetch(start, end):
+        return blob.download_as_bytes(start=start, end=end - 1)  # GCS ranges are inclusive
+    return _read_stream(RangedStream(blob.size, fetch, block_size, concurrency), chunksize, read_csv_kwargs)
+
+
+def read_cloud_csv(url: str, chunksize=None, **read_csv_kwargs):
+    # s3://bucket/key, gs://bucket/path, az://container/path
+    scheme, _, rest = url.partition("://")
+    bucket, _, key = rest.partition("/")
+    readers = {"s3": read_s3_csv, "gs": read_gcs_csv, "az": read_azure_blob_csv}
+    if scheme not in readers or not key:
+        raise ValueError(f"Unsupported object URL {url!r}; expected s3://, gs:// or az://<bucket>/<key>")
+    return readers[scheme](bucket, key, chunksize=chunksize, **read_csv_kwargs)
+
+
+def is_cloud_url(spec) -> bool:
+    return isinstance(spec, str) and spec.split("://", 1)[0] in ("s3", "gs", "az") and "://" in spec
 
 
 # 5) Kaggle
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Raw Superstore schema. Low-cardinality text (and the date strings, a few thousand
+# distinct values) is read as categorical, IDs and names as Arrow-backed strings, and
+# integers in the smallest dtype that holds them. Floats stay float64: Discount (0.2, 0.45, ...)
+# isn't exact in float32 and Avg_Discount would drift, and money summed over millions of rows
+# in float32 loses cents.
+# Text dtypes are passed to the CSV reader; numbers are read as pandas infers them and
+# narrowed afterwards, so malformed numeric fields still coerce to NaN in cleaning instead
+# of failing the read.
+
+EXPECTED_COLS = [
+    "Order ID","Order Date","Ship Date","Ship Mode","Customer ID","Customer Name",
+    "Segment","Country","City","State","Postal Code","Region","Product ID",
+    "Category","Sub-Category","Product Name","Sales","Quantity","Discount","Profit"
+]
+
+STRING = pd.StringDtype("pyarrow", na_value=np.nan)
+CATEGORY = "category"
+
+RAW_SCHEMA = {
+    "Row ID": "int64",
+    "Order ID": STRING,
+    "Order Date": CATEGORY,
+    "Ship Date": CATEGORY,
+    "Ship Mode": CATEGORY,
+    "Customer ID": STRING,
+    "Customer Name": STRING,
+    "Segment": CATEGORY,
+    "Country": CATEGORY,
+    "City": CATEGORY,
+    "State": CATEGORY,
+    "Postal Code": "int32",
+    "Region": CATEGORY,
+    "Product ID": STRING,
+    "Category": CATEGORY,
+    "Sub-Category": CATEGORY,
+    "Product Name": STRING,
+    "Sales": "float64",
+    "Quantity": "int16",
+    "Discount": "float64",
+    "Profit": "float64",
+}
+assert list(RAW_SCHEMA)[1:] == EXPECTED_COLS
+
+SCHEMAS = {"raw": RAW_SCHEMA}
+
+
+def _is_numeric(dtype) -> bool:
+    return not isinstance(dtype, pd.StringDtype) and dtype != CATEGORY
+
+
+def read_kwargs(schema=RAW_SCHEMA) -> dict:
+    # read_csv kwargs: text columns typed at parse time (extra columns are read as inferred).
+    # No usecols: every raw column is carried into the clean/enriched tables, and columns
+    # outside the schema are kept as the original reader kept them, so there is nothing
+    # unused to skip. Readers that need a subset pass their own usecols (read_local_csv
+    # merges it in, e.g. the incremental watermark reads only Row ID and Order Date).
+    return {"dtype": {c: t for c, t in schema.items() if not _is_numeric(t)}}
+
+
+def apply_schema(df: pd.DataFrame, schema=RAW_SCHEMA) -> pd.DataFrame:
+    # Cast present schema columns that aren't in their declared dtype yet. Numbers coerce
+    # (bad values -> NaN); integers that hold NaN or don't fit the narrow type keep the
+    # dtype pandas inferred.
+    casts = {}
+    for c, t in schema.items():
+        if c not in df.columns or df[c].dtype == t:
+            continue
+        if _is_numeric(t):
+            col = df[c] if pd.api.types.is_numeric_dtype(df[c]) else pd.to_numeric(df[c], errors="coerce")
+            if np.dtype(t).kind in "iu":
+                info = np.iinfo(t)
+                if col.isna().any() or not (info.min <= col.min() and col.max() <= info.max):
+                    casts[c] = col
+                    continue
+            casts[c] = col.astype(t)
+        else:
+            casts[c] = df[c].astype(t)
+    return df.assign(**casts) if casts else df
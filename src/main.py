@@ -1,55 +1,97 @@
 import argparse
-import pandas as pd
-from src.config import RAW_CSV, CLEAN_CSV, ENRICHED_CSV, DATA_CURATED, PLOTS_DIR, MART_FACT_ORDERS, MART_DIM_PROD, MART_ORDERS_MONTHLY
-from src.ingest.readers import read_local_csv
-from src.transform.cleaning import basic_clean
-from src.transform.enrich import add_enriched_fields
-from src.transform.outliers import iqr_flags, plot_outlier_box, plot_outliers_scatter
-from src.model.marts import build_fact_orders, build_dim_products, build_orders_monthly
-from src.utils.io import to_csv
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+from src.config import RAW_CSV, OUTPUT_FORMAT
 
+# CLI only: each subcommand imports what it runs (src.pipeline for the ETL, the dashboard
+# modules for dash), so `--help`, health checks and the other subcommand stay cheap.
 
 
-def run_etl(raw_path = RAW_CSV):
-    print("[INGEST] Reading raw CSV…", raw_path)
-    df = read_local_csv(raw_path)
+def run_dashboard(workers = None):
+    from src.config import BASE_DIR, DATA_CURATED, DASH_BIND, DASH_THREADS, SERVING_DIR
+    if not workers:
+        from src.viz.dashboard import make_app
+        app = make_app(DATA_CURATED)
+        app.run(debug=True)
+        return
+    # Production serving: N gunicorn workers over one shared memory-mapped snapshot, built
+    # here once so the workers only map it
+    from importlib.util import find_spec
+    if find_spec("gunicorn") is None:
+        sys.exit("--workers needs gunicorn (pip install gunicorn)")
+    from src.viz.snapshot import build_snapshot
+    build_snapshot(DATA_CURATED, SERVING_DIR)
+    os.execv(sys.executable, [sys.executable, "-m", "gunicorn", "--workers", str(workers), "--threads", str(DASH_THREADS), "--bind", DASH_BIND,
+                              "--chdir", str(BASE_DIR), "src.viz.wsgi:create_server()"])
 
-    print("[CLEAN] Basic cleaning…")
-    df = basic_clean(df)
-    to_csv(df, CLEAN_CSV)
 
-    print("[ENRICH] Derived fields…")
-    df = add_enriched_fields(df)
-    to_csv(df, ENRICHED_CSV)
-
-    print("[MARTS] Building curated tables…")
-    fact = build_fact_orders(df); to_csv(fact, MART_FACT_ORDERS)
-    dimp = build_dim_products(df); to_csv(dimp, MART_DIM_PROD)
-    monthly = build_orders_monthly(df); to_csv(monthly, MART_ORDERS_MONTHLY)
-
-    print("[OUTLIERS] Flag + visuals (Profit by Sub-Category)…")
-    flagged = iqr_flags(df, group_col='Sub-Category', value_col='Profit')
-    # Save a few images (example):
-    plot_outlier_box(flagged, group_val='Binders', group_col='Sub-Category', value_col='Profit', save_path=PLOTS_DIR/"binders_profit_box.png")
-    plot_outliers_scatter(flagged, value_x='Sales', value_y='Profit', flag_col='is_outlier', save_path=PLOTS_DIR/"scatter_profit_outliers.png")
-
-    print("[DONE] ETL complete. Curated CSVs & plots ready.")
-
-
-def run_dashboard():
-    from src.viz.dashboard import make_app
-    from src.config import DATA_CURATED
-    app = make_app(DATA_CURATED)
-    app.run(debug=True)
+def import_profile(argv, top = 15):
+    # Re-run the same command under `python -X importtime` and attribute the time by package:
+    # our own src.* modules count their self time, and each third-party package imported
+    # (directly or by our code) counts its cumulative time once.
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", "-m", "src.main", *argv], stderr=subprocess.PIPE, text=True)
+    try:
+        err = proc.communicate()[1]
+    except KeyboardInterrupt:  # e.g. stopping the dashboard server
+        err = proc.communicate()[1]
+    entries = []
+    for line in err.splitlines():
+        m = re.match(r"import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$", line)
+        if m:
+            entries.append((len(m.group(3)), m.group(4).split(".")[0], int(m.group(1)), int(m.group(2))))
+        elif not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+    totals, stack = defaultdict(int), []
+    for depth, pkg, self_us, cum_us in reversed(entries):  # children are printed before their parent
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if not any(third_party for _, third_party in stack):
+            totals[pkg] += self_us if pkg == "src" else cum_us
+        stack.append((depth, pkg != "src"))
+    total = sum(totals.values())
+    print(f"\n[IMPORTS] {total / 1e3:,.0f} ms total")
+    for pkg, us in sorted(totals.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"  {pkg:<24} {us / 1e3:>8,.1f} ms  {us / total:>6.1%}")
+    return proc.returncode
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SuperStore ETL & Dashboard")
     parser.add_argument('--run', choices=['etl','dash'], default='etl')
-    parser.add_argument('--raw', help='Path to raw CSV (optional)')
+    parser.add_argument('--raw', help='Raw CSV file, directory of CSVs, glob or s3:// gs:// az:// URL (optional)')
+    parser.add_argument('--chunksize', type=int, help='Stream the raw CSV in chunks of N rows (bounded memory)')
+    parser.add_argument('--format', choices=['csv','parquet'], default=OUTPUT_FORMAT, help='Curated output format')
+    parser.add_argument('--incremental', action='store_true', help='Only process rows added since the last watermark')
+    parser.add_argument('--engine', choices=['pandas','duckdb'], default='pandas', help='Execution engine for the ETL')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every stage instead of reusing data/cache')
+    parser.add_argument('--profile', action='store_true', help='Dump cProfile stats per ETL stage next to the run report (artifacts/runs/)')
+    parser.add_argument('--workers', type=int, help='Serve the dashboard with N gunicorn workers sharing a memory-mapped snapshot')
+    parser.add_argument('--import-profile', action='store_true', help='Run the command and print an import-time breakdown by package')
     args = parser.parse_args()
+    if args.import_profile:
+        sys.exit(import_profile([a for a in sys.argv[1:] if a != '--import-profile']))
+    if args.workers is not None and (args.run != 'dash' or args.workers < 1):
+        parser.error('--workers takes a positive number and only applies to --run dash')
+    if args.incremental and args.chunksize:
+        parser.error('--incremental and --chunksize cannot be combined')
+    if args.engine == 'duckdb' and (args.incremental or args.chunksize):
+        parser.error('--engine duckdb runs a full out-of-core build; drop --incremental/--chunksize')
 
     if args.run == 'etl':
-        run_etl(args.raw or RAW_CSV)
+        from src import pipeline
+        from src.ingest.readers import expand_paths, is_cloud_url
+        if args.raw and is_cloud_url(args.raw) and not args.chunksize:
+            parser.error('object-store sources (s3://, gs://, az://) are streamed; pass --chunksize')
+        if (args.incremental or args.engine == 'duckdb') and args.raw and len(expand_paths(args.raw)) > 1:
+            parser.error('--incremental and --engine duckdb take a single raw file')
+    if args.run == 'etl' and args.engine == 'duckdb':
+        pipeline.run_etl_duckdb(args.raw or RAW_CSV, fmt=args.format, profile=args.profile)
+    elif args.run == 'etl' and args.incremental:
+        pipeline.run_etl_incremental(args.raw or RAW_CSV, fmt=args.format, profile=args.profile)
+    elif args.run == 'etl':
+        pipeline.run_etl(args.raw or RAW_CSV, chunksize=args.chunksize, fmt=args.format, use_cache=not args.no_cache, profile=args.profile)
     elif args.run == 'dash':
-        run_dashboard()
\ No newline at end of file
+        run_dashboard(args.workers)
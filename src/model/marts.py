@@ -14,4 +14,113 @@ def build_dim_products(df: pd.DataFrame) -> pd.DataFrame:
     return df[['Product ID', 'Product Name', 'Category', 'Sub-Category']].drop_duplicates()
 
 def build_orders_monthly(df: pd.DataFrame) -> pd.DataFrame:
-    return kpi_monthly(df)
\ No newline at end of file
+    return kpi_monthly(df)
+
+
+# ---- Aggregate cube for the dashboard ----
+# Day-grain so any date range is answered exactly; all measures are additive. Distinct
+# orders are not additive across categories (one order can span several), so the orders
+# cube is keyed by each order's full category set instead of a single Category. This relies
+# on an order having one Order Date, Region and Segment, which holds for SuperStore.
+CUBE_DIMS = ["Order Date", "Order Month", "Region", "Category", "Segment"]
+CUBE_ORDER_DIMS = ["Order Date", "Order Month", "Region", "Segment", "Categories"]
+CATEGORY_SEP = "|"
+
+
+def build_cube(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby(CUBE_DIMS, dropna=False, observed=True).agg(
+        Sales=("Sales", "sum"), Profit=("Profit", "sum"), Quantity=("Quantity", "sum"), Lines=("Sales", "size")
+    ).reset_index()
+
+
+def build_cube_products(df: pd.DataFrame) -> pd.DataFrame:
+    return df.groupby(CUBE_DIMS + ["Product Name"], dropna=False, observed=True).agg(
+        Sales=("Sales", "sum"), Profit=("Profit", "sum")
+    ).reset_index()
+
+
+def order_categories(df: pd.DataFrame) -> pd.DataFrame:
+    # Distinct (order, category) pairs; the only state the orders cube needs
+    return df[["Order ID", "Order Date", "Order Month", "Region", "Segment", "Category"]].drop_duplicates()
+
+
+def build_cube_orders(df: pd.DataFrame) -> pd.DataFrame:
+    pairs = order_categories(df)
+    cats = sorted(pairs["Category"].dropna().unique())
+    # one bit per category; distinct pairs, so summing bits per order == OR-ing them
+    bit = pairs["Category"].map({c: 1 << i for i, c in enumerate(cats)}).fillna(0).astype("int64")
+    keys = ["Order ID", "Order Date", "Order Month", "Region", "Segment"]
+    per_order = bit.groupby([pairs[k] for k in keys], dropna=False, observed=True).sum().rename("mask").reset_index()
+    names = {m: CATEGORY_SEP.join(c for i, c in enumerate(cats) if m >> i & 1) for m in per_order["mask"].unique()}
+    per_order["Categories"] = per_order["mask"].map(names)
+    return per_order.groupby(CUBE_ORDER_DIMS, dropna=False, observed=True).size().rename("Orders").reset_index()
+
+
+def replace_months(mart: pd.DataFrame, recomputed: pd.DataFrame, months=None) -> pd.DataFrame:
+    # Swap in recomputed rows for the affected months (incremental runs). Rows of each month
+    # come from one side only, so a stable sort on month keeps any finer ordering intact.
+    months = recomputed["Order Month"].unique() if months is None else months
+    keep = mart[~mart["Order Month"].isin(months)]
+    return pd.concat([keep, recomputed], ignore_index=True).sort_values("Order Month", kind="stable", ignore_index=True)
+
+
+# ---- Partial aggregates for chunked (streaming) runs ----
+# Sums/counts are additive across chunks; distinct order/customer counts need the
+# distinct (month, id) pairs, which are kept deduplicated as chunks are merged.
+
+def merge_dim_products(acc, dimp: pd.DataFrame) -> pd.DataFrame:
+    if acc is None:
+        return dimp
+    return pd.concat([acc, dimp], ignore_index=True).drop_duplicates()
+
+
+def merge_cube(acc, part: pd.DataFrame, dims=CUBE_DIMS) -> pd.DataFrame:
+    # Cube measures are sums, so partial cubes merge by re-aggregating
+    if acc is None:
+        return part
+    return pd.concat([acc, part], ignore_index=True).groupby(dims, dropna=False, observed=True).sum().reset_index()
+
+
+def merge_order_categories(acc, part: pd.DataFrame) -> pd.DataFrame:
+    if acc is None:
+        return part
+    return pd.concat([acc, part], ignore_index=True).drop_duplicates()
+
+
+def monthly_partials(df: pd.DataFrame) -> dict:
+    g = df.groupby("Order Month")
+    sums = g.agg(
+        Total_Sales=("Sales", "sum"),
+        Total_Profit=("Profit", "sum"),
+        Discount_Sum=("Discount", "sum"),
+        Discount_N=("Discount", "count"),
+    )
+    return {
+        "sums": sums,
+        "orders": df[["Order Month", "Order ID"]].dropna().drop_duplicates(),
+        "customers": df[["Order Month", "Customer ID"]].dropna().drop_duplicates(),
+    }
+
+
+def merge_monthly_partials(acc, part: dict) -> dict:
+    if acc is None:
+        return part
+    return {
+        "sums": acc["sums"].add(part["sums"], fill_value=0),
+        "orders": pd.concat([acc["orders"], part["orders"]], ignore_index=True).drop_duplicates(),
+        "customers": pd.concat([acc["customers"], part["customers"]], ignore_index=True).drop_duplicates(),
+    }
+
+
+def finalize_orders_monthly(acc: dict) -> pd.DataFrame:
+    # Same columns/order as kpi_monthly
+    s = acc["sums"].sort_index()
+    out = pd.DataFrame(index=s.index)
+    out["Total_Sales"] = s["Total_Sales"]
+    out["Total_Profit"] = s["Total_Profit"]
+    out["Orders"] = acc["orders"].groupby("Order Month").size().reindex(s.index, fill_value=0)
+    out["Customers"] = acc["customers"].groupby("Order Month").size().reindex(s.index, fill_value=0)
+    out["Avg_Discount"] = s["Discount_Sum"] / s["Discount_N"]
+    out["Profit_Margin"] = (s["Total_Profit"] / s["Total_Sales"]).where(s["Total_Sales"] != 0, 0)
+    out.index.name = "Order Month"
+    return out.reset_index()
@@ -0,0 +1,553 @@
+import json
+import re
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from src.config import (RAW_CSV, CLEAN_CSV, ENRICHED_CSV, PLOTS_DIR, MART_FACT_ORDERS, MART_DIM_PROD, MART_ORDERS_MONTHLY, OUTPUT_FORMAT, ETL_STATE, CURATED_MANIFEST, CACHE_DIR, INGEST_WORKERS, INGEST_REPORT, RUN_REPORTS, OUTLIER_SKETCH_K, PLOT_WORKERS, SCATTER_MAX_POINTS, SCATTER_BINS, CACHE_MAX_BYTES,
+                        MART_CUBE, MART_CUBE_PRODUCTS, MART_CUBE_ORDERS, DUCKDB_TEMP_DIR, DUCKDB_MEMORY_LIMIT, DUCKDB_THREADS, STREAM_SPILL_DIR)
+from src.ingest.readers import read_local_csv, read_local_csvs, iter_local_csvs, expand_paths, read_cloud_csv, is_cloud_url
+from src.ingest import schema
+from src.ingest.schema import read_kwargs
+from src.ingest.incremental import load_state, save_state, read_new_rows, build_state, fingerprint
+from src.transform.cleaning import basic_clean, drop_seen_duplicates
+from src.transform.enrich import add_enriched_fields
+from src.transform.outliers import iqr_outliers, outlier_col, build_sketches, sketch_quartiles, plot_outlier_box, plot_outliers_scatter, bin_scatter, scatter_cells
+from src.viz.charts_matplotlib import bar_sales_by_category
+from src.viz.render import MANIFEST as RENDER_MANIFEST, PlotJob, outputs_current, render_batch
+from src.model.marts import (build_fact_orders, build_dim_products, build_orders_monthly, replace_months,
+                             build_cube, build_cube_products, build_cube_orders, CUBE_DIMS,
+                             merge_cube, order_categories, merge_order_categories, merge_dim_products, monthly_partials, merge_monthly_partials, finalize_orders_monthly)
+from src.utils.cache import StageCache, code_hash, files_sha256
+from src.utils.instrument import RunReport
+from src.utils.dates import parse_dates, to_datetime
+from src.utils.io import (FORMATS, TableWriter, concat_frames, to_csv, find_table, partition_dir, partition_files, partition_path,
+                          iter_table, read_spill, read_table, spill_rows, with_format, write_partitions, write_table)
+
+
+# Outlier stage parameters (also part of the stage cache keys)
+OUTLIER_PARAMS = dict(group_col='Sub-Category', value_col='Profit')
+BOX_PLOT = dict(group_col='Sub-Category', value_col='Profit')  # one box plot per group
+SCATTER_PLOT = dict(value_x='Sales', value_y='Profit', flag_col='is_outlier')
+PLOT_COLS = ['Category', 'Sub-Category', 'Sales', 'Profit']  # all the outlier stage/plots read
+
+# Tables incremental runs keep month-partitioned (by Order Month, see src/utils/io.py); the
+# monthly mart and dim_products are small (a row per month / product) and stay single files
+MONTH_PARTITIONED = (CLEAN_CSV, ENRICHED_CSV, MART_FACT_ORDERS, MART_CUBE, MART_CUBE_PRODUCTS, MART_CUBE_ORDERS)
+ENRICHED_DATES = ['Order Date', 'Ship Date', 'Order Month']
+
+
+def run_etl(raw_path = RAW_CSV, chunksize = None, fmt = OUTPUT_FORMAT, use_cache = True, profile = False, partition = False):
+    # partition=True writes the MONTH_PARTITIONED tables as month partitions (incremental runs)
+    if chunksize:
+        return run_etl_streaming(raw_path, chunksize, fmt, profile)
+
+    # Each stage is keyed on its parent's key + params + code, so unchanged stages are
+    # loaded from data/cache (or skipped entirely when their outputs are already current).
+    cache = StageCache(CACHE_DIR, CACHE_MAX_BYTES, enabled=use_cache)
+    report = RunReport('etl', profile, engine='pandas', raw=str(raw_path), format=fmt)
+
+    def ingest():
+        print("[INGEST] Reading raw CSV…", raw_path)
+        with report.stage('ingest') as st:
+            df, stats = read_local_csvs(raw_path, INGEST_WORKERS)
+            st.add('rows_out', len(df))
+        report_ingest(stats)
+        return df
+
+    def clean():
+        df = raw.value
+        print("[CLEAN] Basic cleaning…")
+        with report.stage('clean', rows_in=len(df)) as st:
+            df = basic_clean(df)
+            st.add('rows_out', len(df))
+        return df
+
+    def enrich():
+        df = cleaned.value
+        print("[ENRICH] Derived fields…")
+        with report.stage('enrich', rows_in=len(df)) as st:
+            df = add_enriched_fields(df)
+            st.add('rows_out', len(df))
+        return df
+
+    def build_mart(name, build):
+        df = enriched.value
+        with report.stage(name, rows_in=len(df)) as st:
+            mart = build(df)
+            st.add('rows_out', len(mart))
+        return mart
+
+    def target(path):
+        return partition_dir(path) if partition and path in MONTH_PARTITIONED else with_format(path, fmt)
+
+    def writer(name, path):
+        if target(path).suffix:
+            return lambda df: report.write(name, df, lambda df: write_table(df, path, fmt))
+        # clean has no Order Month yet; its rows (and index) are those of the enriched frame
+        return lambda df: report.write(name, df, lambda df: write_partitions(
+            df, path, (df if 'Order Month' in df.columns else enriched.value)['Order Month'], fmt))
+
+    # schema (RAW_SCHEMA, read_kwargs, apply_schema) sets the dtypes of every stage; named here
+    # although code_hash would also reach it through the imports
+    raw = cache.stage('ingest', files_sha256(expand_paths(raw_path)) if use_cache else '', ingest, code=code_hash(read_local_csv, schema))
+    cleaned = cache.stage('clean', raw.key, clean, code=code_hash(basic_clean, schema))
+    enriched = cache.stage('enrich', cleaned.key, enrich, code=code_hash(add_enriched_fields))
+    cleaned.write(target(CLEAN_CSV), writer('clean', CLEAN_CSV))
+    enriched.write(target(ENRICHED_CSV), writer('enriched', ENRICHED_CSV))
+
+    print("[MARTS] Building curated tables…")
+    marts_code = code_hash(build_fact_orders, build_orders_monthly)
+    for name, build, path in (('fact_orders', build_fact_orders, MART_FACT_ORDERS),
+                              ('dim_products', build_dim_products, MART_DIM_PROD),
+                              ('orders_monthly', build_orders_monthly, MART_ORDERS_MONTHLY),
+                              ('cube', build_cube, MART_CUBE),
+                              ('cube_products', build_cube_products, MART_CUBE_PRODUCTS),
+                              ('cube_orders', build_cube_orders, MART_CUBE_ORDERS)):
+        mart = cache.stage(name, enriched.key, lambda name=name, build=build: build_mart(name, build), code=marts_code)
+        mart.write(target(path), writer(name, path))
+
+    run_outliers(lambda: enriched.value, cache, parent=enriched.key, report=report)
+
+    if use_cache:
+        print("[CACHE]", cache.report())
+        evicted = cache.evict()
+        if evicted:
+            print(f"[CACHE] Evicted {evicted} least recently used entries")
+    publish(report)
+    save_report(report, cache=dict(cache.status) if use_cache else None)
+    print("[DONE] ETL complete. Curated tables & plots ready.")
+
+
+def save_report(report, **extra):
+    path = report.save(RUN_REPORTS, **extra)
+    print(f"[REPORT] {report.summary()} -> {path}")
+
+
+def publish(report):
+    # Mark the curated tables as complete; a running dashboard reloads when this changes
+    tmp = CURATED_MANIFEST.with_suffix('.tmp')
+    tmp.write_text(json.dumps({"run": report.run, **report.meta, "started": report.started.isoformat(timespec="seconds"),
+                               "finished": datetime.now(timezone.utc).isoformat(timespec="seconds")}, indent=2))
+    tmp.replace(CURATED_MANIFEST)
+
+
+def raw_chunks(raw_path, chunksize):
+    # One file: pandas' chunked reader. Several: files parsed in parallel, in order, re-sliced.
+    # Object URLs (s3://, gs://, az://) stream through concurrent ranged reads.
+    if is_cloud_url(raw_path):
+        yield from read_cloud_csv(raw_path, chunksize, encoding='latin', **read_kwargs())
+        return
+    paths = expand_paths(raw_path)
+    if len(paths) == 1:
+        yield from read_local_csv(paths[0], chunksize=chunksize)
+        return
+    stats = []
+    for df, st in iter_local_csvs(paths, INGEST_WORKERS):
+        stats.append(st)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    report_ingest(pd.DataFrame(stats))
+
+
+def report_ingest(stats):
+    # Per-file row counts/timings for multi-file drops
+    if len(stats) < 2:
+        return
+    to_csv(stats, INGEST_REPORT)
+    print(f"[INGEST] {len(stats)} files, {int(stats['rows'].sum()):,} rows, "
+          f"{stats['seconds'].sum():.2f}s parse time (slowest {stats['seconds'].max():.2f}s) -> {INGEST_REPORT}")
+
+
+def run_etl_streaming(raw_path, chunksize, fmt = OUTPUT_FORMAT, profile = False):
+    # Bounded memory: no state spans the whole input, only the current chunk and months.
+    # 1) Raw chunks are cleaned and spilled to STREAM_SPILL_DIR by Order Month (exact
+    #    duplicates share an Order Date, so they land in the same month).
+    # 2) Whole months are read back in order, batched up to about chunksize rows (one month
+    #    may exceed it), chunk by chunk: deduplicated, enriched, appended to the curated
+    #    tables and folded into the batch's partial aggregates, which are written when the
+    #    batch ends. Row hashes and distinct order/customer/category keys thus never span
+    #    more than a batch; dim_products keeps one hash per product.
+    # 3) The enriched table is scanned again to flag outliers (run_outliers_chunked).
+    # Tables come out in month order, rows within a month in file order.
+    # Report stages accumulate over chunks (calls = chunks).
+    print(f"[INGEST] Streaming raw CSV in chunks of {chunksize:,} rows…", raw_path)
+    report = RunReport('etl', profile, engine='pandas-streaming', raw=str(raw_path), format=fmt, chunksize=chunksize)
+    pair = (OUTLIER_PARAMS['group_col'], OUTLIER_PARAMS['value_col'])
+    rows_in = rows_out = 0
+    spilled = {}  # spill file -> rows
+    STREAM_SPILL_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(dir=STREAM_SPILL_DIR) as spill:
+        spill = Path(spill)
+        for chunk in report.timed_iter('ingest', raw_chunks(raw_path, chunksize)):
+            rows_in += len(chunk)
+            with report.stage('clean', rows_in=len(chunk)) as st:
+                chunk = basic_clean(chunk)
+                st.add('rows_out', len(chunk))
+            with report.stage('spill', rows_in=len(chunk)):
+                months = parse_dates(chunk['Order Date'])[0].to_numpy().astype('datetime64[M]')
+                for month, part in chunk.groupby(months, dropna=False, sort=False):
+                    path = partition_path(spill, month).with_suffix('.pkl')
+                    spill_rows(part, path)
+                    spilled[path] = spilled.get(path, 0) + len(part)
+        print(f"[INGEST] {rows_in:,} rows read")
+
+        writers = {name: TableWriter(path, fmt) for name, path in (
+            ('clean', CLEAN_CSV), ('enriched', ENRICHED_CSV), ('fact_orders', MART_FACT_ORDERS), ('dim_products', MART_DIM_PROD),
+            ('cube', MART_CUBE), ('cube_products', MART_CUBE_PRODUCTS), ('cube_orders', MART_CUBE_ORDERS))}
+        dim_seen = np.empty(0, dtype=np.uint64)
+        monthly, sketches = [], None
+        try:
+            for batch in month_batches(spilled, chunksize):
+                seen = np.empty(0, dtype=np.uint64)
+                parts = cube = cube_products = order_cats = None
+                for chunk in read_spill(batch, chunksize):
+                    with report.stage('dedupe', rows_in=len(chunk)) as st:
+                        chunk, seen = drop_seen_duplicates(chunk, seen)
+                        st.add('rows_out', len(chunk))
+                    rows_out += len(chunk)
+                    report.write('clean', chunk, writers['clean'].write)
+
+                    with report.stage('enrich', rows_in=len(chunk)) as st:
+                        chunk = add_enriched_fields(chunk)
+                        st.add('rows_out', len(chunk))
+                    report.write('enriched', chunk, writers['enriched'].write)
+                    with report.stage('fact_orders', rows_in=len(chunk)) as st:
+                        fact = build_fact_orders(chunk)
+                        st.add('rows_out', len(fact))
+                    report.write('fact_orders', fact, writers['fact_orders'].write)
+
+                    with report.stage('partials', rows_in=len(chunk)):
+                        dimp, dim_seen = drop_seen_duplicates(build_dim_products(chunk), dim_seen)
+                        parts = merge_monthly_partials(parts, monthly_partials(chunk))
+                        cube = merge_cube(cube, build_cube(chunk))
+                        cube_products = merge_cube(cube_products, build_cube_products(chunk), CUBE_DIMS + ['Product Name'])
+                        order_cats = merge_order_categories(order_cats, order_categories(chunk))
+                    if len(dimp):
+                        report.write('dim_products', dimp, writers['dim_products'].write)
+                    with report.stage('sketches', rows_in=len(chunk)):
+                        sketches = build_sketches([chunk], [pair], OUTLIER_SKETCH_K, sketches)
+
+                with report.stage('finalize_marts'):
+                    monthly.append(finalize_orders_monthly(parts))
+                    cube_orders = build_cube_orders(order_cats)
+                for name, df in (('cube', cube), ('cube_products', cube_products), ('cube_orders', cube_orders)):
+                    report.write(name, df, writers[name].write)
+                print(f"[MONTHS {batch[0].stem}..{batch[-1].stem}] {rows_out:,} rows kept so far")
+        finally:
+            for w in writers.values():
+                w.close()
+    for name, w in writers.items():
+        if w.path.exists():
+            report.stages[f'write:{name}'].add('bytes_written', w.path.stat().st_size)
+    report.write('orders_monthly', pd.concat(monthly, ignore_index=True),
+                 lambda df: write_table(df, MART_ORDERS_MONTHLY, fmt))
+
+    run_outliers_chunked(writers['enriched'].path, chunksize, sketches, report)
+
+    publish(report)
+    save_report(report)
+    print("[DONE] ETL complete. Curated tables & plots ready.")
+
+
+def run_etl_incremental(raw_path = RAW_CSV, fmt = OUTPUT_FORMAT, profile = False):
+    # Process only rows not covered by the watermark in ETL_STATE; fall back to a full
+    # run when there is no usable state (first run, format change, missing outputs).
+    # Only the month partitions the new rows fall in are rewritten, each one replaced
+    # atomically, and the watermark is saved last. Rows are upserted on Row ID, so a run that
+    # dies before saving its state is simply repeated by the next one.
+    state = load_state(ETL_STATE)
+    if (state is None or state.get("format") != fmt or state.get("source") != str(Path(raw_path).resolve())
+            or not all(partitions_current(p, fmt) for p in MONTH_PARTITIONED)
+            or not all(with_format(p, fmt).exists() for p in (MART_DIM_PROD, MART_ORDERS_MONTHLY))):
+        print("[INCREMENTAL] No usable watermark; running a full build first…")
+        fp = fingerprint(raw_path)
+        run_etl(raw_path, fmt=fmt, profile=profile, partition=True)
+        seen = read_local_csv(raw_path, usecols=lambda c: c in ('Row ID', 'Order Date'))
+        save_state(ETL_STATE, build_state(fp, seen, fmt))
+        return
+
+    report = RunReport('etl', profile, engine='pandas-incremental', raw=str(raw_path), format=fmt)
+    print("[INGEST] Reading rows past the watermark…", raw_path)
+    with report.stage('ingest') as st:
+        raw, mode, fp = read_new_rows(raw_path, state)
+        st.add('rows_out', len(raw))
+    print(f"[INGEST] {len(raw):,} new rows (source {mode}; last max Order Date {state.get('max_order_date')})")
+    if raw.empty:
+        save_state(ETL_STATE, build_state(fp, raw, fmt, prev=state))
+        save_report(report, source=mode)
+        print("[DONE] Nothing new to process.")
+        return
+    new_state = build_state(fp, raw, fmt, prev=state)
+
+    print("[CLEAN] Basic cleaning (new rows)…")
+    with report.stage('clean', rows_in=len(raw)) as st:
+        cleaned = basic_clean(raw)
+        st.add('rows_out', len(cleaned))
+
+    print("[ENRICH] Derived fields (new rows)…")
+    with report.stage('enrich', rows_in=len(cleaned)) as st:
+        df = add_enriched_fields(cleaned)
+        st.add('rows_out', len(df))
+
+    def write_month(name, df, path, month):
+        report.write(name, df, lambda df: write_table(df, partition_path(path, month, fmt), fmt))
+
+    print("[MARTS] Rewriting the affected month partitions, upserting products…")
+    affected = []
+    for month, new in df.groupby('Order Month', dropna=False, sort=True):
+        with report.stage('read_partitions') as st:
+            clean_m = upsert_rows(read_partition(CLEAN_CSV, month, fmt), cleaned.loc[new.index])
+            enriched_m = upsert_rows(read_partition(ENRICHED_CSV, month, fmt, ENRICHED_DATES), new)
+            st.add('rows_out', len(enriched_m))
+        write_month('clean', clean_m, CLEAN_CSV, month)
+        write_month('enriched', enriched_m, ENRICHED_CSV, month)
+        for name, build, path in (('fact_orders', build_fact_orders, MART_FACT_ORDERS), ('cube', build_cube, MART_CUBE),
+                                  ('cube_products', build_cube_products, MART_CUBE_PRODUCTS),
+                                  ('cube_orders', build_cube_orders, MART_CUBE_ORDERS)):
+            with report.stage(name, rows_in=len(enriched_m)) as st:
+                mart = build(enriched_m)
+                st.add('rows_out', len(mart))
+            write_month(name, mart, path, month)
+        affected.append(enriched_m)
+
+    dim_path = with_format(MART_DIM_PROD, fmt)
+    with report.stage('dim_products', rows_in=len(df)) as st:
+        dimp = merge_dim_products(read_table(dim_path), build_dim_products(df))
+        st.add('rows_out', len(dimp))
+    report.write('dim_products', dimp, lambda df: write_table(df, MART_DIM_PROD, fmt))
+
+    months = df['Order Month'].dropna().unique()
+    if len(months):
+        affected = concat_frames(affected)
+        with report.stage('orders_monthly', rows_in=len(affected)) as st:
+            existing = read_table(with_format(MART_ORDERS_MONTHLY, fmt), parse_dates=['Order Month'])
+            monthly = replace_months(existing, build_orders_monthly(affected), months)
+            st.add('rows_out', len(monthly))
+        report.write('orders_monthly', monthly, lambda df: write_table(df, MART_ORDERS_MONTHLY, fmt))
+    print(f"[MARTS] Rewrote {len(months)} month(s)")
+
+    run_outliers(lambda: read_table(find_table(MART_FACT_ORDERS), columns=PLOT_COLS), report=report)
+
+    save_state(ETL_STATE, new_state)
+    publish(report)
+    save_report(report, source=mode, months=len(months))
+    print("[DONE] Incremental ETL complete.")
+
+
+def partitions_current(path, fmt) -> bool:
+    # The table's month partitions exist in `fmt` and are its newest copy
+    files = partition_files(path)
+    return bool(files) and files[0].suffix == FORMATS[fmt] and find_table(path) == partition_dir(path)
+
+
+def read_partition(path, month, fmt, dates=()):
+    # One month of a partitioned table (None if absent), typed like the frames of a run:
+    # CSV text goes through the raw schema and `dates` are parsed; Parquet keeps its dtypes
+    p = partition_path(path, month, fmt)
+    if not p.exists():
+        return None
+    if fmt == 'parquet':
+        return read_table(p)
+    return to_datetime(schema.apply_schema(read_table(p, **read_kwargs())), dates)
+
+
+def upsert_rows(old, new: pd.DataFrame) -> pd.DataFrame:
+    # Existing rows minus those sent again (same Row ID, e.g. a retried batch), then the new ones
+    if old is None:
+        return new
+    if 'Row ID' in new.columns:
+        old = old[~old['Row ID'].isin(new['Row ID'])]
+    return concat_frames([old, new])
+
+
+def run_etl_duckdb(raw_path = RAW_CSV, fmt = OUTPUT_FORMAT, profile = False):
+    # Same steps as run_etl, executed as SQL inside DuckDB: multi-threaded, spills to
+    # DUCKDB_TEMP_DIR instead of holding frames in Python, outputs COPY'd straight to disk.
+    from src.sql import etl as sql
+
+    # Marts are built inside COPY, so each one is timed as its write stage.
+    report = RunReport('etl', profile, engine='duckdb', raw=str(raw_path), format=fmt)
+    con = sql.connect(DUCKDB_TEMP_DIR, DUCKDB_MEMORY_LIMIT, DUCKDB_THREADS)
+    utf8 = DUCKDB_TEMP_DIR / "raw_utf8.csv"
+
+    def copy(name, query, path):
+        path = with_format(path, fmt)
+        with report.stage(f'write:{name}') as st:
+            st.add('rows_out', sql.copy_to(con, query, path, fmt))
+        st.add('bytes_written', path.stat().st_size)
+
+    try:
+        print("[INGEST] Loading raw CSV into DuckDB…", raw_path)
+        with report.stage('ingest') as st:
+            sql.transcode_to_utf8(raw_path, utf8)
+            sql.load_raw(con, utf8)
+            st.add('rows_out', sql.row_count(con, 'raw'))
+
+        print("[CLEAN] Basic cleaning (SQL)…")
+        with report.stage('clean', rows_in=st.rows_out) as st:
+            sql.basic_clean(con)
+            st.add('rows_out', sql.row_count(con, 'clean'))
+        copy('clean', sql.table_sql('clean'), CLEAN_CSV)
+
+        print("[ENRICH] Derived fields (SQL)…")
+        with report.stage('enrich', rows_in=st.rows_out) as st:
+            sql.add_enriched_fields(con)
+            st.add('rows_out', sql.row_count(con, 'enriched'))
+        copy('enriched', sql.table_sql('enriched'), ENRICHED_CSV)
+
+        print("[MARTS] Building curated tables (SQL)…")
+        copy('fact_orders', sql.fact_orders_sql(), MART_FACT_ORDERS)
+        copy('dim_products', sql.dim_products_sql(), MART_DIM_PROD)
+        copy('orders_monthly', sql.kpi_monthly_sql(), MART_ORDERS_MONTHLY)
+        copy('cube', sql.cube_sql(), MART_CUBE)
+        copy('cube_products', sql.cube_products_sql(), MART_CUBE_PRODUCTS)
+        copy('cube_orders', sql.cube_orders_sql(), MART_CUBE_ORDERS)
+
+        # Only the columns the outlier stage needs come back into pandas
+        outl = con.execute(f'SELECT {", ".join(sql.q(c) for c in PLOT_COLS)} FROM enriched ORDER BY _rn').df()
+    finally:
+        con.close()
+        utf8.unlink(missing_ok=True)
+
+    run_outliers(lambda: outl, report=report)
+    publish(report)
+    save_report(report)
+    print("[DONE] ETL complete (DuckDB engine). Curated tables & plots ready.")
+
+
+def run_outliers(load, cache = None, parent = '', report = None):
+    # `load` returns the frame to flag; only called when the outlier stage isn't cached
+    cache = cache or StageCache(CACHE_DIR, CACHE_MAX_BYTES, enabled=False)
+    report = report or RunReport('outliers')
+
+    def flag():
+        print("[OUTLIERS] Flag + visuals (Profit by Sub-Category)…")
+        df = load()
+        pair = (OUTLIER_PARAMS['group_col'], OUTLIER_PARAMS['value_col'])
+        with report.stage('outliers', rows_in=len(df)) as st:
+            flags = iqr_outliers(df, [pair])
+            # keep only what the plots read instead of a widened copy of the frame
+            df = df[PLOT_COLS].assign(**{SCATTER_PLOT['flag_col']: flags[outlier_col(*pair)]})
+            st.add('rows_out', int(df[SCATTER_PLOT['flag_col']].sum()))  # rows flagged
+        return df
+
+    flagged = cache.stage('outliers', parent, flag, params=dict(OUTLIER_PARAMS, columns=PLOT_COLS), code=code_hash(iqr_outliers))
+    # The plots are a function of the flagged frame and the plotting code (plot_jobs reaches
+    # all of it, config included): when neither changed and no output was touched, the
+    # flagged frame isn't even loaded to re-hash the jobs
+    plots_key = cache.key('plots', flagged.key, code=code_hash(plot_jobs))
+    manifest = PLOTS_DIR / RENDER_MANIFEST
+    if cache.output_current(manifest, plots_key) and outputs_current(PLOTS_DIR):
+        cache.status['plots'] = 'skip'
+        print("[PLOTS] unchanged")
+        return
+    df = flagged.value
+    with report.stage('plots', rows_in=len(df)):
+        res = render_batch(plot_jobs(df), PLOTS_DIR, PLOT_WORKERS)
+    if manifest.exists():
+        cache.record_output(manifest, plots_key)
+    cache.status['plots'] = 'miss' if res['rendered'] else 'hit'
+    print(f"[PLOTS] {res['rendered']} rendered, {res['skipped']} unchanged")
+
+
+def month_batches(spilled: dict, chunksize: int) -> list:
+    # Spill files in month order (YYYY-MM, unknown last) grouped into runs of whole months
+    # of at most chunksize rows, or a single larger month
+    batches, n = [], chunksize
+    for path in sorted(spilled):
+        if n + spilled[path] > chunksize:
+            batches.append([])
+            n = 0
+        batches[-1].append(path)
+        n += spilled[path]
+    return batches
+
+
+def run_outliers_chunked(path, chunksize, sketches, report):
+    # run_outliers for chunked runs: the enriched table at `path` is scanned chunk by chunk
+    # and flagged against the sketch quartiles. Only what the plots draw is kept: outlier
+    # rows, per-group whiskers (extremes of the unflagged values), category totals and the
+    # normal scatter points, or, past SCATTER_MAX_POINTS, grid counts from a second scan.
+    print("[OUTLIERS] Flag + visuals (Profit by Sub-Category)…")
+    pair = g, v = (OUTLIER_PARAMS['group_col'], OUTLIER_PARAMS['value_col'])
+    x, y, flag = SCATTER_PLOT['value_x'], SCATTER_PLOT['value_y'], SCATTER_PLOT['flag_col']
+    quartiles = sketch_quartiles(sketches)
+
+    def flagged_chunks():
+        for chunk in iter_table(path, PLOT_COLS, chunksize):
+            yield chunk.assign(**{flag: iqr_outliers(chunk, [pair], quartiles=quartiles)[outlier_col(*pair)].to_numpy()})
+
+    outl, normal, n_normal = [], [], 0
+    whiskers = sales = None
+    extent = [np.inf, -np.inf, np.inf, -np.inf]  # x0, x1, y0, y1 of the finite normal points
+    with report.stage('outliers') as st:
+        for chunk in flagged_chunks():
+            st.add('rows_in', len(chunk))
+            is_out = chunk[flag].to_numpy()
+            outl.append(chunk.loc[is_out, list(dict.fromkeys([g, v, x, y, flag]))])
+            rest = chunk[~is_out]
+            part = rest.groupby(g, observed=True)[v].agg(['min', 'max'])
+            whiskers = part if whiskers is None else pd.concat([whiskers, part]).groupby(level=0).agg({'min': 'min', 'max': 'max'})
+            part = chunk.groupby('Category', observed=True)['Sales'].sum()
+            sales = part if sales is None else sales.add(part, fill_value=0)
+            if n_normal <= SCATTER_MAX_POINTS:
+                normal.append(rest[[x, y, flag]])
+            n_normal += len(rest)
+            xs, ys = rest[x].to_numpy(dtype=float), rest[y].to_numpy(dtype=float)
+            ok = np.isfinite(xs) & np.isfinite(ys)
+            if ok.any():
+                extent = [min(extent[0], xs[ok].min()), max(extent[1], xs[ok].max()),
+                          min(extent[2], ys[ok].min()), max(extent[3], ys[ok].max())]
+        outl = concat_frames(outl)
+        st.add('rows_out', len(outl))  # rows flagged
+
+    labels, q1, q3 = quartiles[pair]
+    jobs = []
+    for i, val in sorted(enumerate(labels), key=lambda t: t[1]):
+        lo, hi = whiskers.loc[val] if val in whiskers.index else (q1[i], q3[i])
+        stats = dict(q1=float(q1[i]), med=float(sketches[pair][val].quantile(0.5)[0]), q3=float(q3[i]),
+                     whislo=float(lo), whishi=float(hi))
+        jobs.append(PlotJob(box_plot_path(val), plot_outlier_box, outl.loc[outl[g] == val, [g, v]].reset_index(drop=True),
+                            dict(group_val=val, stats=stats, **BOX_PLOT)))
+    scatter = PLOTS_DIR / "scatter_profit_outliers.png"
+    if n_normal > SCATTER_MAX_POINTS:
+        counts = 0
+        for chunk in flagged_chunks():
+            rest = chunk[~chunk[flag].to_numpy()]
+            xs, ys = rest[x].to_numpy(dtype=float), rest[y].to_numpy(dtype=float)
+            ok = np.isfinite(xs) & np.isfinite(ys)
+            c, xe, ye = np.histogram2d(xs[ok], ys[ok], bins=SCATTER_BINS, range=[extent[:2], extent[2:]])
+            counts = counts + c
+        cells, ext = scatter_cells(counts, xe, ye, outl, x, y, flag)
+        jobs.append(PlotJob(scatter, plot_outliers_scatter, cells, dict(SCATTER_PLOT, extent=ext, bins=SCATTER_BINS)))
+    else:
+        jobs.append(PlotJob(scatter, plot_outliers_scatter, concat_frames(normal + [outl[[x, y, flag]]]), SCATTER_PLOT))
+    jobs.append(PlotJob(PLOTS_DIR / "sales_by_category.png", bar_sales_by_category, sales.rename_axis('Category').reset_index(), {}))
+    with report.stage('plots'):
+        res = render_batch(jobs, PLOTS_DIR, PLOT_WORKERS)
+    print(f"[PLOTS] {res['rendered']} rendered, {res['skipped']} unchanged")
+
+
+def box_plot_path(val) -> Path:
+    slug = lambda s: re.sub(r'\W+', '_', str(s)).lower()
+    return PLOTS_DIR / f"{slug(val)}_{slug(BOX_PLOT['value_col'])}_box.png"
+
+
+def plot_jobs(flagged):
+    # A box plot per group, the outlier scatter and the charts_matplotlib charts; each job
+    # carries only its data slice, which is also what decides whether it is re-rendered
+    g, v = BOX_PLOT['group_col'], BOX_PLOT['value_col']
+    jobs = [PlotJob(box_plot_path(val), plot_outlier_box, sub[[g, v]], dict(group_val=val, **BOX_PLOT))
+            for val, sub in flagged.groupby(g, observed=True)]
+    scatter_cols = [SCATTER_PLOT['value_x'], SCATTER_PLOT['value_y'], SCATTER_PLOT['flag_col']]
+    if (~flagged[SCATTER_PLOT['flag_col']]).sum() > SCATTER_MAX_POINTS:
+        # binned here, so the job (hashed, sent to a worker) carries grid cells + outliers, not every row
+        cells, extent = bin_scatter(flagged, **SCATTER_PLOT, bins=SCATTER_BINS)
+        jobs.append(PlotJob(PLOTS_DIR / "scatter_profit_outliers.png", plot_outliers_scatter, cells,
+                            dict(SCATTER_PLOT, extent=extent, bins=SCATTER_BINS)))
+    else:
+        jobs.append(PlotJob(PLOTS_DIR / "scatter_profit_outliers.png", plot_outliers_scatter, flagged[scatter_cols], SCATTER_PLOT))
+    jobs.append(PlotJob(PLOTS_DIR / "sales_by_category.png", bar_sales_by_category, flagged[['Category', 'Sales']], {}))
+    return jobs
@@ -1,13 +1,92 @@
+import threading
 import duckdb
-import pandas as pd
 from pathlib import Path
+from ..config import CURATED_TABLES
+from ..utils.io import find_table, partition_files
 
-# Open an in-memory DB (or pass a file path to persist)
+# Long-lived DuckDB session over the curated tables (or pass a file path to persist)
 
-def query_csvs(curated_dir: Path, sql: str) -> pd.DataFrame:
-    con = duckdb.connect()
-    # Auto-scan curated CSVs
-    con.execute(f"CREATE VIEW fact_orders AS SELECT * FROM read_csv_auto('{(curated_dir/'fact_orders.csv').as_posix()}')")
-    con.execute(f"CREATE VIEW dim_products AS SELECT * FROM read_csv_auto('{(curated_dir/'dim_products.csv').as_posix()}')")
-    con.execute(f"CREATE VIEW mart_orders_monthly AS SELECT * FROM read_csv_auto('{(curated_dir/'mart_orders_monthly.csv').as_posix()}')")
-    return con.execute(sql).df()
\ No newline at end of file
+CURATED_VIEWS = list(CURATED_TABLES)
+
+
+def scan_expr(path: Path) -> str:
+    # Parquet is scanned natively (typed, column-pruned); CSV falls back to the sniffer.
+    # A month-partitioned table is scanned as the list of its files.
+    files = partition_files(path) if path.is_dir() else [path]
+    reader = 'read_parquet' if files[0].suffix == '.parquet' else 'read_csv_auto'
+    paths = ', '.join(f"'{p.as_posix()}'" for p in files)
+    return f"{reader}([{paths}])"
+
+
+class CuratedSession:
+    # Curated tables are loaded into DuckDB once (materialize=True) or exposed as views, and
+    # reloaded only when the backing file's path/mtime/size changes. Queries take bound
+    # parameters (`?` / `$name`) and return pandas or Arrow.
+    def __init__(self, curated_dir: Path, database: str = ':memory:', materialize: bool = True, tables=CURATED_VIEWS):
+        self.curated_dir = Path(curated_dir)
+        self.materialize = materialize
+        self.tables = list(tables)
+        self.con = duckdb.connect(database)
+        self._loaded = {}  # table -> (path, mtime_ns, size)
+        self._lock = threading.Lock()
+
+    def refresh(self) -> list:
+        # (Re)load tables whose files changed; returns the names that were reloaded
+        reloaded = []
+        for name in self.tables:
+            try:
+                path = find_table(self.curated_dir / name)
+            except FileNotFoundError:
+                continue  # not produced (yet) in this curated dir
+            st = path.stat()
+            sig = (str(path), st.st_mtime_ns, st.st_size)
+            if self._loaded.get(name) == sig:
+                continue
+            kind = 'TABLE' if self.materialize else 'VIEW'
+            # DROP TABLE on a view (or DROP VIEW on a table) raises, so drop what is there
+            existing = self.con.execute(
+                "SELECT table_type FROM information_schema.tables WHERE table_schema = 'main' AND table_name = ?", [name]
+            ).fetchone()
+            if existing:
+                self.con.execute(f"DROP {'VIEW' if existing[0] == 'VIEW' else 'TABLE'} {name}")
+            self.con.execute(f"CREATE {kind} {name} AS SELECT * FROM {scan_expr(path)}")
+            self._loaded[name] = sig
+            reloaded.append(name)
+        return reloaded
+
+    def query(self, sql: str, params=None, output: str = 'pandas'):
+        if output not in ('pandas', 'arrow'):
+            raise ValueError("output must be 'pandas' or 'arrow'")
+        with self._lock:
+            self.refresh()
+            res = self.con.execute(sql, params) if params is not None else self.con.execute(sql)
+            return res.fetch_arrow_table() if output == 'arrow' else res.df()
+
+    def close(self):
+        with self._lock:
+            self.con.close()
+            self._loaded.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_SESSIONS = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def get_session(curated_dir: Path) -> CuratedSession:
+    # One shared session per curated directory for the life of the process
+    key = Path(curated_dir).resolve()
+    with _SESSIONS_LOCK:
+        if key not in _SESSIONS:
+            _SESSIONS[key] = CuratedSession(key)
+        return _SESSIONS[key]
+
+
+def query_csvs(curated_dir: Path, sql: str, params=None, output: str = 'pandas'):
+    # Queries the curated tables (CSV or Parquet) through the cached session
+    return get_session(curated_dir).query(sql, params, output)
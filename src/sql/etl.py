@@ -0,0 +1,169 @@
+from pathlib import Path
+import duckdb
+
+# SQL versions of the pandas ETL steps (basic_clean, add_enriched_fields, marts, kpi_monthly).
+# Tables keep a `_rn` column (raw file row order) so outputs come out in the same order as
+# the pandas path; it is dropped when copying results out.
+
+NUMERIC_COLS = ['Sales', 'Quantity', 'Discount', 'Profit']
+DATE_COLS = ['Order Date', 'Ship Date']
+FACT_COLS = [
+    "Order ID","Order Date","Ship Date","Customer ID","Segment","Country","City","State","Postal Code","Region",
+    "Product ID","Product Name", "Category","Sub-Category","Sales","Quantity","Discount","Profit","Profit Margin","Order Month"
+]
+DIM_COLS = ['Product ID', 'Product Name', 'Category', 'Sub-Category']
+TRANSCODE_BLOCK = 16 << 20
+
+
+def q(col: str) -> str:
+    return '"' + col.replace('"', '""') + '"'
+
+
+def connect(temp_dir: Path, memory_limit=None, threads=None) -> duckdb.DuckDBPyConnection:
+    # In-memory database that spills to temp_dir once memory_limit is reached
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    con = duckdb.connect()
+    con.execute(f"SET temp_directory = '{temp_dir.as_posix()}'")
+    con.execute("SET preserve_insertion_order = true")
+    if memory_limit:
+        con.execute(f"SET memory_limit = '{memory_limit}'")
+    if threads:
+        con.execute(f"SET threads = {int(threads)}")
+    return con
+
+
+def transcode_to_utf8(src: Path, dst: Path, encoding='latin'):
+    # DuckDB only reads UTF-8 (and strict latin-1); decode the way pandas does, block by block
+    with open(src, 'r', encoding=encoding, newline='') as fin, open(dst, 'w', encoding='utf-8', newline='') as fout:
+        for block in iter(lambda: fin.read(TRANSCODE_BLOCK), ''):
+            fout.write(block)
+
+
+# Sniffer overrides so raw types line up with pandas' inference: dates stay text until
+# enrichment, and Postal Code is numeric (pandas reads "05408" as 5408)
+RAW_TYPES = {'Order Date': 'VARCHAR', 'Ship Date': 'VARCHAR', 'Postal Code': 'BIGINT'}
+
+
+def load_raw(con, path: Path):
+    types = ", ".join(f"'{c}': '{t}'" for c, t in RAW_TYPES.items())
+    con.execute(f"""
+        CREATE OR REPLACE TABLE raw AS
+        SELECT * FROM read_csv('{Path(path).as_posix()}', header = true, types = {{{types}}})
+    """)
+
+
+def basic_clean(con):
+    # trim text, coerce numerics, Discount validity filter, drop exact duplicates (keep first)
+    cols = [(name, typ) for name, typ, *_ in con.execute("DESCRIBE raw").fetchall()]
+    exprs = []
+    for name, typ in cols:
+        if name in NUMERIC_COLS and typ == 'VARCHAR':
+            exprs.append(f"TRY_CAST(trim({q(name)}) AS DOUBLE) AS {q(name)}")
+        elif typ == 'VARCHAR':
+            exprs.append(f"trim({q(name)}) AS {q(name)}")
+        else:
+            exprs.append(q(name))
+    names = ", ".join(q(n) for n, _ in cols)
+    where = "WHERE Discount > 0 AND Discount <= 0.9" if 'Discount' in dict(cols) else ""
+    con.execute(f"""
+        CREATE OR REPLACE TABLE clean AS
+        SELECT * FROM (SELECT {", ".join(exprs)}, rowid AS _rn FROM raw) t
+        {where}
+        QUALIFY row_number() OVER (PARTITION BY {names} ORDER BY _rn) = 1
+        ORDER BY _rn
+    """)
+
+
+def parse_date(col: str) -> str:
+    return f"COALESCE(TRY_STRPTIME({q(col)}, '%m/%d/%Y'), TRY_CAST({q(col)} AS TIMESTAMP))"
+
+
+def add_enriched_fields(con):
+    con.execute(f"""
+        CREATE OR REPLACE TABLE enriched AS
+        SELECT * EXCLUDE (_rn) REPLACE ({", ".join(f"{parse_date(c)} AS {q(c)}" for c in DATE_COLS)}),
+               CASE WHEN Sales = 0 THEN 0 ELSE Profit / Sales END AS "Profit Margin",
+               date_trunc('month', {parse_date('Order Date')}) AS "Order Month",
+               _rn
+        FROM clean
+        ORDER BY _rn
+    """)
+
+
+def fact_orders_sql() -> str:
+    return f"SELECT {', '.join(q(c) for c in FACT_COLS)} FROM enriched ORDER BY _rn"
+
+
+def dim_products_sql() -> str:
+    cols = ", ".join(q(c) for c in DIM_COLS)
+    return f"""
+        SELECT {cols} FROM enriched
+        QUALIFY row_number() OVER (PARTITION BY {cols} ORDER BY _rn) = 1
+        ORDER BY _rn
+    """
+
+
+def kpi_monthly_sql() -> str:
+    return """
+        SELECT "Order Month",
+               sum(Sales) AS Total_Sales,
+               sum(Profit) AS Total_Profit,
+               count(DISTINCT "Order ID") AS Orders,
+               count(DISTINCT "Customer ID") AS Customers,
+               avg(Discount) AS Avg_Discount,
+               CASE WHEN coalesce(sum(Sales), 0) = 0 THEN 0 ELSE sum(Profit) / sum(Sales) END AS Profit_Margin
+        FROM enriched
+        WHERE "Order Month" IS NOT NULL
+        GROUP BY "Order Month"
+        ORDER BY "Order Month"
+    """
+
+
+CUBE_DIMS = ['Order Date', 'Order Month', 'Region', 'Category', 'Segment']
+
+
+def cube_sql() -> str:
+    dims = ", ".join(q(c) for c in CUBE_DIMS)
+    return f"""
+        SELECT {dims}, sum(Sales) AS Sales, sum(Profit) AS Profit, sum(Quantity) AS Quantity, count(*) AS Lines
+        FROM enriched GROUP BY ALL ORDER BY ALL
+    """
+
+
+def cube_products_sql() -> str:
+    dims = ", ".join(q(c) for c in CUBE_DIMS + ['Product Name'])
+    return f"""
+        SELECT {dims}, sum(Sales) AS Sales, sum(Profit) AS Profit
+        FROM enriched GROUP BY ALL ORDER BY ALL
+    """
+
+
+def cube_orders_sql() -> str:
+    # Each order's category set ('Furniture|Technology'), then orders per set
+    return """
+        SELECT "Order Date", "Order Month", Region, Segment, Categories, count(*) AS Orders
+        FROM (
+            SELECT "Order ID", "Order Date", "Order Month", Region, Segment,
+                   string_agg(DISTINCT Category, '|' ORDER BY Category) AS Categories
+            FROM enriched GROUP BY ALL
+        ) GROUP BY ALL ORDER BY ALL
+    """
+
+
+def copy_to(con, sql: str, path: Path, fmt='csv') -> int:
+    # Write a query result straight to disk without materializing it in Python; -> rows written
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == 'parquet':
+        opts = "FORMAT PARQUET, COMPRESSION ZSTD"
+    else:
+        opts = "FORMAT CSV, HEADER true, TIMESTAMPFORMAT '%Y-%m-%d'"
+    return con.execute(f"COPY ({sql}) TO '{path.as_posix()}' ({opts})").fetchone()[0]
+
+
+def row_count(con, table: str) -> int:
+    return con.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+
+
+def table_sql(name: str) -> str:
+    return f"SELECT * EXCLUDE (_rn) FROM {name} ORDER BY _rn"
+
@@ -1,32 +1,62 @@
+import numpy as np
 import pandas as pd
+from ..ingest.schema import apply_schema
 
-EXPECTED_COLS = [
-    "Order ID","Order Date","Ship Date","Ship Mode","Customer ID","Customer Name",
-    "Segment","Country","City","State","Postal Code","Region","Product ID",
-    "Category","Sub-Category","Product Name","Sales","Quantity","Discount","Profit"
-]
 
-def basic_clean(df: pd.DataFrame) -> pd.DataFrame:
-    # 1) Trim columns that exists in SuperStore; keep extras if present
-    # (We won't drop unknown columns by default; interview-friendly to show flexibility.)
+def _strip(s: pd.Series) -> pd.Series:
+    if not isinstance(s.dtype, pd.CategoricalDtype):
+        return s.str.strip()
+    # categoricals: strip the categories once; values that collapse together are merged
+    cats = s.cat.categories
+    if not pd.api.types.is_string_dtype(cats):
+        return s
+    stripped = cats.str.strip()
+    if stripped.equals(cats):
+        return s
+    codes, uniq = pd.factorize(stripped, sort=True)
+    mapped = np.where(s.cat.codes.to_numpy() >= 0, codes[s.cat.codes.to_numpy()], -1)
+    return pd.Series(pd.Categorical.from_codes(mapped, uniq), index=s.index, name=s.name)
+
 
+def basic_clean(df: pd.DataFrame) -> pd.DataFrame:
+    # One pass with at most one row copy in the common case: invalid rows are dropped
+    # before any text is touched, and the frame is only re-sliced when there are duplicates.
+    # The input frame is never modified.
 
-    # 2) Strip whitespace in object columns
-    for c in df.select_dtypes(include="object").columns:
-        df[c] = df[c].astype(str).str.strip()
+    # 1) Columns/dtypes: the raw reader already applies the schema (src/ingest/schema.py);
+    # frames from other sources are cast here. Numbers coerce (bad values -> NaN).
+    df = apply_schema(df)
 
-    # 3) Fix dtypes
-    numeric_cols = ['Sales', 'Quantity', 'Discount', 'Profit']
-    for c in numeric_cols:
-        if c in df.columns:
-            df[c] = pd.to_numeric(df[c], errors='coerce')
-    
-    # 4) Remove impossible values
+    # 2) Remove impossible values (Discount is numeric, so stripping can't change the mask)
     if 'Discount' in df.columns:
-        df = df[(df['Discount'] > 0) & (df['Discount'] <= 0.9)]
-    
+        d = df['Discount'].to_numpy()
+        keep = (d > 0) & (d <= 0.9)
+        if not keep.all():
+            df = df[keep]
+
+    # 3) Strip whitespace in text columns
+    text = {c: df[c] for c in df.columns
+            if isinstance(df[c].dtype, (pd.StringDtype, pd.CategoricalDtype)) or df[c].dtype == object}
+    if text:
+        df = df.assign(**{c: _strip(s.astype(str) if s.dtype == object else s) for c, s in text.items()})
+
+    # 4) Drop duplicates
+    dup = df.duplicated().to_numpy()
+    if dup.any():
+        df = df[~dup]
+
+    return df
 
-    # 5) Drop duplicates
-    df = df.drop_duplicates()
 
-    return df
\ No newline at end of file
+def drop_seen_duplicates(df: pd.DataFrame, seen: np.ndarray):
+    # Cross-chunk dedup for streaming runs. `seen` is a sorted array of row hashes
+    # (8 bytes per kept row) from earlier chunks; returns the new rows and updated hashes.
+    h = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    if len(seen):
+        pos = np.minimum(np.searchsorted(seen, h), len(seen) - 1)
+        keep = seen[pos] != h
+    else:
+        keep = np.ones(len(h), dtype=bool)
+    # both inputs are sorted runs, so a stable sort is effectively a linear merge
+    seen = np.sort(np.concatenate([seen, np.sort(h[keep])]), kind="stable")
+    return df[keep], seen
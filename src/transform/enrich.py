@@ -1,13 +1,17 @@
+import numpy as np
 import pandas as pd
 from ..utils.dates import to_datetime, add_order_month
 
 def add_enriched_fields(df: pd.DataFrame) -> pd.DataFrame:
+    # Returns a new frame; columns it doesn't derive share memory with the input
+    df = df.copy(deep=False)
+
     # parse dates
     df = to_datetime(df, ['Order Date', 'Ship Date'])
 
-    # derived metrics
-    df['Profit Margin'] = df.apply(
-        lambda r: (r['Profit']/r['Sales']) if r['Sales'] else 0, axis=1
-    )
+    # derived metrics (0 where Sales is 0; NaN Sales/Profit give NaN)
+    sales, profit = df['Sales'].to_numpy(), df['Profit'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        df['Profit Margin'] = np.where(sales != 0, profit / sales, 0.0)
     df = add_order_month(df, col='Order Date', new_col='Order Month')
-    return df
\ No newline at end of file
+    return df
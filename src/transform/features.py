@@ -1,27 +1,71 @@
+import numpy as np
 import pandas as pd
 
 # Reusable aggregations for marts and dashboard
 
+def _nunique_by_code(codes: np.ndarray, values: pd.Series, n_groups: int) -> np.ndarray:
+    # distinct non-null values per group: dedupe (group, value) integer pairs, then count
+    v, _ = pd.factorize(values)
+    ok = v >= 0
+    width = int(v.max()) + 1 if ok.any() else 1
+    pairs = pd.unique(codes[ok].astype(np.int64) * width + v[ok])
+    return np.bincount(pairs // width, minlength=n_groups)
+
+
+def _series_sums_by_code(codes: np.ndarray, values: pd.DataFrame, n_groups: int) -> np.ndarray:
+    # Series.sum of each group and column, in row order: NaN -> 0, then NumPy's pairwise sum
+    # over the group's values. Grouped sums (Kahan) can differ from it in the last bit.
+    # Small integer codes take NumPy's radix sort.
+    small = codes.astype(np.int16) if n_groups <= np.iinfo(np.int16).max else codes
+    order = np.argsort(small, kind="stable")
+    v = np.stack([values[c].to_numpy(dtype=np.float64)[order] for c in values.columns])  # a contiguous row per column
+    v = np.where(np.isnan(v), 0.0, v)
+    ends = np.cumsum(np.bincount(codes, minlength=n_groups))
+    return np.array([v[:, start:end].sum(axis=1) for start, end in zip(np.r_[0, ends[:-1]], ends)]).reshape(n_groups, v.shape[0])
+
+
 def kpi_monthly(df: pd.DataFrame) -> pd.DataFrame:
-    g = df.groupby("Order Month").agg(
-        Total_Sales = ('Sales', 'sum'),
-        Total_Profit = ('Profit', 'sum'),
-        Orders = ('Order ID', 'nunique'),
-        Customers = ('Customer ID', 'nunique'),
-        Avg_Discount = ('Discount', 'mean'),
-        Profit_Margin = ("Profit", lambda x: x.sum()/df.loc[x.index, "Sales"].sum() if df.loc[x.index, "Sales"].sum() else 0)
-    ).reset_index()
-    return g
+    # One grouped pass over integer month codes (NaT months are dropped, as groupby does)
+    codes, months = pd.factorize(df["Order Month"], sort=True)
+    valid = codes >= 0
+    if not valid.all():
+        df, codes = df[valid], codes[valid]
+    n = len(months)
+
+    sums = df[["Sales", "Profit", "Discount"]].groupby(codes).sum().reindex(range(n), fill_value=0)
+    total_sales = sums["Sales"].to_numpy()
+    total_profit = sums["Profit"].to_numpy()
+    discount_n = np.bincount(codes[df["Discount"].notna().to_numpy()], minlength=n)
+
+    # Sales/Profit are summed twice on purpose: the totals above must equal groupby().sum()
+    # (Kahan-compensated) and the margin must equal the replaced lambda's Series.sum ratio
+    # (pairwise), and the two summations differ in the last bit. One pass can't give both;
+    # the second one costs ~5% of the function on 1M rows.
+    margin_sales, margin_profit = _series_sums_by_code(codes, df[["Sales", "Profit"]], n).T
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        avg_discount = sums["Discount"].to_numpy() / discount_n
+        margin = np.where(margin_sales != 0, margin_profit / margin_sales, 0.0)
+
+    return pd.DataFrame({
+        "Order Month": months,
+        "Total_Sales": total_sales,
+        "Total_Profit": total_profit,
+        "Orders": _nunique_by_code(codes, df["Order ID"], n),
+        "Customers": _nunique_by_code(codes, df["Customer ID"], n),
+        "Avg_Discount": avg_discount,
+        "Profit_Margin": margin,
+    })
 
 
 def by_category(df: pd.DataFrame) -> pd.DataFrame:
-    return df.groupby(['Category']).agg(
+    return df.groupby(['Category'], observed=True).agg(
         Sales=('Sales', 'sum'), Profit=('Profit', 'sum'), Quantity=('Quantity', 'sum')
     ).reset_index()
 
 
 def by_region_category(df: pd.DataFrame) -> pd.DataFrame:
-    return df.pivot_table(values='Sales', index='Region', columns='Category', aggfunc='sum').reset_index()
+    return df.pivot_table(values='Sales', index='Region', columns='Category', aggfunc='sum', observed=True).reset_index()
 
 
 def top_products(df: pd.DataFrame, n = 10) -> pd.DataFrame:
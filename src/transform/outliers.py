@@ -1,11 +1,12 @@
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 from pathlib import Path
+from .sketches import KLLSketch, DEFAULT_K
 
 
 def iqr_flags(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
     # compute Q1/Q3/IQR per group and join back
-    stats = df.groupby(group_col)[value_col].quantile([0.25, 0.75]).unstack()
+    stats = df.groupby(group_col, observed=True)[value_col].quantile([0.25, 0.75]).unstack()
     stats.columns = ['Q1', 'Q3']
     stats['IQR'] = stats['Q3'] - stats['Q1']
     outlier = df.join(stats, on = group_col)
@@ -14,26 +15,188 @@ def iqr_flags(df: pd.DataFrame, group_col: str, value_col: str) -> pd.DataFrame:
     return outlier
 
 
-def plot_outlier_box(df_flagged: pd.DataFrame, group_val: str, group_col: str, value_col: str, save_path: Path):
+# ---- Many (group, value) pairs at once ----
+# Every pair's values are tagged with a global group id (pair offset + integer group code),
+# bucketed by one stable sort on those small integer ids (radix sort when they fit in 16
+# bits) and then sorted in place per bucket, so all group quartiles come from a single
+# sorted array.
+# Quartiles use pandas' groupby linear interpolation, so flags match iqr_flags exactly;
+# rows with a missing group or value are never outliers (same as iqr_flags).
+
+def outlier_col(group_col: str, value_col: str) -> str:
+    return f"{value_col}_outlier_by_{group_col}"
+
+
+def group_quartiles(df: pd.DataFrame, pairs) -> dict:
+    # -> {(group_col, value_col): (row group codes, group labels, Q1, Q3)}
+    codes = {g: pd.factorize(df[g])[:2] for g in dict.fromkeys(g for g, _ in pairs)}
+    gids, vals, offsets, offset = [], [], [], 0
+    for g, v in pairs:
+        c = codes[g][0]
+        x = df[v].to_numpy(dtype="float64", na_value=np.nan)
+        ok = (c >= 0) & ~np.isnan(x)
+        gids.append(c[ok] + offset)
+        vals.append(x[ok])
+        offsets.append(offset)
+        offset += len(codes[g][1])
+    gids, vals = np.concatenate(gids), np.concatenate(vals)
+    gid_type = np.uint16 if offset <= np.iinfo(np.uint16).max else np.int64
+    sorted_vals = vals[np.argsort(gids.astype(gid_type), kind="stable")]
+    n = np.bincount(gids, minlength=offset)
+    starts = np.cumsum(n) - n
+    for a, m in zip(starts[n > 1], n[n > 1]):
+        sorted_vals[a:a + m].sort()
+
+    def quantile(q):
+        pos = q * (n - 1)
+        lo = np.floor(pos).astype("int64")
+        frac = pos - lo
+        hi = np.minimum(lo + 1, n - 1)
+        empty = n == 0
+        a = sorted_vals[np.where(empty, 0, starts + lo)] if len(sorted_vals) else np.full(offset, np.nan)
+        b = sorted_vals[np.where(empty, 0, starts + hi)] if len(sorted_vals) else np.full(offset, np.nan)
+        return np.where(empty, np.nan, a + (b - a) * frac)
+
+    q1, q3 = quantile(0.25), quantile(0.75)
+    out = {}
+    for (g, v), off in zip(pairs, offsets):
+        c, labels = codes[g]
+        out[(g, v)] = (c, labels, q1[off:off + len(labels)], q3[off:off + len(labels)])
+    return out
+
+
+def iqr_outliers(df: pd.DataFrame, pairs, k: float = 1.5, sparse: bool = False, quartiles=None):
+    # Flags for every (group_col, value_col) pair without copying or widening `df`.
+    # sparse=False: DataFrame of bool columns (outlier_col names) on df's index.
+    # sparse=True: {(group_col, value_col): index labels of the outlier rows}.
+    # quartiles: precomputed {pair: (group labels, Q1, Q3)}, e.g. sketch_quartiles(); exact
+    # quartiles of `df` itself are used otherwise.
+    pairs = [tuple(p) for p in pairs]
+    if quartiles is None:
+        bounds = {p: (c, q1, q3) for p, (c, _, q1, q3) in group_quartiles(df, pairs).items()}
+    else:
+        bounds = {(g, v): (pd.Index(quartiles[(g, v)][0]).get_indexer(df[g]),) + tuple(quartiles[(g, v)][1:])
+                  for g, v in pairs}
+    flags = {}
+    for (g, v), (c, q1, q3) in bounds.items():
+        iqr = q3 - q1
+        # code -1 (missing/unseen group) picks the trailing NaN, so those rows compare False
+        lower = np.append(q1 - k * iqr, np.nan)[c]
+        upper = np.append(q3 + k * iqr, np.nan)[c]
+        x = df[v].to_numpy(dtype="float64", na_value=np.nan)
+        flags[(g, v)] = (x < lower) | (x > upper)
+    if sparse:
+        return {p: df.index[np.flatnonzero(f)] for p, f in flags.items()}
+    return pd.DataFrame({outlier_col(g, v): f for (g, v), f in flags.items()}, index=df.index)
+
+
+# ---- Streaming (approximate) quartiles ----
+# Pass 1 feeds chunks into one KLL sketch per (pair, group); sketches from separate workers
+# merge. Pass 2 flags each chunk with iqr_outliers(chunk, pairs, quartiles=...).
+# `accuracy` is the KLL k: rank error is roughly 1/k of each group's size.
+
+def build_sketches(chunks, pairs, accuracy: int = DEFAULT_K, sketches=None) -> dict:
+    # -> {(group_col, value_col): {group label: KLLSketch}}
+    pairs = [tuple(p) for p in pairs]
+    sketches = sketches if sketches is not None else {p: {} for p in pairs}
+    for chunk in chunks:
+        for g, v in pairs:
+            groups = sketches[(g, v)]
+            for label, values in chunk.groupby(g, sort=False, observed=True)[v]:
+                if label not in groups:
+                    groups[label] = KLLSketch(accuracy)
+                groups[label].update(values.to_numpy(dtype="float64", na_value=np.nan))
+    return sketches
+
+
+def merge_sketches(*parts) -> dict:
+    # Folds later parts into the first part's sketch objects (inputs are consumed)
+    out = {}
+    for part in parts:
+        for pair, groups in part.items():
+            acc = out.setdefault(pair, {})
+            for label, sk in groups.items():
+                if label in acc:
+                    acc[label].merge(sk)
+                else:
+                    acc[label] = sk
+    return out
+
+
+def sketch_quartiles(sketches: dict) -> dict:
+    # -> {pair: (group labels, Q1, Q3)}, the `quartiles` argument of iqr_outliers
+    out = {}
+    for pair, groups in sketches.items():
+        labels = list(groups)
+        qs = np.array([groups[label].quantile([0.25, 0.75]) for label in labels]).reshape(-1, 2)
+        out[pair] = (labels, qs[:, 0], qs[:, 1])
+    return out
+
+
+# Plots use the object-oriented Figure API (no pyplot state), so they are safe to render
+# from worker processes; PNG output goes through the Agg canvas. matplotlib is imported
+# inside each plot so flagging alone doesn't pay for it.
+
+def plot_outlier_box(df_flagged: pd.DataFrame, group_val: str, group_col: str, value_col: str, save_path: Path,
+                     stats=None):
+    # stats (chunked runs): the box as {q1, med, q3, whislo, whishi}, computed while
+    # streaming; df_flagged then holds only the group's outliers, drawn as its fliers
+    from matplotlib.figure import Figure
     sub = df_flagged[df_flagged[group_col] == group_val]
-    plt.figure(figsize=(8, 4))
-    plt.boxplot(sub[value_col].dropna(), vert=True)
-    plt.title(f"{group_val}: {value_col} with IQR Outliers")
-    plt.ylabel(value_col)
+    fig = Figure(figsize=(8, 4))
+    ax = fig.add_subplot()
+    if stats is None:
+        ax.boxplot(sub[value_col].dropna(), vert=True)
+    else:
+        ax.bxp([dict(stats, fliers=sub[value_col].dropna().to_numpy())])
+    ax.set_title(f"{group_val}: {value_col} with IQR Outliers")
+    ax.set_ylabel(value_col)
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(save_path, bbox_inches='tight')
-    plt.close()
+    fig.savefig(save_path, bbox_inches='tight')
+
+
+def bin_scatter(df: pd.DataFrame, value_x: str, value_y: str, flag_col: str, bins: int = 200):
+    # Large-data input for plot_outliers_scatter: normal points become counts on a bins×bins
+    # grid (one row per non-empty cell, at its center, in a `count` column) and flagged points
+    # stay individual rows. -> (frame, grid extent (x0, x1, y0, y1))
+    flagged = df[flag_col].to_numpy(dtype=bool)
+    x, y = df[value_x].to_numpy(dtype=float)[~flagged], df[value_y].to_numpy(dtype=float)[~flagged]
+    ok = np.isfinite(x) & np.isfinite(y)
+    x, y = x[ok], y[ok]
+    counts, xe, ye = np.histogram2d(x, y, bins=bins, range=[[x.min(), x.max()], [y.min(), y.max()]])
+    return scatter_cells(counts, xe, ye, df.loc[flagged], value_x, value_y, flag_col)
+
+
+def scatter_cells(counts, xe, ye, outl: pd.DataFrame, value_x: str, value_y: str, flag_col: str):
+    # Grid counts (np.histogram2d output) + outlier rows -> bin_scatter's (frame, extent);
+    # chunked runs sum the counts over chunks on a grid fixed beforehand
+    ix, iy = np.nonzero(counts)
+    cells = pd.DataFrame({value_x: (xe[ix] + xe[ix + 1]) / 2, value_y: (ye[iy] + ye[iy + 1]) / 2,
+                          flag_col: False, 'count': counts[ix, iy].astype(np.int64)})
+    outl = outl[[value_x, value_y, flag_col]].assign(count=1)
+    return pd.concat([cells, outl], ignore_index=True), (xe[0], xe[-1], ye[0], ye[-1])
 
 
-def plot_outliers_scatter(df_flagged: pd.DataFrame, value_x: str, value_y: str, flag_col: str, save_path: Path):
-    plt.figure(figsize=(8,5))
+def plot_outliers_scatter(df_flagged: pd.DataFrame, value_x: str, value_y: str, flag_col: str, save_path: Path,
+                          extent=None, bins=None):
+    # With extent/bins the frame comes from bin_scatter: normal points are drawn as a
+    # log-scaled density of the grid counts, outliers as markers
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=(8,5))
+    ax = fig.add_subplot()
     normal = df_flagged[~df_flagged[flag_col]]
     outl = df_flagged[df_flagged[flag_col]]
-    plt.scatter(normal[value_x], normal[value_y], s=10, alpha=0.5, label='Normal')
-    plt.scatter(outl[value_x], outl[value_y], s=20, alpha=0.8, label='Outlier', marker='x')
-    plt.xlabel(value_x); plt.ylabel(value_y)
-    plt.title(f"Outlier Highlight: {value_y} vs {value_x}")
-    plt.legend()
+    if extent is None:
+        ax.scatter(normal[value_x], normal[value_y], s=10, alpha=0.5, label='Normal')
+    else:
+        from matplotlib.colors import LogNorm
+        img = ax.hist2d(normal[value_x], normal[value_y], bins=bins, range=[extent[:2], extent[2:]],
+                        weights=normal['count'], norm=LogNorm(), cmin=1, cmap='Blues',
+                        zorder=2)[3]  # above the markers; empty cells stay transparent
+        fig.colorbar(img, ax=ax, label='Normal points per bin')
+    ax.scatter(outl[value_x], outl[value_y], s=20, alpha=0.8, label='Outlier', marker='x', color='C1')
+    ax.set_xlabel(value_x); ax.set_ylabel(value_y)
+    ax.set_title(f"Outlier Highlight: {value_y} vs {value_x}")
+    ax.legend()
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(save_path, bbox_inches='tight')
-    plt.close()
\ No newline at end of file
+    fig.savefig(save_path, bbox_inches='tight')
@@ -0,0 +1,71 @@
+import numpy as np
+
+# KLL quantile sketch (Karnin, Lang, Liberty 2016), numpy-batched.
+# Level h holds items of weight 2**h; when a level outgrows its capacity it is sorted and
+# every other item (random offset) is promoted, so memory is O(k log(n/k)) and the rank
+# error is roughly O(1/k) of n. Sketches built on different chunks or workers merge
+# level by level. Until the first compaction every value is kept and quantiles are exact.
+
+DEFAULT_K = 200
+_C = 2 / 3  # capacity decay between levels
+
+
+class KLLSketch:
+    def __init__(self, k: int = DEFAULT_K, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h: int) -> int:
+        return max(2, int(np.ceil(self.k * _C ** (len(self.levels) - 1 - h))))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            lvl = self.levels[h]
+            if len(lvl) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                lvl = np.sort(lvl)
+                keep = lvl[len(lvl) - len(lvl) % 2:]  # odd item out stays at this level
+                promoted = lvl[:len(lvl) - len(keep)][self._rng.integers(2)::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def update(self, values):
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        if len(values):
+            self.n += len(values)
+            self.levels[0] = np.concatenate([self.levels[0], values])
+            self._compress()
+        return self
+
+    def merge(self, other: "KLLSketch"):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, lvl in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], lvl])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, qs):
+        qs = np.atleast_1d(np.asarray(qs, dtype="float64"))
+        if self.n == 0:
+            return np.full(len(qs), np.nan)
+        if len(self.levels) == 1:
+            return np.quantile(self.levels[0], qs)  # nothing compacted yet: exact
+        vals = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(lvl), 2.0 ** h) for h, lvl in enumerate(self.levels)])
+        order = np.argsort(vals, kind="stable")
+        vals, weights = vals[order], weights[order]
+        # each item sits at the middle of the rank range it stands for
+        pos = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return np.interp(qs, pos, vals)
+
+    @property
+    def size(self) -> int:
+        return sum(len(lvl) for lvl in self.levels)
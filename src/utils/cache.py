@@ -0,0 +1,208 @@
+import ast
+import hashlib
+import importlib
+import importlib.util
+import inspect
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+import pandas as pd
+
+# Content-addressed cache for ETL stages.
+# A stage key hashes the stage name, its parent's key (so it transitively covers the raw
+# input bytes), its parameters and the source of the modules that implement it. Entries are
+# pickled DataFrames or rendered files; hits refresh mtime so eviction is LRU by mtime. The
+# code hash follows src.* imports, so a stage is invalidated by edits to anything it calls.
+
+_MISSING = object()
+
+
+def file_sha256(path: Path, block=1 << 20) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def files_sha256(paths) -> str:
+    # One file hashes exactly like file_sha256; several hash their names + content hashes
+    paths = list(paths)
+    if len(paths) == 1:
+        return file_sha256(paths[0])
+    h = hashlib.sha256()
+    for p in paths:
+        h.update(f"{Path(p).name}\0{file_sha256(p)}\n".encode())
+    return h.hexdigest()
+
+
+def _is_module(name: str) -> bool:
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:  # parent is a module, not a package
+        return False
+
+
+@lru_cache(maxsize=None)
+def _src_imports(name: str) -> tuple:
+    # Names of the src.* modules module `name` imports anywhere in its source (function-level
+    # imports included); `from pkg import x` counts pkg.x when x is a module, else pkg
+    module = importlib.import_module(name)
+    package = module.__package__ or name
+    out = []
+    for node in ast.walk(ast.parse(inspect.getsource(module))):
+        if isinstance(node, ast.Import):
+            out += [a.name for a in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = importlib.util.resolve_name("." * node.level + (node.module or ""), package) if node.level else node.module
+            if base == "src" or base.startswith("src."):
+                out += [f"{base}.{a.name}" if _is_module(f"{base}.{a.name}") else base for a in node.names]
+    return tuple(dict.fromkeys(m for m in out if m == "src" or m.startswith("src.")))
+
+
+def _src_closure(names) -> list:
+    seen, todo = {}, list(names)
+    while todo:
+        name = todo.pop()
+        if name not in seen:
+            seen[name] = None
+            todo += _src_imports(name)
+    return sorted(seen)
+
+
+def code_hash(*objs) -> str:
+    # Hash the whole defining module of each function (or module) and every src.* module
+    # those import, transitively, so edits to helpers, schema or config count too
+    h = hashlib.sha256()
+    for name in _src_closure(inspect.getmodule(o).__name__ for o in objs):
+        h.update(name.encode() + b"\0" + inspect.getsource(importlib.import_module(name)).encode())
+    return h.hexdigest()
+
+
+class StageCache:
+    def __init__(self, root: Path, max_bytes: int, enabled: bool = True):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.status = {}  # stage -> hit | miss | skip
+        self._manifest_path = self.root / "outputs.json"
+        self._manifest = None
+
+    # ---- keys & entries ----
+    def key(self, name: str, parent: str, params=None, code: str = "") -> str:
+        payload = json.dumps([name, parent, params or {}, code, pd.__version__], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry(self, name: str, key: str, suffix: str) -> Path:
+        return self.root / f"{name}-{key[:32]}{suffix}"
+
+    def load(self, name: str, key: str):
+        p = self._entry(name, key, ".pkl")
+        if not (self.enabled and p.exists()):
+            return None
+        os.utime(p)
+        return pd.read_pickle(p)
+
+    def save(self, name: str, key: str, df: pd.DataFrame):
+        if not self.enabled:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        p = self._entry(name, key, ".pkl")
+        tmp = p.with_suffix(".tmp")
+        df.to_pickle(tmp)
+        tmp.replace(p)
+
+    def stage(self, name: str, parent: str, compute, params=None, code: str = ""):
+        return CachedStage(self, name, self.key(name, parent, params, code), compute)
+
+    # ---- outputs written from a given key (lets unchanged stages skip writes) ----
+    def _outputs(self) -> dict:
+        if self._manifest is None:
+            self._manifest = json.loads(self._manifest_path.read_text()) if self._manifest_path.exists() else {}
+        return self._manifest
+
+    def output_current(self, path: Path, key: str) -> bool:
+        if not (self.enabled and path.exists()):
+            return False
+        rec = self._outputs().get(str(path))
+        st = path.stat()
+        return bool(rec) and rec == {"key": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+    def record_output(self, path: Path, key: str):
+        if not self.enabled:
+            return
+        st = path.stat()
+        self._outputs()[str(path)] = {"key": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._manifest_path.write_text(json.dumps(self._manifest, indent=2))
+
+    def file(self, name: str, key: str, path: Path, render):
+        # Rendered artifacts (plots): reuse the target if current, else copy from cache, else render
+        if self.output_current(path, key):
+            self.status[name] = "skip"
+            return
+        blob = self._entry(name, key, path.suffix)
+        if self.enabled and blob.exists():
+            os.utime(blob)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(blob, path)
+            self.status[name] = "hit"
+        else:
+            render(path)
+            if self.enabled:
+                self.root.mkdir(parents=True, exist_ok=True)
+                shutil.copyfile(path, blob)
+            self.status[name] = "miss"
+        self.record_output(path, key)
+
+    # ---- housekeeping ----
+    def evict(self) -> int:
+        # Drop least recently used entries until the cache fits in max_bytes
+        if not (self.enabled and self.root.exists()):
+            return 0
+        entries = [p for p in self.root.iterdir() if p.is_file() and p != self._manifest_path]
+        entries.sort(key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+        removed = 0
+        for p in entries:
+            if total <= self.max_bytes:
+                break
+            total -= p.stat().st_size
+            p.unlink()
+            removed += 1
+        return removed
+
+    def report(self) -> str:
+        return ", ".join(f"{name}: {s}" for name, s in self.status.items())
+
+
+class CachedStage:
+    # Lazy stage handle: the value is loaded from cache or computed on first access,
+    # so stages whose outputs are current and whose children all hit are never loaded.
+    def __init__(self, cache: StageCache, name: str, key: str, compute):
+        self.cache, self.name, self.key, self._compute = cache, name, key, compute
+        self._value = _MISSING
+        cache.status.setdefault(name, "skip")
+
+    @property
+    def value(self) -> pd.DataFrame:
+        if self._value is _MISSING:
+            df = self.cache.load(self.name, self.key)
+            if df is None:
+                df = self._compute()
+                self.cache.save(self.name, self.key, df)
+                self.cache.status[self.name] = "miss"
+            else:
+                self.cache.status[self.name] = "hit"
+            self._value = df
+        return self._value
+
+    def write(self, path: Path, writer):
+        # writer(df) -> written path; skipped when that path was last written from this key
+        if self.cache.output_current(path, self.key):
+            return path
+        written = writer(self.value)
+        self.cache.record_output(written, self.key)
+        return written
@@ -1,11 +1,63 @@
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+from pandas.tseries.api import guess_datetime_format
+
+# Date columns repeat a few thousand distinct strings over millions of rows, so each
+# distinct string (or category) is parsed once (with the format pandas would infer from the first value)
+# and mapped back through factorize codes. Parsed strings are kept per format across calls,
+# so chunked/incremental runs only parse dates they haven't seen.
+
+PARSE_CACHE_MAX = 500_000  # distinct strings kept per format
+_parsed = {}  # format -> Series(datetime64, index=date string)
+
+
+def parse_dates(s: pd.Series, fmt=None):
+    # -> (datetime Series, number of non-null values coerced to NaT); same result as
+    # pd.to_datetime(s, errors='coerce'), which also infers one format from the first value
+    if is_datetime64_any_dtype(s) or is_numeric_dtype(s):
+        out = pd.to_datetime(s, errors='coerce')
+        return out, int(out.isna().sum() - s.isna().sum())
+    if isinstance(s.dtype, pd.CategoricalDtype):
+        codes, uniques = s.cat.codes.to_numpy(), s.cat.categories  # already factorized
+    else:
+        codes, uniques = pd.factorize(s)
+    valid = codes >= 0
+    if not valid.any():
+        return pd.to_datetime(s.astype(object), errors='coerce'), 0
+    fmt = fmt or guess_datetime_format(str(uniques[codes[valid.argmax()]]))
+    known = _parsed.get(fmt)
+    if known is None or len(known) > PARSE_CACHE_MAX:
+        known = pd.Series(pd.DatetimeIndex([], dtype='datetime64[us]'), index=pd.Index([], dtype=object))
+    pos = known.index.get_indexer(uniques)
+    new = uniques[pos < 0]
+    if len(new):
+        parsed = _parse(new, fmt)
+        if parsed.tz is None:
+            known = pd.concat([known, pd.Series(parsed, index=new)]) if len(known) else pd.Series(parsed, index=new)
+            _parsed[fmt] = known
+            pos = known.index.get_indexer(uniques)
+        else:  # UTC offsets in the strings: parsed per call, not cached
+            known, pos = pd.Series(_parse(uniques, fmt)), np.arange(len(uniques))
+
+    out = pd.Series(known.array.take(pos).take(codes, allow_fill=True), index=s.index, name=s.name)
+    return out, int(out.isna().sum() - (~valid).sum())
+
+
+def _parse(values, fmt):
+    return pd.to_datetime(values, format=fmt, errors='coerce') if fmt else pd.to_datetime(values, errors='coerce')
+
 
 def to_datetime(df, cols):
     for c in cols:
-        df[c] = pd.to_datetime(df[c], errors='coerce')
+        df[c], coerced = parse_dates(df[c])
+        if coerced:
+            print(f"[DATES] {c}: {coerced:,} unparseable values set to NaT")
     return df
 
 
 def add_order_month(df, col="Order Date", new_col='Order Month'):
-    df[new_col] = df[col].dt.to_period('M').dt.to_timestamp()
-    return df
\ No newline at end of file
+    # month truncation on the datetime64 integers (NaT stays NaT)
+    values = df[col].to_numpy()
+    df[new_col] = values.astype('datetime64[M]').astype(values.dtype)
+    return df
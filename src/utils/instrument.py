@@ -0,0 +1,146 @@
+import cProfile
+import json
+import platform
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+import pandas as pd
+
+try:
+    import resource  # Unix only; memory columns are null elsewhere
+except ImportError:
+    resource = None
+
+# Per-stage instrumentation for ETL runs. Each stage records wall/CPU time, how much it
+# raised the process' peak RSS, rows in/out and bytes written; repeated stages (chunks,
+# per-chunk writes) accumulate under one name. The run is saved as JSON, and with
+# profile=True each stage also gets a cProfile dump (nested stages are profiled as part
+# of the outermost one, since only one profiler can be active).
+
+_END = object()
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _size(path) -> int:
+    path = Path(path)
+    return path.stat().st_size if path.exists() else 0
+
+
+class StageStats:
+    # Accumulated numbers for one stage name; the stage body sets rows_out/bytes_written
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.wall_s = self.cpu_s = 0.0
+        self.peak_rss_delta_mb = 0.0 if resource else None
+        self.rows_in = self.rows_out = self.bytes_written = None
+        self._profile = None
+
+    def add(self, field: str, n):
+        if n is not None:
+            setattr(self, field, (getattr(self, field) or 0) + int(n))
+
+    def as_dict(self) -> dict:
+        rows = self.rows_in if self.rows_in is not None else self.rows_out
+        return {
+            "stage": self.name, "calls": self.calls,
+            "wall_s": round(self.wall_s, 4), "cpu_s": round(self.cpu_s, 4),
+            "peak_rss_delta_mb": None if self.peak_rss_delta_mb is None else round(self.peak_rss_delta_mb, 1),
+            "rows_in": self.rows_in, "rows_out": self.rows_out,
+            "rows_per_s": round(rows / self.wall_s) if rows and self.wall_s else None,
+            "bytes_written": self.bytes_written,
+        }
+
+
+class RunReport:
+    def __init__(self, run: str, profile: bool = False, **meta):
+        self.run = run
+        self.meta = meta
+        self.profile = profile
+        self.started = datetime.now(timezone.utc)
+        self.stages = {}  # name -> StageStats, in first-seen order
+        self._t0 = time.perf_counter()
+        self._depth = 0
+
+    @contextmanager
+    def stage(self, name: str, rows_in=None):
+        st = self.stages.setdefault(name, StageStats(name))
+        st.calls += 1
+        st.add("rows_in", rows_in)
+        prof = None
+        if self.profile and self._depth == 0:
+            prof = st._profile = st._profile or cProfile.Profile()
+        rss0 = _peak_rss_mb()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        self._depth += 1
+        if prof:
+            prof.enable()
+        try:
+            yield st
+        finally:
+            if prof:
+                prof.disable()
+            self._depth -= 1
+            st.wall_s += time.perf_counter() - wall0
+            st.cpu_s += time.process_time() - cpu0
+            if rss0 is not None:
+                st.peak_rss_delta_mb += _peak_rss_mb() - rss0
+
+    def timed_iter(self, name: str, items):
+        # Time the producer side of an iterator (chunked reads) as a stage, one call per item
+        items = iter(items)
+        while True:
+            with self.stage(name) as st:
+                item = next(items, _END)
+                if item is not _END:
+                    st.add("rows_out", len(item))
+            if item is _END:
+                return
+            yield item
+
+    def write(self, name: str, df: pd.DataFrame, writer, path=None):
+        # Time writer(df) -> written path (or None). When `path` is given the writer appends
+        # to it and the bytes counted are the file's growth, otherwise the written file's size.
+        before = _size(path) if path else 0
+        with self.stage(f"write:{name}", rows_in=len(df)) as st:
+            written = writer(df)
+            st.add("rows_out", len(df))
+        if written or path:
+            st.add("bytes_written", _size(written or path) - before)
+        return written
+
+    def as_dict(self, **extra) -> dict:
+        return {
+            "run": self.run, **self.meta,
+            "started": self.started.isoformat(timespec="seconds"),
+            "wall_s": round(time.perf_counter() - self._t0, 4),
+            "peak_rss_mb": None if resource is None else round(_peak_rss_mb(), 1),
+            "python": platform.python_version(), "pandas": pd.__version__,
+            "stages": [st.as_dict() for st in self.stages.values()],
+            **extra,
+        }
+
+    def save(self, out_dir: Path, **extra) -> Path:
+        # -> out_dir/<UTC start>-<run>.json; pstats files go in a directory of the same name
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        stem = f"{self.started:%Y%m%dT%H%M%SZ}-{self.run}"
+        path = out_dir / f"{stem}.json"
+        path.write_text(json.dumps(self.as_dict(**extra), indent=2, default=str))
+        profiled = [st for st in self.stages.values() if st._profile is not None]
+        if profiled:
+            (out_dir / stem).mkdir(exist_ok=True)
+            for st in profiled:
+                st._profile.dump_stats(out_dir / stem / f"{st.name.replace(':', '_')}.pstats")
+        return path
+
+    def summary(self, top: int = 3) -> str:
+        slowest = sorted(self.stages.values(), key=lambda st: -st.wall_s)[:top]
+        n = len(self.stages)
+        return f"{n} stage{'s' * (n != 1)}; slowest " + ", ".join(f"{st.name} {st.wall_s:.2f}s" for st in slowest)
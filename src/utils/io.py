@@ -1,15 +1,195 @@
+import os
+import pickle
+from pathlib import Path
 import pandas as pd
 from . import dates
 
+# Curated outputs can be written as CSV (default) or Parquet. Paths in config carry a
+# .csv suffix; the suffix is swapped for the chosen format when writing.
+# Incremental runs store the large tables month-partitioned: a directory named like the
+# table (no suffix) with one file per Order Month, so a run rewrites only the months it touches.
+FORMATS = {'csv': '.csv', 'parquet': '.parquet'}
+PARQUET_COMPRESSION = 'zstd'
+
+
 def read_csv(path, **kwargs):
     return pd.read_csv(path, **kwargs)
 
-def to_csv(df: pd.DataFrame, path, index=False):
+def to_csv(df: pd.DataFrame, path, index=False, append=False):
+    # append=True adds rows under an existing header (used by chunked runs)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_csv(path, index=index, mode='a' if append else 'w', header=not append)
+
+
+def with_format(path, fmt='csv') -> Path:
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt!r}; expected one of {sorted(FORMATS)}")
+    return Path(path).with_suffix(FORMATS[fmt])
+
+
+def partition_dir(path) -> Path:
+    return Path(path).with_suffix('')
+
+
+def partition_path(path, month, fmt='csv') -> Path:
+    # 2016-11.csv; rows without a month go to unknown.csv
+    name = 'unknown' if pd.isna(month) else pd.Timestamp(month).strftime('%Y-%m')
+    return with_format(partition_dir(path) / name, fmt)
+
+
+def partition_files(path) -> list:
+    # Month files in order (temp files from an interrupted write are ignored)
+    d = partition_dir(path)
+    if not d.is_dir():
+        return []
+    return sorted(p for p in d.iterdir() if p.suffix in FORMATS.values())
+
+
+def find_table(path) -> Path:
+    # Resolve a curated table regardless of format or layout; if several exist the newer one wins
+    found = [p for p in (with_format(path, f) for f in FORMATS) if p.exists()]
+    if partition_files(path):
+        found.append(partition_dir(path))
+    if not found:
+        raise FileNotFoundError(f"No curated table found for {Path(path).with_suffix('')}")
+    return max(found, key=lambda p: p.stat().st_mtime)
+
+
+def concat_frames(frames) -> pd.DataFrame:
+    # pd.concat turns categoricals whose categories differ into plain values; re-categorize them
+    df = pd.concat(frames, ignore_index=True)
+    cats = [c for c, t in frames[0].dtypes.items()
+            if isinstance(t, pd.CategoricalDtype) and not isinstance(df[c].dtype, pd.CategoricalDtype)]
+    return df.astype({c: 'category' for c in cats}) if cats else df
+
+
+def read_table(path, columns=None, parse_dates=None, **kwargs) -> pd.DataFrame:
+    # Parquet keeps real dtypes, so parse_dates only applies to CSV. A partition directory
+    # reads as its month files concatenated in month order.
+    path = Path(path)
+    if path.is_dir():
+        return concat_frames([read_table(p, columns, parse_dates, **kwargs) for p in partition_files(path)])
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path, columns=columns, **kwargs)
+    if parse_dates and columns:
+        parse_dates = [c for c in parse_dates if c in columns]
+    return read_csv(path, usecols=columns, parse_dates=parse_dates, **kwargs)
+
+
+def iter_table(path, columns=None, chunksize=100_000, **kwargs):
+    # read_table in chunks of at most `chunksize` rows (Parquet: record batches of the
+    # requested columns only), so a table is scanned without holding it in memory
+    path = Path(path)
+    if path.is_dir():
+        for p in partition_files(path):
+            yield from iter_table(p, columns, chunksize, **kwargs)
+    elif path.suffix == '.parquet':
+        import pyarrow.parquet as pq
+        with pq.ParquetFile(path) as f:
+            for batch in f.iter_batches(batch_size=chunksize, columns=columns):
+                yield batch.to_pandas()
+    else:
+        with read_csv(path, usecols=columns, chunksize=chunksize, **kwargs) as reader:
+            yield from reader
+
+
+def to_parquet(df: pd.DataFrame, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(path, index=False, compression=PARQUET_COMPRESSION)
+
+
+def write_table(df: pd.DataFrame, path, fmt='csv') -> Path:
+    # Written to a temp file and renamed, so readers (and a crashed run) never see a partial table
+    path = with_format(path, fmt)
+    tmp = path.with_name(path.name + '.tmp')
+    if fmt == 'parquet':
+        to_parquet(df, tmp)
+    else:
+        to_csv(df, tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def write_partitions(df: pd.DataFrame, path, months, fmt='csv') -> Path:
+    # Full write of a month-partitioned table; `months` holds each row's Order Month.
+    # Files of months that no longer occur (or in the other format) are removed.
+    written = {write_table(part, partition_path(path, month, fmt), fmt)
+               for month, part in df.groupby(pd.Series(months, index=df.index), dropna=False, sort=True)}
+    for p in partition_files(path):
+        if p not in written:
+            p.unlink()
+    return partition_dir(path)
+
+
+class TableWriter:
+    # Incremental writer for chunked runs: CSV appends rows, Parquet appends row groups
+    def __init__(self, path, fmt='csv'):
+        self.fmt = fmt
+        self.path = with_format(path, fmt)
+        self._pq = None
+        self._schema = None
+        self._first = True
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._pq is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                # categorical indices are sized to the first chunk's categories; widen them
+                # so later chunks with more categories still fit
+                self._schema = pa.schema([f.with_type(pa.dictionary(pa.int32(), f.type.value_type))
+                                          if pa.types.is_dictionary(f.type) else f for f in table.schema],
+                                         metadata=table.schema.metadata)
+                table = table.cast(self._schema)
+                self._pq = pq.ParquetWriter(self.path, self._schema, compression=PARQUET_COMPRESSION)
+            else:
+                # later chunks are cast to the first chunk's schema
+                table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            self._pq.write_table(table)
+        else:
+            to_csv(df, self.path, append=not self._first)
+        self._first = False
+
+    def close(self):
+        if self._pq is not None:
+            self._pq.close()
+            self._pq = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Spill files for chunked runs: frames appended one pickle after another (dtypes kept exactly)
+# and read back in order, files one after another, regrouped into chunks of about `chunksize` rows.
+def spill_rows(df: pd.DataFrame, path):
     path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(path, index=index)
+    with open(path, 'ab') as f:
+        pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def read_spill(paths, chunksize):
+    frames, n = [], 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            while True:
+                try:
+                    frames.append(pickle.load(f))
+                except EOFError:
+                    break
+                n += len(frames[-1])
+                if n >= chunksize:
+                    yield concat_frames(frames)
+                    frames, n = [], 0
+    if frames:
+        yield concat_frames(frames)
 
 # --- Notes: Cloud ingestion shortcuts (see ingest/readers.py for implementations) ---
 # read_s3(bucket, key) -> pd.DataFrame
 # read_azure(container, blob_path) -> pd.DataFrame
 # read_gcs(bucket, blob_path) -> pd.DataFrame
-# read_kaggle(dataset, file_path_within_dataset) -> pd.DataFrame
\ No newline at end of file
+# read_kaggle(dataset, file_path_within_dataset) -> pd.DataFrame
@@ -1,15 +1,19 @@
-import matplotlib.pyplot as plt
 from pathlib import Path
 
-# Simple reusable Matplotlib charts (static exports)
+# Simple reusable Matplotlib charts (static exports).
+# Object-oriented Figure API only, so charts can be rendered in worker processes;
+# matplotlib is imported per chart so loading this module stays cheap.
 
 def bar_sales_by_category(df, save_path: Path):
-    s = df.groupby('Category')['Sales'].sum()
-    plt.figure(figsize=(8,5))
-    s.plot(kind='bar')
-    plt.title('Total Sales by Category')
-    plt.xlabel('Category'); plt.ylabel('Sales ($)')
+    from matplotlib.figure import Figure
+    s = df.groupby('Category', observed=True)['Sales'].sum()
+    fig = Figure(figsize=(8,5))
+    ax = fig.add_subplot()
+    ax.bar(s.index.astype(str), s.values)  # not s.plot(): pandas plotting imports pyplot
+    ax.tick_params(axis='x', labelrotation=90)
+    ax.set_title('Total Sales by Category')
+    ax.set_xlabel('Category'); ax.set_ylabel('Sales ($)')
     for i, v in enumerate(s.values):
-        plt.text(i, v, f"{v:,.0f}", ha='center', va='bottom')
+        ax.text(i, v, f"{v:,.0f}", ha='center', va='bottom')
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    plt.savefig(save_path, bbox_inches='tight'); plt.close()
\ No newline at end of file
+    fig.savefig(save_path, bbox_inches='tight')
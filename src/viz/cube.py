@@ -0,0 +1,81 @@
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from ..model.marts import CATEGORY_SEP, build_cube, build_cube_products, build_cube_orders
+from ..utils.io import find_table, read_table
+
+# Dashboard view of the aggregate cube written by the ETL (mart_cube*). Callbacks filter and
+# group these small tables instead of fact_orders, so their cost depends on the number of
+# dimension combinations, not on the number of order lines.
+
+CUBE_TABLES = {"sales": "mart_cube", "products": "mart_cube_products", "orders": "mart_cube_orders"}
+INDEX_DIMS = {"sales": ("Region", "Category", "Segment"), "products": ("Region", "Category", "Segment"),
+              "orders": ("Region", "Segment", "Categories")}
+
+
+def load_cube(curated_dir: Path) -> dict:
+    curated_dir = Path(curated_dir)
+    try:
+        paths = {k: find_table(curated_dir / name) for k, name in CUBE_TABLES.items()}
+    except FileNotFoundError:
+        # Curated dir from before the cube existed: build it once from the facts
+        fact = read_table(find_table(curated_dir / "fact_orders"), parse_dates=["Order Date", "Order Month"])
+        return {"sales": build_cube(fact), "products": build_cube_products(fact), "orders": build_cube_orders(fact)}
+    return {k: read_table(p, parse_dates=["Order Date", "Order Month"]) for k, p in paths.items()}
+
+
+class FilterIndex:
+    # Built once per table at load time. Rows are sorted by date, so a date range is a
+    # searchsorted slice; each dimension is categorical and a selection compares the int8
+    # codes inside the date slice (as fast as per-value bitmaps, without keeping one per value).
+    # Filter cost therefore follows the size of the date window. Only a date-only filter
+    # returns a zero-copy slice; a dimension filter gathers the matching rows with .iloc,
+    # which copies them (the cube is small, so that copy is cheap next to the groupby that
+    # follows). Frames that are already sorted and categorical (serving snapshots) are used
+    # as is, so the memory-mapped frame itself stays shared.
+    def __init__(self, df: pd.DataFrame, dims, date_col: str = "Order Date"):
+        if not df[date_col].is_monotonic_increasing:
+            df = df.sort_values(date_col, kind="stable")
+        cast = {col: df[col].astype("category") for col in dims if not isinstance(df[col].dtype, pd.CategoricalDtype)}
+        df = df.assign(**cast).reset_index(drop=True)
+        self.frame = df
+        self.date_col = date_col
+        self._dates = df[date_col].to_numpy()
+        self._codes = {col: df[col].cat.codes.to_numpy() for col in dims}
+        self._lookup = {col: {v: i for i, v in enumerate(df[col].cat.categories)} for col in dims}
+
+    def select(self, start_dt, end_dt, filters=None) -> pd.DataFrame:
+        # filters: {column: selected values}; empty/None selections mean "all"
+        start, end = np.array([pd.Timestamp(start_dt), pd.Timestamp(end_dt)], dtype=self._dates.dtype)
+        lo = np.searchsorted(self._dates, start, side="left")
+        hi = np.searchsorted(self._dates, end, side="right")
+        mask = None
+        for col, values in (filters or {}).items():
+            if not values:
+                continue
+            lookup, codes = self._lookup[col], self._codes[col][lo:hi]
+            m = np.zeros(hi - lo, dtype=bool)
+            for v in values:
+                if v in lookup:
+                    m |= codes == lookup[v]
+            mask = m if mask is None else mask & m
+        if mask is None:
+            return self.frame.iloc[lo:hi]
+        return self.frame.iloc[lo + np.flatnonzero(mask)]
+
+
+def index_cube(cube: dict) -> dict:
+    return {k: FilterIndex(df, INDEX_DIMS[k]) for k, df in cube.items()}
+
+
+def count_orders(orders: FilterIndex, start_dt, end_dt, regions, cats, segs) -> int:
+    # Distinct orders in the slice: an order matches a category filter when any of its
+    # categories is selected, which is exactly what nunique over filtered lines counts
+    sets = None
+    if cats:
+        wanted = set(cats)
+        sets = [s for s in orders.frame["Categories"].cat.categories if wanted & set(s.split(CATEGORY_SEP))]
+        if not sets:
+            return 0
+    rows = orders.select(start_dt, end_dt, {"Region": regions, "Segment": segs, "Categories": sets})
+    return int(rows["Orders"].sum())
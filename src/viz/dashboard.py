@@ -6,6 +6,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 from dash.exceptions import PreventUpdate
 from dash import Dash, dcc, html, Input, Output, State
+from ..utils.io import find_table, read_table
+from .cube import CUBE_TABLES, load_cube, index_cube, count_orders
+from .memo import CallbackCache, normalize_filters, register_stats_route
+from .reload import LiveData, curated_signature
+from .downsample import downsample
+from ..config import DASH_CACHE_SIZE, DASH_CACHE_TTL, DASH_FILTER_CACHE_SIZE, DASH_RELOAD_INTERVAL, DASH_TS_MAX_POINTS
 
 # ---------- Theming ----------
 # Global Plotly defaults
@@ -14,15 +20,22 @@ COLORWAY = ["#2F67D8", "#00A38C", "#F39C12", "#8E44AD", "#16A085", "#D35400", "#
 
 
 # ---------- Data Loading ----------
-# Load curated CSVs for the app (lightweight for demo)
-def load_curated(curated_dir: Path):
-    fact = pd.read_csv(curated_dir / 'fact_orders.csv', parse_dates=['Order Date','Ship Date','Order Month'])
-    monthly = pd.read_csv(curated_dir / 'mart_orders_monthly.csv', parse_dates=['Order Month'])
-    return fact, monthly
+# Load curated tables for the app (CSV or Parquet, whichever the ETL wrote last).
+# Callbacks work off the aggregate cube, never the fact rows. With snapshot_dir (multi-worker
+# serving) the tables come from the shared memory-mapped snapshot instead of a private copy.
+def load_curated(curated_dir: Path, snapshot_dir: Path = None):
+    if snapshot_dir is not None:
+        from .snapshot import build_snapshot, load_snapshot
+        build_snapshot(curated_dir, snapshot_dir)
+        tables = load_snapshot(snapshot_dir)
+        return index_cube({k: tables[k] for k in CUBE_TABLES}), tables["monthly"]
+    cube = index_cube(load_cube(curated_dir))
+    monthly = read_table(find_table(curated_dir / 'mart_orders_monthly'), parse_dates=['Order Month'])
+    return cube, monthly
 
 
 # ---------- Helpers ----------
-def apply_filters(df, start, end, regions, cats, segs):
+def apply_filters(index, start, end, regions, cats, segs):
         if start is None or end is None:
             # Inputs not ready yet
             raise PreventUpdate
@@ -39,16 +52,8 @@ def apply_filters(df, start, end, regions, cats, segs):
             # Bad date values, skip update
             raise PreventUpdate
 
-        m = (df['Order Date'] >= start_dt) & (df['Order Date'] <= end_dt)
-        if regions:
-            m &= df['Region'].isin(regions)
-        if cats:
-            m &= df['Category'].isin(cats)
-        if segs:
-            m &= df['Segment'].isin(segs)
-
-        filtered = df.loc[m].copy()
-        return filtered
+        # Date slice + bitmap intersection on the prebuilt index; read-only view, no copy
+        return index.select(start_dt, end_dt, {'Region': regions, 'Category': cats, 'Segment': segs})
 
 
 def _no_dim_filters(regions, cats, segs):
@@ -233,10 +238,17 @@ def compute_period_delta(curr, prev):
 
 
 # ---------- App ----------
-def make_app(curated_dir: Path):
-    fact, monthly = load_curated(curated_dir)
-
+def make_app(curated_dir: Path, snapshot_dir: Path = None):
     app = Dash(__name__, suppress_callback_exceptions=True)
+    # Repeat filter states are served from here; invalidated whenever the data is reloaded
+    app.callback_cache = CallbackCache(DASH_CACHE_SIZE, DASH_CACHE_TTL)
+    register_stats_route(app, app.callback_cache)
+    # Filtered cube slices the chart callbacks share, per filter state
+    app.filter_cache = CallbackCache(DASH_FILTER_CACHE_SIZE, DASH_CACHE_TTL)
+    register_stats_route(app, app.filter_cache, "/_filter-cache-stats")
+    # (cube, monthly), reloaded in the background after each ETL run and swapped atomically
+    app.curated = LiveData(lambda: load_curated(curated_dir, snapshot_dir), lambda: curated_signature(curated_dir),
+                           DASH_RELOAD_INTERVAL, on_swap=lambda: (app.filter_cache.invalidate(), app.callback_cache.invalidate()))
 
     # Theme tokens to reuse colors
     THEME = {
@@ -248,198 +260,203 @@ def make_app(curated_dir: Path):
     }
 
     # ---------- CSS (inline for single-file portability) ----------
-    app.layout = html.Div(
-        [
-            # Google Fonts
-            html.Link(
-                rel="stylesheet",
-                href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap",
-            ),
-
-            # Header
-            html.Div(
-                [
-                    html.Div(
-                        "SuperStore Performance Dashboard",
-                        className="title",
-                        style={"fontWeight": 700, "fontSize": "22px", "color": THEME["text"]},
-                    ),
-                    html.Div(
-                        id="context-subtitle",
-                        className="subtitle",
-                        style={"color": THEME["muted"], "fontSize": "13px"},
-                    ),
-                ],
-                className="header",
-                style={
-                    "display": "flex",
-                    "justifyContent": "space-between",
-                    "alignItems": "baseline",
-                    "padding": "10px 14px",
-                    "background": THEME["bg"],
-                    "borderBottom": "1px solid #e5e7eb",
-                },
-            ),
-
-            # Filters row
-            html.Div(
-                [
-                    html.Div(
-                        [
-                            html.Div("Date Range", className="label",
-                                    style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
-                            dcc.DatePickerRange(
-                                id="date-range",
-                                min_date_allowed=fact["Order Date"].min(),
-                                max_date_allowed=fact["Order Date"].max(),
-                                start_date=fact["Order Date"].min(),
-                                end_date=fact["Order Date"].max(),
-                                display_format="MMM D, YYYY",
-                            ),
-                        ],
-                        className="filter-block",
-                        style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Quick Range", className="label",
-                                    style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
-                            dcc.RadioItems(
-                                id="quick-range",
-                                options=[
-                                    {"label": "7D", "value": "7d"},
-                                    {"label": "30D", "value": "30d"},
-                                    {"label": "QTD", "value": "qtd"},
-                                    {"label": "YTD", "value": "ytd"},
-                                    {"label": "ALL", "value": "all"},
-                                ],
-                                value="all",
-                                inline=True,
-                                className="radio-inline",
-                                labelStyle={"marginRight": "10px", "display": "inline-block"},
-                            ),
-                        ],
-                        className="filter-block",
-                        style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Region", className="label",
-                                    style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
-                            dcc.Dropdown(
-                                id="region-dd",
-                                options=[{"label": r, "value": r} for r in sorted(fact["Region"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                        style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Category", className="label",
-                                    style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
-                            dcc.Dropdown(
-                                id="category-dd",
-                                options=[{"label": c, "value": c} for c in sorted(fact["Category"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                        style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Segment", className="label",
-                                    style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
-                            dcc.Dropdown(
-                                id="segment-dd",
-                                options=[{"label": s, "value": s} for s in sorted(fact["Segment"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                        style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
-                    ),
-                ],
-                className="filters-row",
-                style={
-                    "display": "grid",
-                    "gridTemplateColumns": "1.2fr 1fr 1fr 1fr 1fr",
-                    "gap": "10px",
-                    "padding": "10px 14px",
-                    "background": THEME["bg"],
-                },
-            ),
-
-            # KPI row
-            html.Div(
-                [
-                    kpi_card("Sales", "$0", _id="kpi-sales"),
-                    kpi_card("Profit", "$0", _id="kpi-profit"),
-                    kpi_card("Orders", "0", _id="kpi-orders"),
-                    kpi_card("Margin", "0.0%", _id="kpi-margin"),
-                ],
-                className="kpi-row",
-                style={
-                    "display": "grid",
-                    "gridTemplateColumns": "repeat(4, 1fr)",
-                    "gap": "10px",
-                    "padding": "8px 14px",
-                    "background": THEME["bg"],
-                },
-            ),
-
-            # Charts grid (no scroll; fixed heights)
-            html.Div(
-                [
-                    dcc.Graph(
-                        id="ts-sales-profit",
-                        config={"displaylogo": False},
-                        style={"height": "280px", "gridArea": "ts"},
-                    ),
-                    dcc.Graph(
-                        id="bar-category",
-                        config={"displaylogo": False},
-                        style={"height": "250px", "gridArea": "bar"},
-                    ),
-                    dcc.Graph(
-                        id="heatmap-region-category",
-                        config={"displaylogo": False},
-                        style={"height": "250px", "gridArea": "heat"},
-                    ),
-                    dcc.Graph(
-                        id="top-products",
-                        config={"displaylogo": False},
-                        style={"height": "420px", "gridArea": "top"},
-                    ),
-                ],
-                className="charts-grid",
-                style={
-                    "display": "grid",
-                    "gridTemplateColumns": "2fr 2fr",
-                    "gridTemplateRows": "480px 400px",
-                    "gridTemplateAreas": '"ts top" "bar heat"',
-                    "gap": "10px",
-                    "padding": "10px 14px",
-                    "background": THEME["bg"],
-                    # "height": "calc(100vh - 60px - 110px - 120px)",  # header + filters + kpis
-                    "overflow": "hidden",
-                },
-            ),
-        ],
-        className="app",
-        style={
-            "fontFamily": "Inter, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial",
-            "height": "100vh",
-            "overflow": "hidden",
-            "backgroundColor": THEME["bg"],
-            # body margin reset can't be done here; ensure your page CSS or index sets body { margin: 0 }
-        },
-    )
+    def layout():
+        # Built per page load, so date bounds and dropdown options follow reloaded data
+        sales = app.curated.current[0]["sales"]
+        return html.Div(
+            [
+                # Google Fonts
+                html.Link(
+                    rel="stylesheet",
+                    href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap",
+                ),
+
+                # Header
+                html.Div(
+                    [
+                        html.Div(
+                            "SuperStore Performance Dashboard",
+                            className="title",
+                            style={"fontWeight": 700, "fontSize": "22px", "color": THEME["text"]},
+                        ),
+                        html.Div(
+                            id="context-subtitle",
+                            className="subtitle",
+                            style={"color": THEME["muted"], "fontSize": "13px"},
+                        ),
+                    ],
+                    className="header",
+                    style={
+                        "display": "flex",
+                        "justifyContent": "space-between",
+                        "alignItems": "baseline",
+                        "padding": "10px 14px",
+                        "background": THEME["bg"],
+                        "borderBottom": "1px solid #e5e7eb",
+                    },
+                ),
+
+                # Filters row
+                html.Div(
+                    [
+                        html.Div(
+                            [
+                                html.Div("Date Range", className="label",
+                                        style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
+                                dcc.DatePickerRange(
+                                    id="date-range",
+                                    min_date_allowed=sales.frame["Order Date"].min(),
+                                    max_date_allowed=sales.frame["Order Date"].max(),
+                                    start_date=sales.frame["Order Date"].min(),
+                                    end_date=sales.frame["Order Date"].max(),
+                                    display_format="MMM D, YYYY",
+                                ),
+                            ],
+                            className="filter-block",
+                            style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Quick Range", className="label",
+                                        style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
+                                dcc.RadioItems(
+                                    id="quick-range",
+                                    options=[
+                                        {"label": "7D", "value": "7d"},
+                                        {"label": "30D", "value": "30d"},
+                                        {"label": "QTD", "value": "qtd"},
+                                        {"label": "YTD", "value": "ytd"},
+                                        {"label": "ALL", "value": "all"},
+                                    ],
+                                    value="all",
+                                    inline=True,
+                                    className="radio-inline",
+                                    labelStyle={"marginRight": "10px", "display": "inline-block"},
+                                ),
+                            ],
+                            className="filter-block",
+                            style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Region", className="label",
+                                        style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
+                                dcc.Dropdown(
+                                    id="region-dd",
+                                    options=[{"label": r, "value": r} for r in sorted(sales.frame["Region"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                            style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Category", className="label",
+                                        style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
+                                dcc.Dropdown(
+                                    id="category-dd",
+                                    options=[{"label": c, "value": c} for c in sorted(sales.frame["Category"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                            style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Segment", className="label",
+                                        style={"fontSize": "12px", "color": THEME["muted"], "marginBottom": "6px"}),
+                                dcc.Dropdown(
+                                    id="segment-dd",
+                                    options=[{"label": s, "value": s} for s in sorted(sales.frame["Segment"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                            style={"background": THEME["card"], "padding": "10px", "borderRadius": "10px"},
+                        ),
+                    ],
+                    className="filters-row",
+                    style={
+                        "display": "grid",
+                        "gridTemplateColumns": "1.2fr 1fr 1fr 1fr 1fr",
+                        "gap": "10px",
+                        "padding": "10px 14px",
+                        "background": THEME["bg"],
+                    },
+                ),
+
+                # KPI row
+                html.Div(
+                    [
+                        kpi_card("Sales", "$0", _id="kpi-sales"),
+                        kpi_card("Profit", "$0", _id="kpi-profit"),
+                        kpi_card("Orders", "0", _id="kpi-orders"),
+                        kpi_card("Margin", "0.0%", _id="kpi-margin"),
+                    ],
+                    className="kpi-row",
+                    style={
+                        "display": "grid",
+                        "gridTemplateColumns": "repeat(4, 1fr)",
+                        "gap": "10px",
+                        "padding": "8px 14px",
+                        "background": THEME["bg"],
+                    },
+                ),
+
+                # Charts grid (no scroll; fixed heights)
+                html.Div(
+                    [
+                        dcc.Graph(
+                            id="ts-sales-profit",
+                            config={"displaylogo": False},
+                            style={"height": "280px", "gridArea": "ts"},
+                        ),
+                        dcc.Graph(
+                            id="bar-category",
+                            config={"displaylogo": False},
+                            style={"height": "250px", "gridArea": "bar"},
+                        ),
+                        dcc.Graph(
+                            id="heatmap-region-category",
+                            config={"displaylogo": False},
+                            style={"height": "250px", "gridArea": "heat"},
+                        ),
+                        dcc.Graph(
+                            id="top-products",
+                            config={"displaylogo": False},
+                            style={"height": "420px", "gridArea": "top"},
+                        ),
+                    ],
+                    className="charts-grid",
+                    style={
+                        "display": "grid",
+                        "gridTemplateColumns": "2fr 2fr",
+                        "gridTemplateRows": "480px 400px",
+                        "gridTemplateAreas": '"ts top" "bar heat"',
+                        "gap": "10px",
+                        "padding": "10px 14px",
+                        "background": THEME["bg"],
+                        # "height": "calc(100vh - 60px - 110px - 120px)",  # header + filters + kpis
+                        "overflow": "hidden",
+                    },
+                ),
+            ],
+            className="app",
+            style={
+                "fontFamily": "Inter, system-ui, -apple-system, Segoe UI, Roboto, Helvetica, Arial",
+                "height": "100vh",
+                "overflow": "hidden",
+                "backgroundColor": THEME["bg"],
+                # body margin reset can't be done here; ensure your page CSS or index sets body { margin: 0 }
+            },
+        )
+
+    app.layout = layout
 
     # ---------- Callbacks ----------
 
@@ -477,46 +494,49 @@ def make_app(curated_dir: Path):
         end = min(end, max_dt)
         return start, end
 
-    @app.callback(
-        Output("kpi-sales", "children"),
-        Output("kpi-profit", "children"),
-        Output("kpi-orders", "children"),
-        Output("kpi-margin", "children"),
-        Output("ts-sales-profit", "figure"),
-        Output("bar-category", "figure"),
-        Output("heatmap-region-category", "figure"),
-        Output("top-products", "figure"),
-        Output("context-subtitle", "children"),
+    # One callback per chart: the browser sends them as parallel requests, so each chart
+    # renders as soon as its own result is back and a threaded server works on them at once.
+    # The filter itself runs once per filter state, in filtered().
+    FILTERS = (
         Input("date-range", "start_date"),
         Input("date-range", "end_date"),
         Input("region-dd", "value"),
         Input("category-dd", "value"),
         Input("segment-dd", "value"),
     )
-    def update_all(start, end, regions_v, cats_v, segs_v):
-        # Filter fact
-        f = apply_filters(fact, start, end, regions_v, cats_v, segs_v)
-        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
 
-        # Handle empty frame
+    def filtered(start, end, regions_v, cats_v, segs_v):
+        # Shared by the chart callbacks: computed by the first one to ask for a filter state
+        # (the others wait for it), from one data snapshot even if a reload swaps in another
+        key = normalize_filters(start, end, regions_v, cats_v, segs_v)
+        if key is None:
+            raise PreventUpdate
+
+        def compute():
+            cube, monthly = app.curated.current
+            # Filter the cube (day × region × category × segment)
+            f = apply_filters(cube["sales"], start, end, regions_v, cats_v, segs_v)
+            return {"cube": cube, "monthly": monthly, "f": f,
+                    "start_dt": pd.to_datetime(start), "end_dt": pd.to_datetime(end)}
+        return app.filter_cache.get_or_compute(key, compute)
+
+    @app.callback(
+        Output("kpi-sales", "children"),
+        Output("kpi-profit", "children"),
+        Output("kpi-orders", "children"),
+        Output("kpi-margin", "children"),
+        *FILTERS,
+    )
+    @app.callback_cache.memoize
+    def update_kpis(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        f, monthly, start_dt, end_dt = state["f"], state["monthly"], state["start_dt"], state["end_dt"]
         if f.empty:
-            subtitle = f"{start_dt.date()} → {end_dt.date()} | (No data for current filters)"
-            return (
-                "$0",
-                "$0",
-                "0",
-                "0.0%",
-                empty_fig("Monthly Sales & Profit"),
-                empty_fig("Sales by Category"),
-                empty_fig("Sales Heatmap: Region × Category"),
-                empty_fig("Top 10 Products by Profit"),
-                subtitle,
-            )
+            return "$0", "$0", "0", "0.0%"
 
-        # ---------- KPIs ----------
         total_sales = float(f["Sales"].sum())
         total_profit = float(f["Profit"].sum())
-        orders = int(f["Order ID"].nunique())
+        orders = count_orders(state["cube"]["orders"], start_dt, end_dt, regions_v, cats_v, segs_v)
         margin = (total_profit / total_sales) if total_sales else 0.0
 
         # Period deltas (use monthly mart if no dim filters; compare against previous equal-length window)
@@ -536,7 +556,7 @@ def make_app(curated_dir: Path):
             else:
                 # fallback on filtered data
                 m_curr = f
-                m_prev = fact[(fact["Order Date"] >= prev_start) & (fact["Order Date"] <= prev_end)]
+                m_prev = apply_filters(state["cube"]["sales"], prev_start, prev_end, regions_v, cats_v, segs_v)
                 curr_sales = float(m_curr["Sales"].sum())
                 curr_profit = float(m_curr["Profit"].sum())
                 prev_sales = float(m_prev["Sales"].sum()) or 0.0
@@ -555,18 +575,29 @@ def make_app(curated_dir: Path):
         k2 = f"${total_profit:,.0f}"
         k3 = f"{orders:,d}"
         k4 = f"{margin:.1%}"
+        return k1, k2, k3, k4
+
+    # ---------- Time Series (Area) ----------
+    @app.callback(Output("ts-sales-profit", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_timeseries(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        f, monthly, start_dt, end_dt = state["f"], state["monthly"], state["start_dt"], state["end_dt"]
+        if f.empty:
+            return empty_fig("Monthly Sales & Profit")
 
-        # ---------- Time Series (Area) ----------
+        # figures get at most DASH_TS_MAX_POINTS rows (pts); the peak is found on the full ts
         if _no_dim_filters(regions_v, cats_v, segs_v):
             ts = monthly[
                 (monthly["Order Month"] >= start_dt) & (monthly["Order Month"] <= end_dt)
             ].sort_values("Order Month")
+            pts = downsample(ts, "Order Month", [c for c in ts.columns if "Total" in c], DASH_TS_MAX_POINTS)
             if {"Total_Sales", "Total_Profit"}.issubset(ts.columns):
                 fig_ts = go.Figure()
                 fig_ts.add_trace(
                     go.Scatter(
-                        x=ts["Order Month"],
-                        y=ts["Total_Sales"],
+                        x=pts["Order Month"],
+                        y=pts["Total_Sales"],
                         mode="lines",
                         name="Sales",
                         fill="tozeroy",
@@ -574,8 +605,8 @@ def make_app(curated_dir: Path):
                 )
                 fig_ts.add_trace(
                     go.Scatter(
-                        x=ts["Order Month"],
-                        y=ts["Total_Profit"],
+                        x=pts["Order Month"],
+                        y=pts["Total_Profit"],
                         mode="lines",
                         name="Profit",
                         fill="tozeroy",
@@ -590,7 +621,7 @@ def make_app(curated_dir: Path):
             else:
                 # fallback (columns named differently)
                 fig_ts = px.area(
-                    ts, x="Order Month", y=[c for c in ts.columns if "Total" in c], title="Monthly Sales & Profit"
+                    pts, x="Order Month", y=[c for c in ts.columns if "Total" in c], title="Monthly Sales & Profit"
                 )
         else:
             ts = (
@@ -599,7 +630,8 @@ def make_app(curated_dir: Path):
                 .reset_index()
                 .sort_values("Order Month")
             )
-            fig_ts = px.area(ts, x="Order Month", y=["Sales", "Profit"], title="Monthly Sales & Profit (filtered)")
+            pts = downsample(ts, "Order Month", ["Sales", "Profit"], DASH_TS_MAX_POINTS)
+            fig_ts = px.area(pts, x="Order Month", y=["Sales", "Profit"], title="Monthly Sales & Profit (filtered)")
             fig_ts.update_layout(
                 margin=dict(l=10, r=10, t=40, b=10),
                 legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
@@ -621,10 +653,17 @@ def make_app(curated_dir: Path):
             )
         except Exception:
             pass
+        return fig_ts
 
-        # ---------- Category Contribution (Horizontal Bar) ----------
+    # ---------- Category Contribution (Horizontal Bar) ----------
+    @app.callback(Output("bar-category", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_category_bar(start, end, regions_v, cats_v, segs_v):
+        f = filtered(start, end, regions_v, cats_v, segs_v)["f"]
+        if f.empty:
+            return empty_fig("Sales by Category")
         cat = (
-            f.groupby("Category")
+            f.groupby("Category", observed=True)
             .agg(Sales=("Sales", "sum"))
             .reset_index()
             .sort_values("Sales", ascending=True)
@@ -638,10 +677,17 @@ def make_app(curated_dir: Path):
             colorway=COLORWAY,
         )
         fig_bar.update_traces(texttemplate="%{text:,.0f}", textposition="outside", cliponaxis=False)
+        return fig_bar
 
-        # ---------- Region × Category Heatmap (with labels) ----------
+    # ---------- Region × Category Heatmap (with labels) ----------
+    @app.callback(Output("heatmap-region-category", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_heatmap(start, end, regions_v, cats_v, segs_v):
+        f = filtered(start, end, regions_v, cats_v, segs_v)["f"]
+        if f.empty:
+            return empty_fig("Sales Heatmap: Region × Category")
         heat = (
-            f.pivot_table(values="Sales", index="Region", columns="Category", aggfunc="sum", fill_value=0)
+            f.pivot_table(values="Sales", index="Region", columns="Category", aggfunc="sum", fill_value=0, observed=True)
             .reset_index()
             .melt(id_vars="Region", var_name="Category", value_name="Sales")
         )
@@ -659,10 +705,18 @@ def make_app(curated_dir: Path):
             showscale=True,
         )
         fig_heat.update_layout(margin=dict(l=10, r=10, t=40, b=10))
-
-        # ---------- Top Products (Horizontal Bar) ----------
+        return fig_heat
+
+    # ---------- Top Products (Horizontal Bar) ----------
+    @app.callback(Output("top-products", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_top_products(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        if state["f"].empty:
+            return empty_fig("Top 10 Products by Profit")
         top = (
-            f.groupby("Product Name")
+            apply_filters(state["cube"]["products"], start, end, regions_v, cats_v, segs_v)
+            .groupby("Product Name", observed=True)
             .agg(Profit=("Profit", "sum"))
             .reset_index()
             .sort_values("Profit", ascending=True)
@@ -677,18 +731,24 @@ def make_app(curated_dir: Path):
             showlegend=False,
         )
         fig_top.update_traces(texttemplate="%{text:,.0f}", textposition="outside", cliponaxis=False)
-
-        # ---------- Subtitle Context ----------
+        return fig_top
+
+    # ---------- Subtitle Context ----------
+    @app.callback(Output("context-subtitle", "children"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_subtitle(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        start_dt, end_dt = state["start_dt"], state["end_dt"]
+        if state["f"].empty:
+            return f"{start_dt.date()} → {end_dt.date()} | (No data for current filters)"
         active_filters = []
         if regions_v: active_filters.append(f"Regions: {', '.join(regions_v)}")
         if cats_v:    active_filters.append(f"Categories: {', '.join(cats_v)}")
         if segs_v:    active_filters.append(f"Segments: {', '.join(segs_v)}")
         filters_txt = " | ".join(active_filters) if active_filters else "All Regions • All Categories • All Segments"
-        subtitle = f"{start_dt.date()} → {end_dt.date()}  |  {filters_txt}"
-
-        # Return
-        return k1, k2, k3, k4, fig_ts, fig_bar, fig_heat, fig_top, subtitle
+        return f"{start_dt.date()} → {end_dt.date()}  |  {filters_txt}"
 
+    app.curated.start()
     return app
 
 
@@ -7,25 +7,29 @@ from dash import Dash, dcc, html, Input, Output, State
 from dash.exceptions import PreventUpdate
 import plotly.express as px
 import plotly.graph_objects as go
+from ..utils.io import find_table, read_table
+from .cube import load_cube, index_cube, count_orders
+from .memo import CallbackCache, normalize_filters, register_stats_route
+from .reload import LiveData, curated_signature
+from .downsample import downsample
+from ..config import DASH_CACHE_SIZE, DASH_CACHE_TTL, DASH_FILTER_CACHE_SIZE, DASH_RELOAD_INTERVAL, DASH_TS_MAX_POINTS
 
 # ====== Global Plotly defaults / Theme ======
 px.defaults.template = "plotly_white"
 COLORWAY = ["#2F67D8", "#00A38C", "#F39C12", "#8E44AD", "#16A085", "#D35400", "#2C3E50"]
 
 # ====== Data Loading ======
+# Callbacks work off the aggregate cube, never the fact rows
 def load_curated(curated_dir: Path):
-    fact = pd.read_csv(
-        curated_dir / "fact_orders.csv",
-        parse_dates=["Order Date", "Ship Date", "Order Month"],
-    )
-    monthly = pd.read_csv(
-        curated_dir / "mart_orders_monthly.csv",
+    cube = index_cube(load_cube(curated_dir))
+    monthly = read_table(
+        find_table(curated_dir / "mart_orders_monthly"),
         parse_dates=["Order Month"],
     )
-    return fact, monthly
+    return cube, monthly
 
 # ====== Helpers ======
-def apply_filters(df, start, end, regions, cats, segs):
+def apply_filters(index, start, end, regions, cats, segs):
     if start is None or end is None:
         raise PreventUpdate
 
@@ -39,14 +43,8 @@ def apply_filters(df, start, end, regions, cats, segs):
     except Exception:
         raise PreventUpdate
 
-    mask = (df["Order Date"] >= start_dt) & (df["Order Date"] <= end_dt)
-    if regions:
-        mask &= df["Region"].isin(regions)
-    if cats:
-        mask &= df["Category"].isin(cats)
-    if segs:
-        mask &= df["Segment"].isin(segs)
-    return df.loc[mask].copy()
+    # Date slice + bitmap intersection on the prebuilt index; read-only view, no copy
+    return index.select(start_dt, end_dt, {"Region": regions, "Category": cats, "Segment": segs})
 
 def no_dim_filters(regions, cats, segs):
     return (not regions) and (not cats) and (not segs)
@@ -70,10 +68,10 @@ def compute_delta(curr, prev):
 def quick_insights(df_filtered):
     if df_filtered.empty:
         return "No data for the current filter selection."
-    cat = df_filtered.groupby("Category")["Sales"].sum().sort_values(ascending=False)
+    cat = df_filtered.groupby("Category", observed=True)["Sales"].sum().sort_values(ascending=False)
     top_cat = f"{cat.index[0]} (+{cat.iloc[0]:,.0f})" if len(cat) else "—"
     worst_cat = f"{cat.index[-1]} (+{cat.iloc[-1]:,.0f})" if len(cat) > 1 else "—"
-    reg = df_filtered.groupby("Region")["Sales"].sum().sort_values(ascending=False)
+    reg = df_filtered.groupby("Region", observed=True)["Sales"].sum().sort_values(ascending=False)
     top_reg = f"{reg.index[0]} (+{reg.iloc[0]:,.0f})" if len(reg) else "—"
     sales = df_filtered["Sales"].sum()
     profit = df_filtered["Profit"].sum()
@@ -85,142 +83,155 @@ def quick_insights(df_filtered):
 
 # ====== App ======
 def make_app(curated_dir: Path):
-    fact, monthly = load_curated(curated_dir)
-
     app = Dash(__name__, suppress_callback_exceptions=True)
+    # Repeat filter states are served from here; invalidated whenever the data is reloaded
+    app.callback_cache = CallbackCache(DASH_CACHE_SIZE, DASH_CACHE_TTL)
+    register_stats_route(app, app.callback_cache)
+    # Filtered cube slices the chart callbacks share, per filter state; invalidated with it
+    app.filter_cache = CallbackCache(DASH_FILTER_CACHE_SIZE, DASH_CACHE_TTL)
+    register_stats_route(app, app.filter_cache, "/_filter-cache-stats")
+    # (cube, monthly), reloaded in the background after each ETL run and swapped atomically;
+    # callbacks read app.curated.current, never data captured when the app was built
+    app.curated = LiveData(lambda: load_curated(curated_dir), lambda: curated_signature(curated_dir),
+                           DASH_RELOAD_INTERVAL, on_swap=lambda: (app.filter_cache.invalidate(), app.callback_cache.invalidate()))
+
+    def layout():
+        # Built per page load, so date bounds and dropdown options follow reloaded data
+        sales = app.curated.current[0]["sales"]
+        return html.Div(
+            [
+                # External font (Dash will fetch it)
+                html.Link(
+                    rel="stylesheet",
+                    href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap",
+                ),
+
+                # Header
+                html.Div(
+                    [
+                        html.Div("SuperStore Performance Dashboard", className="title"),
+                        html.Div(id="context-subtitle", className="subtitle"),
+                    ],
+                    className="header",
+                ),
+
+                # Filters
+                html.Div(
+                    [
+                        html.Div(
+                            [
+                                html.Div("Date Range", className="label"),
+                                dcc.DatePickerRange(
+                                    id="date-range",
+                                    min_date_allowed=sales.frame["Order Date"].min(),
+                                    max_date_allowed=sales.frame["Order Date"].max(),
+                                    start_date=sales.frame["Order Date"].min(),
+                                    end_date=sales.frame["Order Date"].max(),
+                                    display_format="MMM D, YYYY",
+                                ),
+                            ],
+                            className="filter-block",
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Quick Range", className="label"),
+                                dcc.RadioItems(
+                                    id="quick-range",
+                                    options=[
+                                        {"label": "7D", "value": "7d"},
+                                        {"label": "30D", "value": "30d"},
+                                        {"label": "QTD", "value": "qtd"},
+                                        {"label": "YTD", "value": "ytd"},
+                                        {"label": "ALL", "value": "all"},
+                                    ],
+                                    value="all",
+                                    inline=True,
+                                    className="radio-inline",
+                                ),
+                            ],
+                            className="filter-block",
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Region", className="label"),
+                                dcc.Dropdown(
+                                    id="region-dd",
+                                    options=[{"label": r, "value": r} for r in sorted(sales.frame["Region"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Category", className="label"),
+                                dcc.Dropdown(
+                                    id="category-dd",
+                                    options=[{"label": c, "value": c} for c in sorted(sales.frame["Category"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                        ),
+                        html.Div(
+                            [
+                                html.Div("Segment", className="label"),
+                                dcc.Dropdown(
+                                    id="segment-dd",
+                                    options=[{"label": s, "value": s} for s in sorted(sales.frame["Segment"].dropna().unique())],
+                                    multi=True,
+                                    placeholder="All",
+                                ),
+                            ],
+                            className="filter-block",
+                        ),
+                    ],
+                    className="filters-row",
+                ),
+
+                # KPI row
+                html.Div(
+                    [
+                        html.Div([html.Span("💰", className="kpi-icon"), html.Span("Sales", className="kpi-title"),
+                                  html.Div("$0", id="kpi-sales", className="kpi-value"),
+                                  html.Div("", className="kpi-delta")], className="kpi-card"),
+                        html.Div([html.Span("📈", className="kpi-icon"), html.Span("Profit", className="kpi-title"),
+                                  html.Div("$0", id="kpi-profit", className="kpi-value"),
+                                  html.Div("", className="kpi-delta")], className="kpi-card"),
+                        html.Div([html.Span("📦", className="kpi-icon"), html.Span("Orders", className="kpi-title"),
+                                  html.Div("0", id="kpi-orders", className="kpi-value"),
+                                  html.Div("", className="kpi-delta")], className="kpi-card"),
+                        html.Div([html.Span("📊", className="kpi-icon"), html.Span("Margin", className="kpi-title"),
+                                  html.Div("0.0%", id="kpi-margin", className="kpi-value"),
+                                  html.Div("", className="kpi-delta")], className="kpi-card"),
+                    ],
+                    className="kpi-row",
+                ),
+
+                # Charts grid (fixed height → one screen, no scroll)
+                html.Div(
+                    [
+                        dcc.Graph(id="ts-sales-profit", config={"displaylogo": False}, className="chart ts",
+                                    style={"height": "280px", "width": "100%"}),
+                        dcc.Graph(id="bar-category", config={"displaylogo": False}, className="chart bar",
+                                    style={"height": "250px", "width": "100%"}),
+                        dcc.Graph(id="heatmap-region-category", config={"displaylogo": False}, className="chart heat",
+                                    style={"height": "250px", "width": "100%"}),
+                        dcc.Graph(id="top-products", config={"displaylogo": False}, className="chart top",
+                                    style={"height": "520px", "width": "100%"}),
+                    ],
+                    className="charts-grid",
+                ),
+
+                # Quick Insights panel
+                html.Div(id="quick-insights", className="insights"),
+            ],
+            className="app",
+        )
 
-    app.layout = html.Div(
-        [
-            # External font (Dash will fetch it)
-            html.Link(
-                rel="stylesheet",
-                href="https://fonts.googleapis.com/css2?family=Inter:wght@400;600;700&display=swap",
-            ),
-
-            # Header
-            html.Div(
-                [
-                    html.Div("SuperStore Performance Dashboard", className="title"),
-                    html.Div(id="context-subtitle", className="subtitle"),
-                ],
-                className="header",
-            ),
-
-            # Filters
-            html.Div(
-                [
-                    html.Div(
-                        [
-                            html.Div("Date Range", className="label"),
-                            dcc.DatePickerRange(
-                                id="date-range",
-                                min_date_allowed=fact["Order Date"].min(),
-                                max_date_allowed=fact["Order Date"].max(),
-                                start_date=fact["Order Date"].min(),
-                                end_date=fact["Order Date"].max(),
-                                display_format="MMM D, YYYY",
-                            ),
-                        ],
-                        className="filter-block",
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Quick Range", className="label"),
-                            dcc.RadioItems(
-                                id="quick-range",
-                                options=[
-                                    {"label": "7D", "value": "7d"},
-                                    {"label": "30D", "value": "30d"},
-                                    {"label": "QTD", "value": "qtd"},
-                                    {"label": "YTD", "value": "ytd"},
-                                    {"label": "ALL", "value": "all"},
-                                ],
-                                value="all",
-                                inline=True,
-                                className="radio-inline",
-                            ),
-                        ],
-                        className="filter-block",
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Region", className="label"),
-                            dcc.Dropdown(
-                                id="region-dd",
-                                options=[{"label": r, "value": r} for r in sorted(fact["Region"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Category", className="label"),
-                            dcc.Dropdown(
-                                id="category-dd",
-                                options=[{"label": c, "value": c} for c in sorted(fact["Category"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                    ),
-                    html.Div(
-                        [
-                            html.Div("Segment", className="label"),
-                            dcc.Dropdown(
-                                id="segment-dd",
-                                options=[{"label": s, "value": s} for s in sorted(fact["Segment"].dropna().unique())],
-                                multi=True,
-                                placeholder="All",
-                            ),
-                        ],
-                        className="filter-block",
-                    ),
-                ],
-                className="filters-row",
-            ),
-
-            # KPI row
-            html.Div(
-                [
-                    html.Div([html.Span("💰", className="kpi-icon"), html.Span("Sales", className="kpi-title"),
-                              html.Div("$0", id="kpi-sales", className="kpi-value"),
-                              html.Div("", className="kpi-delta")], className="kpi-card"),
-                    html.Div([html.Span("📈", className="kpi-icon"), html.Span("Profit", className="kpi-title"),
-                              html.Div("$0", id="kpi-profit", className="kpi-value"),
-                              html.Div("", className="kpi-delta")], className="kpi-card"),
-                    html.Div([html.Span("📦", className="kpi-icon"), html.Span("Orders", className="kpi-title"),
-                              html.Div("0", id="kpi-orders", className="kpi-value"),
-                              html.Div("", className="kpi-delta")], className="kpi-card"),
-                    html.Div([html.Span("📊", className="kpi-icon"), html.Span("Margin", className="kpi-title"),
-                              html.Div("0.0%", id="kpi-margin", className="kpi-value"),
-                              html.Div("", className="kpi-delta")], className="kpi-card"),
-                ],
-                className="kpi-row",
-            ),
-
-            # Charts grid (fixed height → one screen, no scroll)
-            html.Div(
-                [
-                    dcc.Graph(id="ts-sales-profit", config={"displaylogo": False}, className="chart ts",
-                                style={"height": "280px", "width": "100%"}),
-                    dcc.Graph(id="bar-category", config={"displaylogo": False}, className="chart bar",
-                                style={"height": "250px", "width": "100%"}),
-                    dcc.Graph(id="heatmap-region-category", config={"displaylogo": False}, className="chart heat",
-                                style={"height": "250px", "width": "100%"}),
-                    dcc.Graph(id="top-products", config={"displaylogo": False}, className="chart top",
-                                style={"height": "520px", "width": "100%"}),
-                ],
-                className="charts-grid",
-            ),
-
-            # Quick Insights panel
-            html.Div(id="quick-insights", className="insights"),
-        ],
-        className="app",
-    )
+    app.layout = layout
 
     # ====== Callbacks ======
 
@@ -255,46 +266,48 @@ def make_app(curated_dir: Path):
         end = min(end, max_dt)
         return start, end
 
-    @app.callback(
-        Output("kpi-sales", "children"),
-        Output("kpi-profit", "children"),
-        Output("kpi-orders", "children"),
-        Output("kpi-margin", "children"),
-        Output("ts-sales-profit", "figure", allow_duplicate=True),
-        Output("bar-category", "figure"),
-        Output("heatmap-region-category", "figure"),
-        Output("top-products", "figure"),
-        Output("context-subtitle", "children"),
-        Output("quick-insights", "children"),
+    # One callback per chart, sent by the browser as parallel requests; the filter runs once
+    # per filter state in filtered() and the chart callbacks share its result
+    FILTERS = (
         Input("date-range", "start_date"),
         Input("date-range", "end_date"),
         Input("region-dd", "value"),
         Input("category-dd", "value"),
         Input("segment-dd", "value"),
-        prevent_initial_call='initial_duplicate'
     )
-    def update_all(start, end, regions_v, cats_v, segs_v):
-        # 1) Filter
-        f = apply_filters(fact, start, end, regions_v, cats_v, segs_v)
-        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
 
-        # Empty state
+    def filtered(start, end, regions_v, cats_v, segs_v):
+        # -> the filtered slice plus the data snapshot it came from, so every callback of a
+        # filter state works on one version even if a reload swaps in another meanwhile
+        key = normalize_filters(start, end, regions_v, cats_v, segs_v)
+        if key is None:
+            raise PreventUpdate
+
+        def compute():
+            cube, monthly = app.curated.current
+            # Filter the cube (day × region × category × segment)
+            return {"cube": cube, "monthly": monthly, "f": apply_filters(cube["sales"], start, end, regions_v, cats_v, segs_v)}
+        return app.filter_cache.get_or_compute(key, compute)
+
+    # 1) KPIs
+    @app.callback(
+        Output("kpi-sales", "children"),
+        Output("kpi-profit", "children"),
+        Output("kpi-orders", "children"),
+        Output("kpi-margin", "children"),
+        *FILTERS,
+    )
+    @app.callback_cache.memoize
+    def update_kpis(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        f, monthly = state["f"], state["monthly"]
+        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
         if f.empty:
-            subtitle = f"{start_dt.date()} → {end_dt.date()} | No data for current filters"
-            return (
-                "$0", "$0", "0", "0.0%",
-                empty_fig("Monthly Sales & Profit"),
-                empty_fig("Sales by Category"),
-                empty_fig("Sales Heatmap: Region × Category"),
-                empty_fig("Top 10 Products by Profit"),
-                subtitle,
-                "No data for the current filter selection."
-            )
-
-        # 2) KPIs
+            return "$0", "$0", "0", "0.0%"
+
         total_sales  = float(f["Sales"].sum())
         total_profit = float(f["Profit"].sum())
-        orders       = int(f["Order ID"].nunique())
+        orders       = count_orders(state["cube"]["orders"], start_dt, end_dt, regions_v, cats_v, segs_v)
         margin       = (total_profit / total_sales) if total_sales else 0.0
 
         # Deltas (previous equal-length window)
@@ -313,7 +326,7 @@ def make_app(curated_dir: Path):
                 prev_profit = float(m_prev.get("Total_Profit", pd.Series()).sum()) or 0.0
             else:
                 m_curr = f
-                m_prev = fact[(fact["Order Date"] >= prev_start) & (fact["Order Date"] <= prev_end)]
+                m_prev = apply_filters(state["cube"]["sales"], prev_start, prev_end, regions_v, cats_v, segs_v)
                 curr_sales = float(m_curr["Sales"].sum())
                 curr_profit = float(m_curr["Profit"].sum())
                 prev_sales = float(m_prev["Sales"].sum()) or 0.0
@@ -332,28 +345,44 @@ def make_app(curated_dir: Path):
         k2 = f"${total_profit:,.0f}"
         k3 = f"{orders:,d}"
         k4 = f"{margin:.1%}"
+        return k1, k2, k3, k4
+
+    # 2) Time series (Area). Use monthly mart if no dim filters
+    @app.callback(
+        Output("ts-sales-profit", "figure", allow_duplicate=True),
+        *FILTERS,
+        prevent_initial_call='initial_duplicate'
+    )
+    @app.callback_cache.memoize
+    def update_monthly_ts(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        f, monthly = state["f"], state["monthly"]
+        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
+        if f.empty:
+            return empty_fig("Monthly Sales & Profit")
 
-        # 3) Time series (Area). Use monthly mart if no dim filters
         if no_dim_filters(regions_v, cats_v, segs_v):
             ts = monthly[(monthly["Order Month"] >= start_dt) & (monthly["Order Month"] <= end_dt)].sort_values("Order Month")
+            pts = downsample(ts, "Order Month", [c for c in ts.columns if "Total" in c], DASH_TS_MAX_POINTS)
             fig_ts = go.Figure()
             if {"Total_Sales", "Total_Profit"}.issubset(ts.columns):
-                fig_ts.add_trace(go.Scatter(x=ts["Order Month"], y=ts["Total_Sales"], mode="lines", name="Sales", fill="tozeroy"))
-                fig_ts.add_trace(go.Scatter(x=ts["Order Month"], y=ts["Total_Profit"], mode="lines", name="Profit", fill="tozeroy"))
+                fig_ts.add_trace(go.Scatter(x=pts["Order Month"], y=pts["Total_Sales"], mode="lines", name="Sales", fill="tozeroy"))
+                fig_ts.add_trace(go.Scatter(x=pts["Order Month"], y=pts["Total_Profit"], mode="lines", name="Profit", fill="tozeroy"))
                 fig_ts.update_layout(title="Monthly Sales & Profit (pre-aggregated)",
                                      margin=dict(l=10,r=10,t=40,b=10),
                                      legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
                                      colorway=COLORWAY)
             else:
-                fig_ts = px.area(ts, x="Order Month", y=[c for c in ts.columns if "Total" in c], title="Monthly Sales & Profit")
+                fig_ts = px.area(pts, x="Order Month", y=[c for c in ts.columns if "Total" in c], title="Monthly Sales & Profit")
         else:
             ts = (f.groupby("Order Month").agg(Sales=("Sales","sum"), Profit=("Profit","sum")).reset_index().sort_values("Order Month"))
-            fig_ts = px.area(ts, x="Order Month", y=["Sales","Profit"], title="Monthly Sales & Profit (filtered)")
+            pts = downsample(ts, "Order Month", ["Sales", "Profit"], DASH_TS_MAX_POINTS)
+            fig_ts = px.area(pts, x="Order Month", y=["Sales","Profit"], title="Monthly Sales & Profit (filtered)")
             fig_ts.update_layout(margin=dict(l=10,r=10,t=40,b=10),
                                  legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
                                  colorway=COLORWAY)
 
-        # Peak annotation
+        # Peak annotation (on the full series)
         try:
             col = "Sales" if "Sales" in ts.columns else "Total_Sales"
             peak_idx = ts[col].idxmax()
@@ -362,42 +391,79 @@ def make_app(curated_dir: Path):
                                   showarrow=True, arrowhead=1, yshift=18)
         except Exception:
             pass
+        return fig_ts
 
-        # 4) Category bars (horizontal, labeled)
-        cat = f.groupby("Category").agg(Sales=("Sales","sum")).reset_index().sort_values("Sales", ascending=True)
+    # 3) Category bars (horizontal, labeled)
+    @app.callback(Output("bar-category", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_category_bar(start, end, regions_v, cats_v, segs_v):
+        f = filtered(start, end, regions_v, cats_v, segs_v)["f"]
+        if f.empty:
+            return empty_fig("Sales by Category")
+        cat = f.groupby("Category", observed=True).agg(Sales=("Sales","sum")).reset_index().sort_values("Sales", ascending=True)
         fig_bar = px.bar(cat, x="Sales", y="Category", orientation="h",
                          title="Sales by Category", text="Sales", color="Category")
         fig_bar.update_layout(margin=dict(l=10,r=10,t=40,b=10), showlegend=False, colorway=COLORWAY)
         fig_bar.update_traces(texttemplate="%{text:,.0f}", textposition="outside", cliponaxis=False)
+        return fig_bar
 
-        # 5) Region × Category heatmap (with labels)
-        heat = (f.pivot_table(values="Sales", index="Region", columns="Category", aggfunc="sum", fill_value=0)
+    # 4) Region × Category heatmap (with labels)
+    @app.callback(Output("heatmap-region-category", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_heatmap(start, end, regions_v, cats_v, segs_v):
+        f = filtered(start, end, regions_v, cats_v, segs_v)["f"]
+        if f.empty:
+            return empty_fig("Sales Heatmap: Region × Category")
+        heat = (f.pivot_table(values="Sales", index="Region", columns="Category", aggfunc="sum", fill_value=0, observed=True)
                   .reset_index().melt(id_vars="Region", var_name="Category", value_name="Sales"))
         fig_heat = px.density_heatmap(heat, x="Category", y="Region", z="Sales",
                                       color_continuous_scale="Blues",
                                       title="Sales Heatmap: Region × Category")
         fig_heat.update_traces(hovertemplate="Region=%{y}<br>Category=%{x}<br>Sales=%{z:,.0f}<extra></extra>", showscale=True)
         fig_heat.update_layout(margin=dict(l=10,r=10,t=40,b=10))
-
-        # 6) Top products (horizontal bar)
-        top = (f.groupby("Product Name").agg(Profit=("Profit","sum")).reset_index()
+        return fig_heat
+
+    # 5) Top products (horizontal bar)
+    @app.callback(Output("top-products", "figure"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_top_products(start, end, regions_v, cats_v, segs_v):
+        state = filtered(start, end, regions_v, cats_v, segs_v)
+        if state["f"].empty:
+            return empty_fig("Top 10 Products by Profit")
+        top = (apply_filters(state["cube"]["products"], start, end, regions_v, cats_v, segs_v)
+                 .groupby("Product Name", observed=True).agg(Profit=("Profit","sum")).reset_index()
                  .sort_values("Profit", ascending=True).tail(10))
         fig_top = px.bar(top, x="Profit", y="Product Name", orientation="h",
                          title="Top 10 Products by Profit", text="Profit", color="Profit")
         fig_top.update_layout(margin=dict(l=10,r=10,t=40,b=10), coloraxis_showscale=False, showlegend=False)
         fig_top.update_traces(texttemplate="%{text:,.0f}", textposition="outside", cliponaxis=False)
+        return fig_top
 
-        # 7) Subtitle & Quick Insights
+    # 6) Subtitle & Quick Insights
+    @app.callback(Output("context-subtitle", "children"), Output("quick-insights", "children"), *FILTERS)
+    @app.callback_cache.memoize
+    def update_context(start, end, regions_v, cats_v, segs_v):
+        f = filtered(start, end, regions_v, cats_v, segs_v)["f"]
+        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
+        if f.empty:
+            return (f"{start_dt.date()} → {end_dt.date()} | No data for current filters",
+                    "No data for the current filter selection.")
         active = []
         if regions_v: active.append(f"Regions: {', '.join(regions_v)}")
         if cats_v:    active.append(f"Categories: {', '.join(cats_v)}")
         if segs_v:    active.append(f"Segments: {', '.join(segs_v)}")
         filters_txt = " | ".join(active) if active else "All Regions • All Categories • All Segments"
-        subtitle = f"{pd.to_datetime(start).date()} → {pd.to_datetime(end).date()}  |  {filters_txt}"
-        insights = quick_insights(f)
+        subtitle = f"{start_dt.date()} → {end_dt.date()}  |  {filters_txt}"
+        return subtitle, quick_insights(f)
+
+    def daily_totals():
+        # Daily totals from the cube (the monthly mart has no Order Date): grouped once per
+        # data version, not on every call; the cache is invalidated when the data is reloaded
+        def compute():
+            sales = app.curated.current[0]["sales"]
+            return sales.frame.groupby("Order Date")[["Sales", "Profit"]].sum().reset_index()
+        return app.callback_cache.get_or_compute(("daily_totals",), compute)
 
-        return k1, k2, k3, k4, fig_ts, fig_bar, fig_heat, fig_top, subtitle, insights
-    
     @app.callback(
         Output("ts-sales-profit", "figure", allow_duplicate=True),
         Input("date-range", "start_date"),
@@ -406,8 +472,7 @@ def make_app(curated_dir: Path):
         prevent_initial_call='initial_duplicate',
     )
     def update_timeseries(start_date, end_date, quick_range):
-        df = monthly.copy()
-        print(df.head())
+        df = daily_totals()
         # --- Quick range override ---
         if quick_range == "7D":
             end_date = df["Order Date"].max()
@@ -419,7 +484,7 @@ def make_app(curated_dir: Path):
         # --- Filter data ---
         mask = (df["Order Date"] >= pd.to_datetime(start_date)) & \
             (df["Order Date"] <= pd.to_datetime(end_date))
-        filtered = df.loc[mask]
+        filtered = downsample(df.loc[mask], "Order Date", ["Sales", "Profit"], DASH_TS_MAX_POINTS)
 
         fig = px.line(
             filtered,
@@ -430,6 +495,7 @@ def make_app(curated_dir: Path):
         fig.update_layout(margin=dict(l=40, r=20, t=40, b=40))
         return fig
 
+    app.curated.start()
     return app
 
 if __name__ == "__main__":
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+# Shape-preserving downsampling for dashboard time series, so figure JSON stays bounded
+# however long the series is. LTTB (Largest-Triangle-Three-Buckets, Steinarsson 2013) keeps
+# the first and last point and, per bucket, the point forming the largest triangle with
+# the previously kept point and the mean of the next bucket, so peaks and dips survive.
+
+
+def lttb(x, y, n: int) -> np.ndarray:
+    # -> sorted positions of the n points kept (all of them when n >= len(x) or n < 3)
+    size = len(x)
+    if n >= size or n < 3:
+        return np.arange(size)
+    x, y = np.asarray(x, dtype=float), np.asarray(y, dtype=float)
+    edges = np.linspace(1, size - 1, n - 1).astype(np.int64)  # n-2 buckets between first and last
+    out = np.empty(n, dtype=np.int64)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2] if i + 2 < len(edges) else size)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+def downsample(df: pd.DataFrame, x: str, ys, max_points: int) -> pd.DataFrame:
+    # Rows of df (sorted by x) kept by LTTB on each y column, at most max_points in total
+    if max_points is None or len(df) <= max_points or not ys:
+        return df
+    xv = df[x].to_numpy()
+    if np.issubdtype(xv.dtype, np.datetime64):
+        xv = xv.astype("datetime64[ns]").astype(np.int64)
+    keep = np.unique(np.concatenate([lttb(xv, df[y].to_numpy(), max_points // len(ys)) for y in ys]))
+    return df.iloc[keep]
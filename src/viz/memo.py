@@ -0,0 +1,126 @@
+import functools
+import threading
+import time
+from collections import OrderedDict
+import pandas as pd
+import plotly.graph_objects as go
+
+# Bounded LRU/TTL memo for dashboard callbacks. Results are keyed on the callback and the
+# normalized filter state (parsed dates, sorted dimension lists), so "West, East" and
+# "East, West" or two spellings of the same date share an entry. Figures are stored as
+# plotly JSON dicts, which Dash serializes without rebuilding the figure objects. The same
+# class holds the filtered state the per-chart callbacks share (get_or_compute).
+
+
+def normalize_filters(start, end, *dims):
+    # -> hashable key, or None when the inputs can't be parsed (callback handles those)
+    if start is None or end is None:
+        return None
+    try:
+        start_dt, end_dt = pd.to_datetime(start), pd.to_datetime(end)
+    except Exception:
+        return None
+    return (start_dt.isoformat(), end_dt.isoformat()) + tuple(tuple(sorted(d or ())) for d in dims)
+
+
+def _to_json(out):
+    if isinstance(out, go.Figure):
+        return out.to_plotly_json()
+    if isinstance(out, tuple):
+        return tuple(_to_json(o) for o in out)
+    return out
+
+
+class CallbackCache:
+    def __init__(self, maxsize: int = 128, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl  # seconds; None = entries only leave by LRU or invalidate()
+        self.hits = self.misses = self.invalidations = 0
+        self._data = OrderedDict()  # key -> (stored_at, value)
+        self._lock = threading.Lock()
+        self._inflight = {}  # key -> lock held while one caller computes it
+
+    def _lookup(self, key):
+        # caller holds self._lock
+        entry = self._data.get(key)
+        if entry is not None and (self.ttl is None or time.monotonic() - entry[0] <= self.ttl):
+            self._data.move_to_end(key)
+            return entry[1]
+        if entry is not None:
+            del self._data[key]
+        return None
+
+    def get(self, key):
+        with self._lock:
+            out = self._lookup(key)
+            if out is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return out
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic(), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def invalidate(self):
+        # Call whenever the curated data behind the callbacks is reloaded
+        with self._lock:
+            self._data.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data), "maxsize": self.maxsize, "ttl": self.ttl,
+                "hits": self.hits, "misses": self.misses, "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def get_or_compute(self, key, compute):
+        # Concurrent misses on one key (the chart callbacks of one filter change arrive
+        # together) wait for a single compute() instead of each repeating it. Misses count
+        # computations; callers that waited for one count as hits.
+        with self._lock:
+            out = self._lookup(key)
+            if out is not None:
+                self.hits += 1
+                return out
+            flight = self._inflight.setdefault(key, threading.Lock())
+        try:
+            with flight:
+                with self._lock:
+                    out = self._lookup(key)  # stored by the caller we waited for
+                    if out is None:
+                        self.misses += 1
+                    else:
+                        self.hits += 1
+                if out is None:
+                    generation = self.invalidations
+                    out = compute()
+                    if generation == self.invalidations:  # not computed from data swapped out meanwhile
+                        self.put(key, out)
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+        return out
+
+    def memoize(self, fn):
+        # For callbacks shaped fn(start, end, *dimension_lists); one cache serves several callbacks
+        @functools.wraps(fn)
+        def wrapper(*args):
+            key = normalize_filters(*args)
+            if key is None:
+                return fn(*args)
+            return self.get_or_compute((fn.__name__, key), lambda: _to_json(fn(*args)))
+        return wrapper
+
+
+def register_stats_route(app, cache: CallbackCache, path: str = "/_cache-stats"):
+    # Hit-rate counters as JSON on the app's Flask server
+    app.server.add_url_rule(path, path.strip("/_").replace("-", "_"), lambda: cache.stats())
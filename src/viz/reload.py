@@ -0,0 +1,67 @@
+import json
+import threading
+import time
+from pathlib import Path
+from ..config import CURATED_MANIFEST
+from .snapshot import curated_fingerprint
+
+# Hot reload for the running dashboard. A background thread polls the curated directory's
+# signature: the manifest every finished ETL run publishes (_manifest.json, written after all
+# its tables), or for directories without one the curated files' sizes/mtimes, which must
+# stay unchanged for two polls so a half-written run isn't picked up. On a change the new
+# data is loaded and indexed on that thread, then swapped in with one reference assignment:
+# callbacks read `current` once and finish on the data they started with.
+
+
+def curated_signature(curated_dir: Path):
+    manifest = Path(curated_dir) / CURATED_MANIFEST.name
+    if manifest.exists():
+        return ("manifest", manifest.read_text())
+    return ("files", json.dumps(curated_fingerprint(Path(curated_dir)), sort_keys=True))
+
+
+class LiveData:
+    def __init__(self, load, signature, interval=None, on_swap=None):
+        # load() -> the data callbacks use; signature() -> (kind, value), changing with the data.
+        # A "manifest" signature marks a finished run and is trusted at once.
+        self._load, self._signature, self.interval, self._on_swap = load, signature, interval, on_swap
+        self._sig = signature()
+        self.current = load()
+        self.version = 1
+        self._pending = None  # unconfirmed file signature (directories without a manifest)
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def check(self) -> bool:
+        # Reload if the signature changed; -> True when new data was swapped in
+        with self._lock:
+            sig = self._signature()
+            if sig == self._sig:
+                self._pending = None
+                return False
+            if sig[0] != "manifest" and sig != self._pending:
+                self._pending = sig  # wait one more poll for the files to settle
+                return False
+            self._sig, self._pending = sig, None  # a failed load isn't retried until the next change
+            t = time.perf_counter()
+            data = self._load()
+            self.current = data
+            self.version += 1
+        if self._on_swap:
+            self._on_swap()
+        print(f"[RELOAD] Curated data v{self.version} loaded in {time.perf_counter() - t:.2f}s")
+        return True
+
+    def _watch(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.check()
+            except Exception as e:  # keep serving the data already loaded
+                print(f"[RELOAD] Failed, keeping v{self.version}: {e!r}")
+
+    def start(self):
+        if self.interval and self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="curated-reload", daemon=True)
+            self._thread.start()
+        return self
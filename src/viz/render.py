@@ -0,0 +1,75 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, NamedTuple
+import pandas as pd
+from ..utils.cache import code_hash
+
+# Batch PNG rendering. Each job is a plot function, the data slice it draws and its
+# arguments; the job key hashes all three (plus the function's source), and a job whose
+# key matches the manifest entry of an untouched output file is skipped. The rest render
+# in a process pool; plot functions use the Figure API, so output goes through Agg.
+
+MANIFEST = ".render_manifest.json"
+
+
+class PlotJob(NamedTuple):
+    path: Path
+    func: Callable  # func(data, save_path=..., **kwargs); must be module-level (picklable)
+    data: pd.DataFrame
+    kwargs: dict
+
+
+def job_key(job: PlotJob) -> str:
+    h = hashlib.sha256()
+    h.update(json.dumps([list(map(str, job.data.columns)), job.kwargs], sort_keys=True, default=str).encode())
+    h.update(pd.util.hash_pandas_object(job.data, index=False).to_numpy().tobytes())
+    h.update(code_hash(job.func).encode())
+    return h.hexdigest()
+
+
+def _render(job: PlotJob) -> str:
+    job.func(job.data, save_path=job.path, **job.kwargs)
+    return str(job.path)
+
+
+def _signature(path: Path, key: str) -> dict:
+    st = path.stat()
+    return {"key": key, "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def outputs_current(manifest_dir: Path) -> bool:
+    # Every file the manifest lists is still the one it rendered (nobody touched the outputs)
+    manifest_path = Path(manifest_dir) / MANIFEST
+    if not manifest_path.exists():
+        return False
+    manifest = json.loads(manifest_path.read_text())
+    return all(Path(p).exists() and _signature(Path(p), rec["key"]) == rec for p, rec in manifest.items())
+
+
+def render_batch(jobs, manifest_dir: Path, workers=None) -> dict:
+    # -> {"rendered": n, "skipped": n}
+    manifest_path = Path(manifest_dir) / MANIFEST
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+    todo, keys = [], {}
+    for job in jobs:
+        key = keys[str(job.path)] = job_key(job)
+        if not (job.path.exists() and manifest.get(str(job.path)) == _signature(job.path, key)):
+            todo.append(job)
+
+    workers = min(workers or os.cpu_count() or 1, len(todo))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(_render, todo))
+    else:
+        for job in todo:
+            _render(job)
+
+    for job in todo:
+        manifest[str(job.path)] = _signature(job.path, keys[str(job.path)])
+    if todo:
+        manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+    return {"rendered": len(todo), "skipped": len(keys) - len(todo)}
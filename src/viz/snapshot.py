@@ -0,0 +1,77 @@
+import json
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from ..utils.io import FORMATS, find_table, partition_files, read_table, with_format
+from .cube import CUBE_TABLES, index_cube, load_cube
+
+try:
+    import fcntl  # Unix only; elsewhere concurrent builds aren't serialized
+except ImportError:
+    fcntl = None
+
+# Serving snapshot of the tables the dashboard reads, for multi-worker serving. Tables are
+# written once as uncompressed Arrow IPC (Feather v2) files, already sorted by date with
+# categorical dimensions (what FilterIndex wants), and every worker memory-maps them: the
+# frames are zero-copy, read-only views, so the pages live once in the OS page cache no
+# matter how many workers map them. The snapshot is rebuilt when the curated files it came
+# from change; files are replaced atomically, so a worker still mapping the old version
+# keeps a valid view.
+
+SNAPSHOT_TABLES = (*CUBE_TABLES, "monthly")
+SOURCE_TABLES = (*CUBE_TABLES.values(), "mart_orders_monthly", "fact_orders")
+MANIFEST = "manifest.json"
+
+
+def curated_fingerprint(curated_dir: Path) -> dict:
+    # path -> [size, mtime_ns] of every curated file (or month partition) a snapshot can be built from
+    out = {}
+    for name in SOURCE_TABLES:
+        for p in [with_format(curated_dir / name, f) for f in FORMATS] + partition_files(curated_dir / name):
+            if p.exists():
+                st = p.stat()
+                out[str(p)] = [st.st_size, st.st_mtime_ns]
+    return out
+
+
+@contextmanager
+def _lock(snapshot_dir: Path, exclusive: bool):
+    # Workers starting together: one builds, the others wait and then map the result
+    snapshot_dir.mkdir(parents=True, exist_ok=True)
+    with open(snapshot_dir / ".lock", "w") as f:
+        if fcntl:
+            fcntl.flock(f, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def build_snapshot(curated_dir: Path, snapshot_dir: Path) -> bool:
+    # -> True when (re)built, False when the snapshot already matches the curated files
+    from pyarrow import feather
+    curated_dir, snapshot_dir = Path(curated_dir), Path(snapshot_dir)
+    with _lock(snapshot_dir, exclusive=True):
+        fp = curated_fingerprint(curated_dir)
+        manifest = snapshot_dir / MANIFEST
+        if manifest.exists() and json.loads(manifest.read_text()) == fp:
+            return False
+        tables = {k: ix.frame for k, ix in index_cube(load_cube(curated_dir)).items()}
+        tables["monthly"] = read_table(find_table(curated_dir / "mart_orders_monthly"), parse_dates=["Order Month"])
+        for name, df in tables.items():
+            tmp = snapshot_dir / f"{name}.arrow.tmp"
+            feather.write_feather(df, tmp, compression="uncompressed")
+            os.replace(tmp, snapshot_dir / f"{name}.arrow")
+        manifest.write_text(json.dumps(fp))
+        print(f"[SNAPSHOT] {', '.join(f'{k} {len(df):,}' for k, df in tables.items())} rows -> {snapshot_dir}")
+        return True
+
+
+def load_snapshot(snapshot_dir: Path) -> dict:
+    # name -> DataFrame backed by the memory-mapped file (numbers, dates, category codes and
+    # Arrow strings are not copied; the arrays are read-only)
+    import pyarrow as pa
+    snapshot_dir = Path(snapshot_dir)
+    out = {}
+    with _lock(snapshot_dir, exclusive=False):
+        for name in SNAPSHOT_TABLES:
+            with pa.memory_map(str(snapshot_dir / f"{name}.arrow")) as src:
+                out[name] = pa.ipc.open_file(src).read_all().to_pandas(split_blocks=True)
+    return out
@@ -0,0 +1,15 @@
+# WSGI entry point for serving the dashboard with several worker processes:
+#   gunicorn --workers 4 --threads 4 --bind 127.0.0.1:8050 'src.viz.wsgi:create_server()'
+# (what `python -m src.main --run dash --workers 4` runs). Each worker memory-maps the shared
+# Arrow snapshot of the curated tables (src/viz/snapshot.py) instead of parsing its own copy,
+# so adding workers adds throughput, not a copy of the data per worker. Don't --preload:
+# each worker starts its own reload watcher thread in make_app, and threads don't survive
+# the fork.
+from pathlib import Path
+from ..config import DATA_CURATED, SERVING_DIR
+from .dashboard import make_app
+
+
+def create_server(curated_dir=DATA_CURATED, snapshot_dir=SERVING_DIR):
+    # snapshot_dir=None: every worker loads its own copy (for comparison)
+    return make_app(Path(curated_dir), snapshot_dir=snapshot_dir and Path(snapshot_dir)).server
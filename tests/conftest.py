@@ -0,0 +1,23 @@
+from pathlib import Path
+import pytest
+from src import pipeline
+from src.config import BASE_DIR
+
+
+@pytest.fixture
+def use_root(monkeypatch):
+    # Point every data/artifacts path the pipeline writes to under `root`
+    originals = dict(vars(pipeline))
+
+    def move(value, root):
+        if isinstance(value, Path) and value.is_relative_to(BASE_DIR):
+            return root / value.relative_to(BASE_DIR)
+        if isinstance(value, tuple) and value and all(isinstance(v, Path) for v in value):
+            return tuple(move(v, root) for v in value)
+        return value
+
+    def use(root):
+        for name, value in originals.items():
+            if move(value, root) is not value:
+                monkeypatch.setattr(pipeline, name, move(value, root))
+    return use
@@ -0,0 +1,76 @@
+import io
+import threading
+from pathlib import Path
+from types import SimpleNamespace
+
+# Filesystem-backed stand-ins for the object-store clients used by the streaming readers
+# (test_readers.py). They implement only the calls readers.py makes (size lookup + ranged
+# get) and count requests, so ranged/concurrent behaviour can be exercised without cloud
+# credentials:
+#   read_s3_csv("bucket", "raw/superstore.csv", chunksize=50_000, client=LocalS3Client("data"))
+
+
+class _Counter:
+    def __init__(self):
+        self.requests = 0
+        self.bytes = 0
+        self._lock = threading.Lock()
+
+    def _read(self, path: Path, start: int, end: int) -> bytes:
+        # end is exclusive
+        with open(path, "rb") as f:
+            f.seek(start)
+            data = f.read(end - start)
+        with self._lock:
+            self.requests += 1
+            self.bytes += len(data)
+        return data
+
+
+class LocalS3Client(_Counter):
+    # s3://bucket/key -> root/bucket/key
+    def __init__(self, root):
+        super().__init__()
+        self.root = Path(root)
+
+    def head_object(self, Bucket, Key):
+        return {"ContentLength": (self.root / Bucket / Key).stat().st_size}
+
+    def get_object(self, Bucket, Key, Range=None):
+        path = self.root / Bucket / Key
+        start, end = 0, path.stat().st_size
+        if Range:
+            a, b = Range.removeprefix("bytes=").split("-")
+            start, end = int(a), min(int(b) + 1, end)
+        return {"Body": io.BytesIO(self._read(path, start, end))}
+
+
+class LocalBlobClient(_Counter):
+    # Azure BlobClient for a single blob stored at `path`
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+
+    def get_blob_properties(self):
+        return SimpleNamespace(size=self.path.stat().st_size)
+
+    def download_blob(self, offset=0, length=None):
+        end = self.path.stat().st_size if length is None else offset + length
+        data = self._read(self.path, offset, end)
+        return SimpleNamespace(readall=lambda: data)
+
+
+class LocalGCSBlob(_Counter):
+    # google.cloud.storage.Blob for a single object stored at `path`
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+        self.size = None
+
+    def reload(self):
+        self.size = self.path.stat().st_size
+
+    def download_as_bytes(self, start=0, end=None):
+        # inclusive end, like GCS
+        stop = self.path.stat().st_size if end is None else end + 1
+        return self._read(self.path, start, stop)
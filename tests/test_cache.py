@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+import pandas as pd
+from src import pipeline
+from src.config import BASE_DIR, RAW_CSV
+from src.utils.cache import StageCache
+
+
+def test_rerun_skips_every_stage(tmp_path, use_root, monkeypatch):
+    use_root(tmp_path)
+    caches = []
+
+    class Recording(StageCache):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            caches.append(self)
+    monkeypatch.setattr(pipeline, "StageCache", Recording)
+
+    pipeline.run_etl(RAW_CSV)
+    assert "miss" in caches[0].status.values()
+    pipeline.run_etl(RAW_CSV)
+    assert caches[1].status and set(caches[1].status.values()) == {"skip"}, caches[1].status
+
+
+# Stage keys chained as in run_etl, computed in a fresh interpreter over a copy of src/
+KEYS = """
+import json
+from src.ingest import schema
+from src.ingest.readers import read_local_csv
+from src.model.marts import build_fact_orders, build_orders_monthly
+from src.transform.cleaning import basic_clean
+from src.transform.enrich import add_enriched_fields
+from src.utils.cache import StageCache, code_hash
+cache = StageCache('unused', 0, enabled=False)
+ingest = cache.key('ingest', 'raw', None, code_hash(read_local_csv, schema))
+clean = cache.key('clean', ingest, None, code_hash(basic_clean, schema))
+enrich = cache.key('enrich', clean, None, code_hash(add_enriched_fields))
+fact = cache.key('fact_orders', enrich, None, code_hash(build_fact_orders, build_orders_monthly))
+print(json.dumps(dict(ingest=ingest, clean=clean, enrich=enrich, fact=fact)))
+"""
+
+
+def _keys(root: Path) -> dict:
+    out = subprocess.run([sys.executable, "-c", KEYS], cwd=root, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def test_editing_an_imported_module_invalidates_dependent_stages(tmp_path):
+    shutil.copytree(BASE_DIR / "src", tmp_path / "src", ignore=shutil.ignore_patterns("__pycache__"))
+    before = _keys(tmp_path)
+    assert _keys(tmp_path) == before  # stable across interpreters
+
+    # src.transform.features is only reached through the marts module's imports
+    with open(tmp_path / "src" / "transform" / "features.py", "a") as f:
+        f.write("\n# edited\n")
+    after = _keys(tmp_path)
+    assert [after[k] for k in ("ingest", "clean", "enrich")] == [before[k] for k in ("ingest", "clean", "enrich")]
+    assert after["fact"] != before["fact"]
+
+    # src.utils.dates is imported by enrich and (through src.utils.io) by the reader: both
+    # stages and everything downstream of them change
+    with open(tmp_path / "src" / "utils" / "dates.py", "a") as f:
+        f.write("\n# edited\n")
+    again = _keys(tmp_path)
+    assert all(again[k] != after[k] for k in again)
+
+
+def _entry(cache, name, nbytes, mtime):
+    p = cache.root / f"{name}.pkl"
+    p.write_bytes(b"x" * nbytes)
+    os.utime(p, (mtime, mtime))
+    return p
+
+
+def test_eviction_is_lru_and_respects_max_bytes(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=2500)
+    df = pd.DataFrame({"a": range(10)})
+    cache.save("hot", "k" * 64, df)
+    hot = cache._entry("hot", "k" * 64, ".pkl")
+    os.utime(hot, (100, 100))  # oldest on disk ...
+    old = _entry(cache, "old", 1000, 200)
+    mid = _entry(cache, "mid", 1000, 300)
+    new = _entry(cache, "new", 1000, 400)
+    cache.record_output(new, "k")  # the manifest is never evicted
+
+    assert cache.load("hot", "k" * 64) is not None  # ... but a hit makes it the most recent
+    removed = cache.evict()
+    left = [p for p in tmp_path.iterdir() if p != cache._manifest_path]
+    assert removed == 2 and not old.exists() and not mid.exists()
+    assert new.exists() and hot.exists() and cache._manifest_path.exists()
+    assert sum(p.stat().st_size for p in left) <= cache.max_bytes
+
+    assert cache.evict() == 0  # already under the limit
+
+
+def test_eviction_disabled_cache_is_noop(tmp_path):
+    cache = StageCache(tmp_path, max_bytes=0, enabled=False)
+    p = _entry(cache, "x", 10, 100)
+    assert cache.evict() == 0 and p.exists()
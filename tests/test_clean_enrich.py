@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.ingest.schema import read_kwargs
+from src.transform.cleaning import basic_clean
+from src.transform.enrich import add_enriched_fields
+
+
+# ---- Frozen copy of the original implementation (reader, cleaning, enrichment, dates) ----
+
+def baseline_read(path):
+    return pd.read_csv(path, encoding='latin')
+
+
+def baseline_clean(df: pd.DataFrame) -> pd.DataFrame:
+    for c in df.select_dtypes(include="object").columns:
+        df[c] = df[c].astype(str).str.strip()
+    for c in ['Sales', 'Quantity', 'Discount', 'Profit']:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors='coerce')
+    if 'Discount' in df.columns:
+        df = df[(df['Discount'] > 0) & (df['Discount'] <= 0.9)]
+    return df.drop_duplicates()
+
+
+def baseline_enrich(df: pd.DataFrame) -> pd.DataFrame:
+    for c in ['Order Date', 'Ship Date']:
+        df[c] = pd.to_datetime(df[c], errors='coerce')
+    df['Profit Margin'] = df.apply(lambda r: (r['Profit']/r['Sales']) if r['Sales'] else 0, axis=1)
+    df['Order Month'] = df['Order Date'].dt.to_period('M').dt.to_timestamp()
+    return df
+
+
+def dirty(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    # object-typed frame with the problems cleaning exists for: padded text, malformed
+    # numbers, zero/NaN Sales and Profit, duplicate rows
+    rng = np.random.default_rng(seed)
+    df = df.astype(object)
+    n = len(df)
+    for c in ("Customer Name", "City", "Product Name", "Segment"):
+        i = rng.choice(n, n // 20, replace=False)
+        df.loc[df.index[i], c] = "  " + df[c].iloc[i].astype(str) + " "
+    for c, bad in (("Sales", "n/a"), ("Quantity", "?"), ("Discount", "")):
+        i = rng.choice(n, n // 200, replace=False)
+        df.loc[df.index[i], c] = bad
+    df.loc[df.index[rng.choice(n, n // 100, replace=False)], "Sales"] = 0.0
+    df.loc[df.index[rng.choice(n, n // 500, replace=False)], "Profit"] = np.nan
+    return pd.concat([df, df.iloc[rng.choice(n, n // 50)]], ignore_index=True)
+
+
+def _values(df: pd.DataFrame) -> pd.DataFrame:
+    # compare values, not storage: categoricals/Arrow strings as plain objects
+    return df.astype({c: object for c, t in df.dtypes.items() if not pd.api.types.is_numeric_dtype(t)
+                      and not pd.api.types.is_datetime64_any_dtype(t)})
+
+
+def _assert_same(got: pd.DataFrame, want: pd.DataFrame):
+    assert list(got.columns) == list(want.columns)
+    # the baseline left object-typed Row ID / Postal Code as text; the schema makes them numbers
+    as_text = [c for c in got.columns if pd.api.types.is_numeric_dtype(got[c])
+               and not pd.api.types.is_numeric_dtype(want[c])]
+    want = want.assign(**{c: pd.to_numeric(want[c]) for c in as_text})
+    pd.testing.assert_frame_equal(_values(got), _values(want), check_dtype=False, check_exact=True)
+
+
+INPUTS = {
+    "sample": (lambda: read_local_csv(RAW_CSV), lambda: baseline_read(RAW_CSV)),
+    "dirty (object)": (lambda: dirty(baseline_read(RAW_CSV)), lambda: dirty(baseline_read(RAW_CSV))),
+    "dirty (raw dtypes)": (lambda: dirty(baseline_read(RAW_CSV)).astype(read_kwargs()["dtype"]),
+                           lambda: dirty(baseline_read(RAW_CSV))),
+}
+
+
+@pytest.mark.parametrize("name", INPUTS)
+def test_matches_baseline(name):
+    current_input, baseline_input = INPUTS[name]
+    df = current_input()
+    before = df.copy()
+    clean = basic_clean(df)
+    enriched = add_enriched_fields(clean)
+    pd.testing.assert_frame_equal(df, before)  # input untouched
+
+    want_clean = baseline_clean(baseline_input())
+    _assert_same(clean, want_clean)
+    _assert_same(enriched, baseline_enrich(want_clean.copy()))
+
+
+@pytest.mark.parametrize("dtype", [object, "str", "category"])
+def test_missing_text_stays_missing(dtype):
+    # the baseline's astype(str) turned missing text into the string "nan"; it now stays NaN
+    df = baseline_read(RAW_CSV)
+    df = df[df["Discount"] > 0].head(6)
+    df["Customer Name"] = pd.Series([" Ann ", None, np.nan, "Bo", None, " Cy"], index=df.index, dtype=dtype)
+    out = basic_clean(df)["Customer Name"]
+    assert out.isna().tolist() == [False, True, True, False, True, False]
+    assert out.dropna().astype(str).tolist() == ["Ann", "Bo", "Cy"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.model.marts import build_cube, build_cube_orders, build_cube_products, build_fact_orders
+from src.transform.cleaning import basic_clean
+from src.transform.enrich import add_enriched_fields
+from src.viz.cube import count_orders, index_cube
+
+N_QUERIES = 300
+
+
+@pytest.fixture(scope="module")
+def fact():
+    return build_fact_orders(add_enriched_fields(basic_clean(read_local_csv(RAW_CSV))))
+
+
+@pytest.fixture(scope="module")
+def cube(fact):
+    return index_cube({"sales": build_cube(fact), "products": build_cube_products(fact), "orders": build_cube_orders(fact)})
+
+
+def _choice(rng, values):
+    # empty selection (= all) a quarter of the time, otherwise a random non-empty subset
+    if rng.random() < 0.25:
+        return []
+    return sorted(rng.choice(values, rng.integers(1, len(values) + 1), replace=False).tolist())
+
+
+def test_cube_answers_match_fact_table(fact, cube):
+    rng = np.random.default_rng(0)
+    dates = np.sort(fact["Order Date"].dropna().unique())
+    dims = {c: sorted(fact[c].dropna().unique()) for c in ("Region", "Category", "Segment")}
+    for _ in range(N_QUERIES):
+        start, end = sorted(rng.choice(dates, 2))
+        filters = {c: _choice(rng, v) for c, v in dims.items()}
+        m = fact["Order Date"].between(start, end)
+        for c, values in filters.items():
+            if values:
+                m &= fact[c].isin(values)
+        want = fact[m]
+
+        sales = cube["sales"].select(start, end, filters)
+        assert sales["Sales"].sum() == pytest.approx(want["Sales"].sum(), rel=1e-9, abs=1e-6)
+        assert sales["Profit"].sum() == pytest.approx(want["Profit"].sum(), rel=1e-9, abs=1e-6)
+        assert sales["Quantity"].sum() == want["Quantity"].sum()
+        assert sales["Lines"].sum() == len(want)
+
+        products = cube["products"].select(start, end, filters).groupby("Product Name", observed=True)["Sales"].sum()
+        expected = want.groupby("Product Name")["Sales"].sum()
+        pd.testing.assert_series_equal(products.sort_index(), expected.sort_index(), check_exact=False, rtol=1e-9,
+                                       check_index_type=False, check_categorical=False)
+
+        orders = count_orders(cube["orders"], start, end, filters["Region"], filters["Category"], filters["Segment"])
+        assert orders == want["Order ID"].nunique()
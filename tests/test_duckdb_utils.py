@@ -0,0 +1,34 @@
+import os
+import pandas as pd
+import pytest
+from src.sql.duckdb_utils import CuratedSession
+from src.utils.io import write_table
+
+
+def _touch(path, ns):
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + ns))
+
+
+@pytest.mark.parametrize("materialize", [True, False])
+def test_refresh_reloads_changed_file(tmp_path, materialize):
+    write_table(pd.DataFrame({"Sales": [1.0, 2.0]}), tmp_path / "fact_orders", "csv")
+    with CuratedSession(tmp_path, materialize=materialize, tables=["fact_orders"]) as s:
+        assert s.query("SELECT SUM(Sales) AS s FROM fact_orders")["s"][0] == 3.0
+        write_table(pd.DataFrame({"Sales": [1.0, 2.0, 4.0]}), tmp_path / "fact_orders", "csv")
+        _touch(tmp_path / "fact_orders.csv", 10**9)  # mtime change even on coarse clocks
+        assert s.refresh() == ["fact_orders"]
+        assert s.query("SELECT SUM(Sales) AS s FROM fact_orders")["s"][0] == 7.0
+        assert s.refresh() == []
+
+
+def test_mode_switch_on_persisted_database(tmp_path):
+    # a table left in the database file by a materialized session is replaced by a view
+    write_table(pd.DataFrame({"Sales": [1.0]}), tmp_path / "fact_orders", "csv")
+    db = str(tmp_path / "curated.duckdb")
+    with CuratedSession(tmp_path, db, materialize=True, tables=["fact_orders"]) as s:
+        s.refresh()
+    with CuratedSession(tmp_path, db, materialize=False, tables=["fact_orders"]) as s:
+        assert s.refresh() == ["fact_orders"]
+        kind = s.con.execute("SELECT table_type FROM information_schema.tables WHERE table_name = 'fact_orders'").fetchone()
+        assert kind[0] == "VIEW"
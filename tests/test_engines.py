@@ -0,0 +1,33 @@
+import pandas as pd
+import pytest
+from src import pipeline
+from src.config import RAW_CSV
+from src.utils.io import find_table, read_table
+
+pytest.importorskip("duckdb")
+
+TABLES = ["superstore_clean", "superstore_enriched", "fact_orders", "dim_products", "mart_orders_monthly",
+          "mart_cube", "mart_cube_products", "mart_cube_orders"]
+ROWS = 3000
+
+
+def _curated(root, name):
+    df = read_table(find_table(root / "data" / "curated" / name))
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_pandas_and_duckdb_engines_agree(tmp_path, use_root, fmt):
+    raw = tmp_path / "raw.csv"
+    raw.write_bytes(b"".join(RAW_CSV.read_bytes().splitlines(keepends=True)[:ROWS + 1]))
+
+    use_root(tmp_path / "pandas")
+    pipeline.run_etl(raw, fmt=fmt, use_cache=False)
+    use_root(tmp_path / "duckdb")
+    pipeline.run_etl_duckdb(raw, fmt=fmt)
+
+    for name in TABLES:
+        got = _curated(tmp_path / "duckdb", name)
+        want = _curated(tmp_path / "pandas", name)
+        pd.testing.assert_frame_equal(got, want, check_dtype=False, check_categorical=False,
+                                      check_exact=False, rtol=1e-9, obj=name)
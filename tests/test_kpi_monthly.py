@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.transform.cleaning import basic_clean
+from src.transform.enrich import add_enriched_fields
+from src.transform.features import kpi_monthly
+
+
+def kpi_monthly_reference(df: pd.DataFrame) -> pd.DataFrame:
+    # Frozen copy of the original per-group lambda version
+    return df.groupby("Order Month").agg(
+        Total_Sales = ('Sales', 'sum'),
+        Total_Profit = ('Profit', 'sum'),
+        Orders = ('Order ID', 'nunique'),
+        Customers = ('Customer ID', 'nunique'),
+        Avg_Discount = ('Discount', 'mean'),
+        Profit_Margin = ("Profit", lambda x: x.sum()/df.loc[x.index, "Sales"].sum() if df.loc[x.index, "Sales"].sum() else 0)
+    ).reset_index()
+
+
+@pytest.fixture(scope="module")
+def enriched():
+    return add_enriched_fields(basic_clean(read_local_csv(RAW_CSV)))
+
+
+def scaled(df: pd.DataFrame, rows: int, seed: int = 0) -> pd.DataFrame:
+    # resampled rows with NaN Sales/Profit, a NaT month and a month whose Sales sum to 0
+    rng = np.random.default_rng(seed)
+    df = df.iloc[rng.integers(0, len(df), rows)].reset_index(drop=True)
+    df.loc[rng.choice(rows, rows // 200), "Sales"] = np.nan
+    df.loc[rng.choice(rows, rows // 200), "Profit"] = np.nan
+    df.loc[rng.choice(rows, 10), "Order Month"] = pd.NaT
+    df.loc[df["Order Month"] == df["Order Month"].min(), "Sales"] = 0.0
+    return df
+
+
+@pytest.mark.parametrize("rows", [None, 200_000])
+def test_bit_identical_to_reference(enriched, rows):
+    df = enriched if rows is None else scaled(enriched, rows)
+    pd.testing.assert_frame_equal(kpi_monthly(df), kpi_monthly_reference(df), check_exact=True)
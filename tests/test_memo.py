@@ -0,0 +1,139 @@
+import threading
+import pytest
+from src.viz import memo
+from src.viz.memo import CallbackCache, normalize_filters
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(memo.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_lru_evicts_least_recently_used():
+    cache = CallbackCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now the oldest
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats()["size"] == 2
+
+
+def test_put_existing_key_refreshes_it():
+    cache = CallbackCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.put("a", 10)
+    cache.put("c", 3)
+    assert cache.get("a") == 10 and cache.get("b") is None
+
+
+def test_ttl_expires_entries(clock):
+    cache = CallbackCache(maxsize=8, ttl=5)
+    cache.put("a", 1)
+    clock[0] += 5
+    assert cache.get("a") == 1  # still fresh at exactly ttl
+    clock[0] += 0.001
+    assert cache.get("a") is None
+    assert cache.stats()["size"] == 0  # expired entry dropped, not kept around
+
+
+def test_no_ttl_keeps_entries(clock):
+    cache = CallbackCache(maxsize=8)
+    cache.put("a", 1)
+    clock[0] += 1e9
+    assert cache.get("a") == 1
+
+
+def test_invalidate_clears_and_counts():
+    cache = CallbackCache()
+    cache.put("a", 1)
+    cache.invalidate()
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert (stats["size"], stats["invalidations"], stats["hits"], stats["misses"]) == (0, 1, 0, 1)
+
+
+def test_get_or_compute_computes_once():
+    cache = CallbackCache()
+    calls = []
+    assert cache.get_or_compute("k", lambda: calls.append(1) or "v") == "v"
+    assert cache.get_or_compute("k", lambda: calls.append(1) or "w") == "v"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_concurrent_misses_share_one_compute():
+    cache = CallbackCache()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "v"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", compute))) for _ in range(4)]
+    threads[0].start()
+    started.wait(5)
+    for t in threads[1:]:
+        t.start()
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert results == ["v"] * 4 and len(calls) == 1
+
+
+def test_result_computed_across_invalidate_is_not_stored():
+    cache = CallbackCache()
+    assert cache.get_or_compute("k", lambda: cache.invalidate() or "stale") == "stale"
+    assert cache.get("k") is None
+
+
+@pytest.mark.parametrize("a, b", [
+    (("2016-01-01", "2016-12-31", ["West", "East"], ["Furniture"]),
+     ("2016-01-01", "2016-12-31", ["East", "West"], ["Furniture"])),
+    (("2016-01-01", "2016-12-31", None, []),
+     ("2016-01-01T00:00:00", "2016-12-31 00:00", [], None)),
+    (("2016-1-1", "2016-12-31", ["West"]),
+     ("2016-01-01", "2016-12-31", ["West"])),
+])
+def test_normalize_filters_equivalent_keys(a, b):
+    assert normalize_filters(*a) == normalize_filters(*b)
+    hash(normalize_filters(*a))
+
+
+@pytest.mark.parametrize("a, b", [
+    (("2016-01-01", "2016-12-31", ["West"], []), ("2016-01-01", "2016-12-31", [], ["West"])),
+    (("2016-01-01", "2016-12-31", ["West"]), ("2016-01-02", "2016-12-31", ["West"])),
+    (("2016-01-01", "2016-12-31", ["West"]), ("2016-01-01", "2016-12-31", ["West", "East"])),
+])
+def test_normalize_filters_distinct_keys(a, b):
+    assert normalize_filters(*a) != normalize_filters(*b)
+
+
+@pytest.mark.parametrize("start, end", [(None, "2016-12-31"), ("2016-01-01", None), ("not a date", "2016-12-31")])
+def test_normalize_filters_unparseable(start, end):
+    assert normalize_filters(start, end, ["West"]) is None
+
+
+def test_memoize_shares_entries_across_equivalent_filters():
+    cache = CallbackCache()
+    calls = []
+
+    @cache.memoize
+    def chart(start, end, regions):
+        calls.append(regions)
+        return {"n": len(regions or ())}
+
+    assert chart("2016-01-01", "2016-12-31", ["West", "East"]) == {"n": 2}
+    assert chart("2016-01-01T00:00", "2016-12-31", ["East", "West"]) == {"n": 2}
+    assert len(calls) == 1
+    chart(None, "2016-12-31", ["West"])  # unparseable: called directly, never cached
+    chart(None, "2016-12-31", ["West"])
+    assert len(calls) == 3 and cache.stats()["size"] == 1
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.config import RAW_CSV
+from src.ingest.readers import read_local_csv
+from src.transform.outliers import build_sketches, group_quartiles, iqr_outliers, sketch_quartiles
+
+PAIR = ("g", "v")
+CHUNK = 5000
+
+
+def _chunks(df):
+    return (df.iloc[i:i + CHUNK] for i in range(0, len(df), CHUNK))
+
+
+def _skewed(rows=200_000, seed=0):
+    # unequal groups, heavy-tailed and symmetric values interleaved
+    rng = np.random.default_rng(seed)
+    v = np.concatenate([rng.lognormal(0, 1, rows // 2), rng.normal(0, 5, rows - rows // 2)])
+    return pd.DataFrame({"g": rng.choice(list("abcd"), rows, p=[.4, .3, .2, .1]), "v": v[rng.permutation(rows)]})
+
+
+@pytest.mark.parametrize("k", [100, 200])
+def test_sketch_quartiles_within_kll_rank_error(k):
+    # KLL rank error is about 1/k of each group's size; allow 2/k
+    df = _skewed()
+    codes, labels, q1, q3 = group_quartiles(df, [PAIR])[PAIR]
+    a_labels, a_q1, a_q3 = sketch_quartiles(build_sketches(_chunks(df), [PAIR], k))[PAIR]
+    pos = pd.Index(a_labels).get_indexer(labels)
+    x = df["v"].to_numpy()
+    for i, label in enumerate(labels):
+        vals = np.sort(x[codes == i])
+        for q, exact, approx in ((0.25, q1[i], a_q1[pos[i]]), (0.75, q3[i], a_q3[pos[i]])):
+            # distance from q to the rank range the approximate quartile occupies
+            lo, hi = (np.searchsorted(vals, approx, side) / len(vals) for side in ("left", "right"))
+            assert max(0.0, lo - q, q - hi) <= 2 / k, (label, q, exact, approx)
+
+
+def test_uncompacted_sketches_match_exact_flags():
+    # While no level has been compacted a sketch holds every value and its quartiles are exact,
+    # so flagging chunk by chunk gives the same flags as iqr_outliers on the whole frame
+    df = read_local_csv(RAW_CSV)
+    pairs = [("Sub-Category", "Profit"), ("Region", "Sales")]
+    quartiles = sketch_quartiles(build_sketches(_chunks(df), pairs, accuracy=len(df) + 1))
+    chunked = pd.concat([iqr_outliers(chunk, pairs, quartiles=quartiles) for chunk in _chunks(df)])
+    pd.testing.assert_frame_equal(chunked, iqr_outliers(df, pairs))
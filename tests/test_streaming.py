@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+from benchmarks.bench_streaming_memory import streaming_peak
+from benchmarks.synth import write_csv
+from src import pipeline
+from src.config import RAW_CSV
+from src.utils.io import find_table, read_table
+
+TABLES = ["superstore_clean", "superstore_enriched", "fact_orders", "dim_products", "mart_orders_monthly",
+          "mart_cube", "mart_cube_products", "mart_cube_orders"]
+
+
+def _curated(root, name):
+    df = read_table(find_table(root / "data" / "curated" / name))
+    return df.sort_values(list(df.columns), ignore_index=True)
+
+
+@pytest.mark.parametrize("fmt", ["csv", "parquet"])
+def test_chunked_run_matches_full_build(tmp_path, use_root, fmt):
+    use_root(tmp_path / "full")
+    pipeline.run_etl(RAW_CSV, fmt=fmt, use_cache=False)
+    use_root(tmp_path / "chunked")
+    pipeline.run_etl(RAW_CSV, chunksize=700, fmt=fmt)  # several chunks per month batch
+
+    for name in TABLES:
+        got = _curated(tmp_path / "chunked", name)
+        want = _curated(tmp_path / "full", name)
+        pd.testing.assert_frame_equal(got, want, check_dtype=False, check_categorical=False,
+                                      check_exact=False, rtol=1e-9, obj=name)
+    plots = {p.name for p in (tmp_path / "chunked" / "artifacts" / "plots").glob("*.png")}
+    assert plots == {p.name for p in (tmp_path / "full" / "artifacts" / "plots").glob("*.png")}
+
+
+def test_peak_memory_does_not_grow_with_rows(tmp_path):
+    # 8x the rows: state is bounded by the chunk and month batch, so the peak only moves with
+    # what the plots hold (outlier rows; the larger run draws a binned scatter). Keeping row
+    # hashes and distinct keys for the whole input grew it by ~40 MB here.
+    small, large = (streaming_peak(write_csv(rows, tmp_path / f"synth_{rows}.csv"), 5000)["peak_rss_mb"]
+                    for rows in (20_000, 160_000))
+    assert large - small < 30, (small, large)